@@ -5,6 +5,19 @@ keys as attributes.
 from attrdict.mapping import AttrMap
 from attrdict.dictionary import AttrDict
 from attrdict.default import AttrDefault
+from attrdict.default_dictionary import AttrDefaultDict
+from attrdict.frozen import FrozenAttr
+from attrdict.layered import LayeredAttr
+from attrdict.lazy import Lazy
+from attrdict.persistent import PersistentAttr
+from attrdict.projection import project
+from attrdict.sequence import LazySequence
+from attrdict.singleflight import SingleFlightAttrDefault
+from attrdict.threadsafe import ThreadSafeAttrMap
 
 
-__all__ = ['AttrMap', 'AttrDict', 'AttrDefault']
+__all__ = [
+    'AttrMap', 'AttrDict', 'AttrDefault', 'AttrDefaultDict', 'FrozenAttr',
+    'LayeredAttr', 'Lazy', 'LazySequence', 'PersistentAttr',
+    'SingleFlightAttrDefault', 'ThreadSafeAttrMap', 'project',
+]
@@ -0,0 +1,240 @@
+"""
+An AttrDefault for asyncio, whose default_factory may be a coroutine
+function.
+
+This module requires asyncio (Python 3), so it isn't imported by the
+attrdict package.
+"""
+import asyncio
+from functools import partial
+from inspect import isawaitable
+
+import six
+
+from attrdict.configuration import Configuration
+from attrdict.default import AttrDefault
+from attrdict.lazy import Lazy, resolve_stored
+
+
+__all__ = ['AsyncAttrDefault']
+
+
+class _Fill(object):
+    """
+    A default_factory call in progress, and the number of waiters that
+    still want its value.
+    """
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncAttrDefault(AttrDefault):
+    """
+    An AttrDefault whose missing values are built asynchronously.
+
+    default_factory: (optional, None) A callable (called with the
+        missing key if pass_key is True) that returns either a value or
+        an awaitable (e.g., a coroutine function).
+    items: (optional, None) A mapping (or a sequence of key-value
+        pairs).
+    sequence_type: (optional, tuple) The type sequences accessed as
+        attributes are converted to.
+    pass_key: (optional, False) Whether the missing key is passed to
+        default_factory.
+
+    Missing keys are only filled by await attr.aget(key). Looking up a
+    missing key any other way (attr[key], attr.key) can't wait, so it
+    raises a KeyError (or AttributeError) instead of calling
+    default_factory, and prefill raises a TypeError.
+
+    Every aget for a key that is being filled shares one task. A waiter
+    that is cancelled (e.g., by a timeout) doesn't cancel the task for
+    the others, but once every waiter has been cancelled, the task is
+    cancelled too. Nothing is stored unless the task finishes: if it
+    raises or is cancelled, every waiter gets the exception and the
+    next aget tries again. cancel_pending cancels every fill in
+    progress.
+
+    Nested Mappings accessed as attributes are cached (see
+    _cache_children), so waiters that reach one through the same parent
+    share its fills.
+    """
+    __slots__ = ('_fills',)
+
+    _cache_children = True
+    _shares_config = True
+
+    def __init__(self, default_factory=None, items=None, sequence_type=tuple,
+                 pass_key=False):
+        super(AsyncAttrDefault, self).__init__(
+            default_factory, items, sequence_type, pass_key
+        )
+
+        self._setattr('_fills', {})
+
+    def __missing__(self, key):
+        """
+        Missing keys can only be filled by aget.
+        """
+        raise KeyError(key)
+
+    def prefill(self, keys, executor=None, chunksize=1, progress=None):
+        """
+        Missing keys can only be filled by aget (workers would store the
+        awaitables default_factory returns, rather than their results).
+        """
+        raise TypeError(
+            "'{cls}' can only fill missing keys with aget".format(
+                cls=self.__class__.__name__
+            )
+        )
+
+    def aget(self, key):
+        """
+        Access a value associated with a key, filling it with
+        default_factory if it is missing.
+
+        key: The key.
+
+        Returns an awaitable. Must be called with the event loop
+        running (i.e., from a coroutine).
+        """
+        waiter = asyncio.get_event_loop().create_future()
+        value = self._mapping.get(key, waiter)
+
+        if value is not waiter:
+            if value.__class__ is Lazy:
+                value = resolve_stored(self._mapping, key, value)
+
+            waiter.set_result(value)
+            return waiter
+
+        fill = self._fills.get(key)
+
+        if fill is None:
+            if self._default_factory is None:
+                waiter.set_exception(KeyError(key))
+                return waiter
+
+            try:
+                if self._pass_key:
+                    value = self._default_factory(key)
+                else:
+                    value = self._default_factory()
+            except Exception as error:
+                waiter.set_exception(error)
+                return waiter
+
+            if not isawaitable(value):
+                self[key] = value
+                waiter.set_result(value)
+                return waiter
+
+            fill = self._fills[key] = _Fill(asyncio.ensure_future(value))
+            fill.task.add_done_callback(partial(self._filled, key, fill))
+
+        fill.waiters += 1
+        fill.task.add_done_callback(partial(self._deliver, waiter))
+        waiter.add_done_callback(partial(self._abandon, key, fill))
+
+        return waiter
+
+    def _filled(self, key, fill, task):
+        """
+        Store the result of a finished fill (unless the key has been
+        set in the meantime).
+        """
+        if self._fills.get(key) is fill:
+            del self._fills[key]
+
+        if not task.cancelled() and task.exception() is None:
+            if key not in self._mapping:
+                self[key] = task.result()
+
+    @staticmethod
+    def _deliver(waiter, task):
+        """
+        Pass the outcome of a fill on to a waiter.
+        """
+        if waiter.done():  # cancelled
+            return
+        elif task.cancelled():
+            waiter.cancel()
+        elif task.exception() is not None:
+            waiter.set_exception(task.exception())
+        else:
+            waiter.set_result(task.result())
+
+    def _abandon(self, key, fill, waiter):
+        """
+        Cancel a fill once every waiter for it has been cancelled.
+        """
+        if waiter.cancelled():
+            fill.waiters -= 1
+
+            if not fill.waiters and not fill.task.done():
+                self._cancel(key, fill)
+
+    def _cancel(self, key, fill):
+        """
+        Cancel a fill, so that the next aget for its key starts a new
+        one.
+        """
+        if self._fills.get(key) is fill:
+            del self._fills[key]
+
+        fill.task.cancel()
+
+    def cancel_pending(self):
+        """
+        Cancel every fill in progress. Their waiters get a
+        CancelledError, and the keys stay missing.
+
+        Returns the number of fills cancelled.
+        """
+        fills = list(six.iteritems(self._fills))
+
+        for key, fill in fills:
+            self._cancel(key, fill)
+
+        return len(fills)
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        return six.u(
+            "AsyncAttrDefault({default_factory}, {pass_key}, {mapping})"
+        ).format(
+            default_factory=repr(self._default_factory),
+            pass_key=repr(self._pass_key),
+            mapping=repr(self._mapping),
+        )
+
+    def __setstate__(self, state):
+        """
+        Deserialize the object.
+        """
+        super(AsyncAttrDefault, self).__setstate__(state)
+        self._setattr('_fills', {})
+
+    @classmethod
+    def _constructor(cls, mapping, configuration):
+        """
+        A standardized constructor.
+
+        configuration: A Configuration, which the new instance will
+            share, or a (sequence_type, default_factory, pass_key)
+            tuple.
+        """
+        attr = super(AsyncAttrDefault, cls)._constructor(
+            mapping, configuration
+        )
+
+        if isinstance(configuration, Configuration):  # __init__ was skipped
+            attr._setattr('_fills', {})
+
+        return attr
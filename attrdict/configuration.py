@@ -0,0 +1,169 @@
+"""
+A shared, immutable configuration for Attr instances.
+"""
+from weakref import WeakValueDictionary
+
+
+__all__ = ['Configuration', 'setting']
+
+
+# Configurations that have been built, by their settings
+_INTERNED = WeakValueDictionary()
+
+
+class Configuration(object):
+    """
+    The settings of an Attr instance, which are passed on to the
+    instances built from it.
+
+    sequence_type: (optional, tuple) The type sequences accessed as
+        attributes are converted to.
+    default_factory: (optional, None) The factory used to build
+        values for missing keys (see AttrDefault).
+    pass_key: (optional, False) Whether the missing key is passed to
+        default_factory.
+    batch_factory: (optional, None) The factory used to build values
+        for several missing keys at once (see AttrDefault).
+
+    Configurations are immutable and interned: building one with the
+    same settings as an existing Configuration returns that object, so
+    every instance in a tree can share a single Configuration instead
+    of storing its own copy of each setting. Settings that can't be
+    hashed result in a new (uninterned) Configuration each time.
+    """
+    __slots__ = (
+        'sequence_type', 'default_factory', 'pass_key', 'batch_factory',
+        '__weakref__',
+    )
+
+    def __new__(cls, sequence_type=tuple, default_factory=None,
+                pass_key=False, batch_factory=None):
+        key = (cls, sequence_type, default_factory, pass_key, batch_factory)
+
+        try:
+            configuration = _INTERNED.get(key)
+        except TypeError:  # unhashable settings can't be interned
+            key = configuration = None
+
+        if configuration is None:
+            configuration = super(Configuration, cls).__new__(cls)
+
+            object.__setattr__(configuration, 'sequence_type', sequence_type)
+            object.__setattr__(
+                configuration, 'default_factory', default_factory
+            )
+            object.__setattr__(configuration, 'pass_key', pass_key)
+            object.__setattr__(configuration, 'batch_factory', batch_factory)
+
+            if key is not None:
+                configuration = _INTERNED.setdefault(key, configuration)
+
+        return configuration
+
+    def replace(self, **settings):
+        """
+        Build a Configuration with some settings changed.
+
+        settings: The settings to change, by name.
+        """
+        return self.__class__(
+            settings.pop('sequence_type', self.sequence_type),
+            settings.pop('default_factory', self.default_factory),
+            settings.pop('pass_key', self.pass_key),
+            settings.pop('batch_factory', self.batch_factory),
+            **settings
+        )
+
+    def _settings(self):
+        """
+        The settings of the configuration, in order.
+        """
+        return (
+            self.sequence_type, self.default_factory, self.pass_key,
+            self.batch_factory,
+        )
+
+    def __setattr__(self, key, value):
+        """
+        Configurations are immutable.
+        """
+        raise AttributeError(
+            "'{cls}' is immutable".format(cls=self.__class__.__name__)
+        )
+
+    def __delattr__(self, key):
+        """
+        Configurations are immutable.
+        """
+        raise AttributeError(
+            "'{cls}' is immutable".format(cls=self.__class__.__name__)
+        )
+
+    def __eq__(self, other):
+        """
+        Check whether two configurations have the same settings.
+        """
+        if other is self:
+            return True
+        elif not isinstance(other, Configuration):
+            return NotImplemented
+
+        return self._settings() == other._settings()
+
+    def __ne__(self, other):
+        """
+        Check whether two configurations have different settings.
+        """
+        equal = self.__eq__(other)
+
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
+    def __hash__(self):
+        """
+        Hash the settings of the configuration.
+        """
+        return hash(self._settings())
+
+    def __reduce__(self):
+        """
+        Serialize the configuration (it is interned again when loaded).
+        """
+        return (self.__class__, self._settings())
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        return (
+            "{cls}(sequence_type={0!r}, default_factory={1!r}, "
+            "pass_key={2!r}, batch_factory={3!r})"
+        ).format(*self._settings(), cls=self.__class__.__name__)
+
+
+def setting(name):
+    """
+    A property for accessing one of the settings of an instance's
+    Configuration (stored as _config) as an attribute.
+
+    name: The name of the setting.
+
+    Assigning to the property replaces the instance's Configuration.
+    """
+    def get(self):
+        """
+        Access the setting.
+        """
+        return getattr(self._config, name)
+
+    def set(self, value):
+        """
+        Change the setting.
+        """
+        object.__setattr__(
+            self, '_config', self._config.replace(**{name: value})
+        )
+
+    return property(get, set, doc="The {0} setting.".format(name))
@@ -1,38 +1,255 @@
 """
 A subclass of MutableAttr that has defaultdict support.
 """
-from collections import Mapping
+from collections import Mapping, OrderedDict
+from time import time
 
 import six
 
-from attrdict.mixins import MutableAttr
+from attrdict.configuration import Configuration, setting
+from attrdict.lazy import (
+    Lazy, ResolvedItemsView, ResolvedValuesView, equal_resolved,
+    resolve_stored,
+)
+from attrdict.merge import MAPPING_TYPES
+from attrdict.mixins import INSTANCE_SLOTS, MutableAttr
 
 
 __all__ = ['AttrDefault']
 
 
+try:
+    from time import monotonic as _clock
+except ImportError:  # Python 2
+    _clock = time
+
+
+class _Bounds(object):
+    """
+    The limits, expiry times and statistics of a bounded AttrDefault.
+    """
+    __slots__ = (
+        'maxsize', 'ttl', 'expires', 'clock',
+        'hits', 'misses', 'evictions', 'expirations',
+    )
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.expires = {}  # key: time (by clock) the key expires
+        self.clock = _clock
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+
+def _build_values(default_factory, pass_key, keys):
+    """
+    Call default_factory for each of a chunk of keys (in a worker of a
+    prefill), catching exceptions so that one failure doesn't lose the
+    rest of the chunk.
+
+    Returns a list of (key, value, exception) tuples.
+    """
+    built = []
+
+    for key in keys:
+        try:
+            if pass_key:
+                value = default_factory(key)
+            else:
+                value = default_factory()
+        except Exception as error:
+            built.append((key, None, error))
+        else:
+            built.append((key, value, None))
+
+    return built
+
+
+def _move_to_end(mapping, key):
+    """
+    Move a key to the (most recently used) end of an OrderedDict.
+    """
+    try:
+        mapping.move_to_end(key)
+    except AttributeError:  # Python 2
+        mapping[key] = mapping.pop(key)
+
+
 class AttrDefault(MutableAttr):
     """
     An implementation of MutableAttr with defaultdict support
+
+    batch_factory: (optional, None) A callable that builds values for
+        several missing keys at once. It is passed a list of keys, and
+        returns a mapping of (some of) those keys to their values.
+    maxsize: (optional, None) The most keys to keep. Once there are
+        more, the least recently used keys are removed.
+    ttl: (optional, None) The number of seconds a key is kept for
+        after it was last set.
+
+    Setting maxsize or ttl bounds the instance, for using it as a memo:
+    items are kept in an OrderedDict (a copy of the items passed in),
+    and looking a key up with attr[key] (or as an attribute) marks it
+    as recently used. Expired keys are removed when they are accessed,
+    so they still count towards len (and are iterated over) until then,
+    or until purge_expired is called. Iterating (and keys, values and
+    items) works on a snapshot, so keys can be looked up in the loop.
+    cache_stats counts the hits, misses, evictions and expirations.
+
+    get_many and prefetch look up many keys at once, passing all of the
+    missing ones to a single batch_factory call. Keys that batch_factory
+    doesn't return are built by default_factory (if there is one). A
+    single missing key is also built by batch_factory if there is no
+    default_factory.
+
+    prefill builds the values for many missing keys by calling
+    default_factory on a concurrent.futures thread (or process) pool.
     """
+    # __dict__ is only created if something other than these is set
+    # (e.g., a cache of children, or invalid attributes)
+    __slots__ = (
+        '_mapping', '_config', '_allow_invalid_attributes', '_bounds',
+    ) + INSTANCE_SLOTS
+
+    _sequence_type = setting('sequence_type')
+    _default_factory = setting('default_factory')
+    _pass_key = setting('pass_key')
+    _shares_config = True
+    _batch_factory = setting('batch_factory')
+
     def __init__(self, default_factory=None, items=None, sequence_type=tuple,
-                 pass_key=False):
+                 pass_key=False, maxsize=None, ttl=None, batch_factory=None):
         if items is None:
             items = {}
         elif not isinstance(items, Mapping):
             items = dict(items)
 
-        self._setattr('_default_factory', default_factory)
+        self._setattr(
+            '_config',
+            Configuration(sequence_type, default_factory, pass_key,
+                          batch_factory)
+        )
         self._setattr('_mapping', items)
-        self._setattr('_sequence_type', sequence_type)
-        self._setattr('_pass_key', pass_key)
         self._setattr('_allow_invalid_attributes', False)
+        self._set_bounds(maxsize, ttl)
+
+    def _set_bounds(self, maxsize, ttl):
+        """
+        Limit the number of keys, and how long they are kept for.
+
+        maxsize: The most keys to keep (or None).
+        ttl: The number of seconds to keep keys for (or None).
+        """
+        if maxsize is None and ttl is None:
+            self._setattr('_bounds', None)
+            return
+        elif maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize can't be negative")
+        elif ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+        bounds = _Bounds(maxsize, ttl)
+        mapping = OrderedDict(self._mapping)
+
+        if maxsize is not None:
+            while len(mapping) > maxsize:  # keep the last keys
+                mapping.popitem(last=False)
+
+        if ttl is not None:
+            bounds.expires = dict.fromkeys(mapping, bounds.clock() + ttl)
+
+        self._setattr('_mapping', mapping)
+        self._setattr('_bounds', bounds)
+
+    def _bound(self, key):
+        """
+        Mark a key that was just set as the most recently used one, and
+        remove keys until there are at most maxsize.
+        """
+        bounds, mapping = self._bounds, self._mapping
+
+        _move_to_end(mapping, key)
+
+        if bounds.ttl is not None:
+            bounds.expires[key] = bounds.clock() + bounds.ttl
+
+        if bounds.maxsize is not None:
+            while len(mapping) > bounds.maxsize:
+                oldest, _ = mapping.popitem(last=False)
+                bounds.expires.pop(oldest, None)
+                bounds.evictions += 1
+                self._forget_child(oldest)
+
+    def _expired(self, key):
+        """
+        Check whether a key (which must be present) has expired, and
+        remove it if it has.
+        """
+        bounds = self._bounds
+
+        if bounds.ttl is None or bounds.expires[key] > bounds.clock():
+            return False
+
+        del self._mapping[key]
+        del bounds.expires[key]
+        bounds.expirations += 1
+        self._forget_child(key)
+
+        return True
+
+    def purge_expired(self):
+        """
+        Remove every expired key. Returns the number of keys removed.
+        """
+        bounds = self._bounds
+
+        if bounds is None or bounds.ttl is None:
+            return 0
+
+        now = bounds.clock()
+        expired = [
+            key for key, expires in six.iteritems(bounds.expires)
+            if expires <= now
+        ]
+
+        for key in expired:
+            self._expired(key)
+
+        return len(expired)
+
+    def cache_stats(self):
+        """
+        A dict of the 'hits', 'misses', 'evictions' and 'expirations' of
+        a bounded instance, along with its 'size', 'maxsize' and 'ttl'
+        (or None, if the instance isn't bounded).
+        """
+        bounds = self._bounds
+
+        if bounds is None:
+            return None
+
+        return {
+            'hits': bounds.hits,
+            'misses': bounds.misses,
+            'evictions': bounds.evictions,
+            'expirations': bounds.expirations,
+            'size': len(self._mapping),
+            'maxsize': bounds.maxsize,
+            'ttl': bounds.ttl,
+        }
 
     def _configuration(self):
         """
-        The configuration for a AttrDefault instance
+        The configuration for a AttrDefault instance (a (sequence_type,
+        default_factory, pass_key) tuple, for subclasses with their own
+        _constructor).
         """
-        return self._sequence_type, self._default_factory, self._pass_key
+        config = self._config
+
+        if self._shares_config:
+            return config
+
+        return config.sequence_type, config.default_factory, config.pass_key
 
     def __getitem__(self, key):
         """
@@ -41,25 +258,75 @@ class AttrDefault(MutableAttr):
         Note: values returned will not be wrapped, even if recursive
         is True.
         """
-        if key in self._mapping:
-            return self._mapping[key]
+        if self._bounds is not None:
+            return self._cached(key)
+        elif key in self._mapping:
+            value = self._mapping[key]
+
+            if value.__class__ is Lazy:
+                return resolve_stored(self._mapping, key, value)
+
+            return value
         elif self._default_factory is not None:
             return self.__missing__(key)
+        elif self._batch_factory is not None:
+            return self._fetch([key])[key]
 
         raise KeyError(key)
 
+    def _cached(self, key):
+        """
+        Access a value associated with a key in a bounded instance.
+        """
+        bounds = self._bounds
+
+        if key in self._mapping and not self._expired(key):
+            bounds.hits += 1
+            _move_to_end(self._mapping, key)
+            value = self._mapping[key]
+
+            if value.__class__ is Lazy:
+                return resolve_stored(self._mapping, key, value)
+
+            return value
+
+        bounds.misses += 1
+
+        if self._default_factory is not None:
+            return self.__missing__(key)
+        elif self._batch_factory is not None:
+            return self._fetch([key])[key]
+
+        raise KeyError(key)
+
+    def _resolve(self, key, lazy):
+        """
+        Resolve a Lazy stored under key, replacing it with its value.
+        """
+        return resolve_stored(self._mapping, key, lazy)
+
     def __setitem__(self, key, value):
         """
         Add a key-value pair to the instance.
         """
         self._mapping[key] = value
 
+        if self._bounds is not None:
+            self._bound(key)
+
+        self._forget_child(key)
+
     def __delitem__(self, key):
         """
         Delete a key-value pair
         """
         del self._mapping[key]
 
+        if self._bounds is not None:
+            self._bounds.expires.pop(key, None)
+
+        self._forget_child(key)
+
     def __len__(self):
         """
         Check the length of the mapping.
@@ -69,9 +336,294 @@ class AttrDefault(MutableAttr):
     def __iter__(self):
         """
         Iterated through the keys.
+
+        A bounded instance is iterated through a snapshot of its keys,
+        as looking keys up reorders (and may remove) them.
         """
+        if self._bounds is not None:
+            return iter(list(self._mapping))
+
         return iter(self._mapping)
 
+    def __contains__(self, key):
+        """
+        Check whether the mapping contains a key. Like defaultdict, this
+        doesn't add missing keys.
+        """
+        if key not in self._mapping:
+            return False
+        elif self._bounds is not None:
+            return not self._expired(key)
+
+        return True
+
+    def get(self, key, default=None):
+        """
+        Access a value associated with a key, or default if there is no
+        such key. Like defaultdict, this doesn't add missing keys.
+        """
+        if self._bounds is not None and key in self._mapping:
+            if self._expired(key):
+                return default
+
+        value = self._mapping.get(key, default)
+
+        if value.__class__ is Lazy and value is not default:
+            return self._resolve(key, value)
+
+        return value
+
+    def keys(self):
+        """
+        The keys of the mapping (a list, for a bounded instance).
+        """
+        if self._bounds is not None:
+            return list(self._mapping.keys())
+
+        return self._mapping.keys()
+
+    def values(self):
+        """
+        The values of the mapping (a list, for a bounded instance).
+        """
+        if self._bounds is not None:
+            return list(ResolvedValuesView(self))
+
+        return ResolvedValuesView(self)
+
+    def items(self):
+        """
+        The key-value pairs of the mapping (a list, for a bounded
+        instance).
+        """
+        if self._bounds is not None:
+            return list(ResolvedItemsView(self))
+
+        return ResolvedItemsView(self)
+
+    def __eq__(self, other):
+        """
+        Check whether the mapping is equal to another mapping.
+        """
+        if other is self:
+            return True
+        elif isinstance(other, AttrDefault):
+            other = other._mapping
+        elif not isinstance(other, MAPPING_TYPES):
+            return NotImplemented
+
+        if len(self._mapping) != len(other):
+            return False
+        elif self._bounds is not None and isinstance(other, dict):
+            # OrderedDicts of bounded instances compare their order
+            equal = dict.__eq__(self._mapping, other)
+        else:
+            equal = self._mapping == other
+
+        # the stored values may differ only by Lazy values
+        return equal or equal_resolved(self, other)
+
+    def __ne__(self, other):
+        """
+        Check whether the mapping is not equal to another mapping.
+        """
+        equal = self.__eq__(other)
+
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
+    def get_many(self, keys):
+        """
+        Access the values associated with many keys at once, building
+        any missing values together (see prefetch).
+
+        keys: An iterable of keys.
+
+        Returns a dict of the keys to their values.
+        """
+        values = {}
+        self._fill(self._missing_keys(keys, values), values)
+
+        return values
+
+    def prefetch(self, keys):
+        """
+        Build the values for whichever of many keys are missing, with
+        a single call to batch_factory (or by calling default_factory
+        for each one, if there is no batch_factory). Keys that are
+        present aren't passed to the factory.
+
+        keys: An iterable of keys.
+
+        Returns the number of values built. Raises a KeyError if a value
+        can't be built.
+        """
+        return len(self._fill(self._missing_keys(keys), {}))
+
+    def prefill(self, keys, executor=None, chunksize=1, progress=None):
+        """
+        Build the values for whichever of many keys are missing, by
+        calling default_factory (with the key, if pass_key is set) on a
+        pool of workers.
+
+        keys: An iterable of keys.
+        executor: (optional, None) The concurrent.futures Executor to
+            run default_factory on. For a ProcessPoolExecutor,
+            default_factory (and the keys and values) must be picklable.
+            By default, a ThreadPoolExecutor is made (and shut down)
+            for the call.
+        chunksize: (optional, 1) The number of keys to send to a worker
+            at a time (larger chunks cost less to send to a process).
+        progress: (optional, None) A callable, called with the number of
+            keys done so far and the number of missing keys, each time a
+            chunk is done.
+
+        Workers only build values: they are stored by the calling
+        thread, a chunk at a time, as each chunk finishes. A value isn't
+        stored if its key was set while it was being built.
+
+        Returns a dict with the number of values 'filled', and the
+        'failures' (a dict of the keys whose values couldn't be built to
+        the exceptions raised). Raises a KeyError if keys are missing
+        and there is no default_factory.
+        """
+        missing = self._missing_keys(keys)
+        filled, failures = 0, {}
+
+        if not missing:
+            return {'filled': filled, 'failures': failures}
+        elif self._default_factory is None:
+            raise KeyError(missing[0])
+        elif chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        chunks = [
+            missing[start:start + chunksize]
+            for start in range(0, len(missing), chunksize)
+        ]
+        shutdown = executor is None
+
+        if shutdown:
+            executor = ThreadPoolExecutor(min(32, len(chunks)))
+
+        try:
+            pending = dict(
+                (executor.submit(_build_values, self._default_factory,
+                                 self._pass_key, chunk), chunk)
+                for chunk in chunks
+            )
+            done = 0
+
+            for future in as_completed(pending):
+                try:
+                    built = future.result()
+                except Exception as error:  # e.g., a worker process died
+                    built = [(key, None, error) for key in pending[future]]
+
+                for key, value, error in built:
+                    if error is not None:
+                        failures[key] = error
+                    elif key not in self._mapping:
+                        self[key] = value
+                        filled += 1
+
+                done += len(built)
+
+                if progress is not None:
+                    progress(done, len(missing))
+        finally:
+            if shutdown:
+                executor.shutdown()
+
+        return {'filled': filled, 'failures': failures}
+
+    def _missing_keys(self, keys, found=None):
+        """
+        The keys (without duplicates, in order) that aren't present.
+
+        keys: An iterable of keys.
+        found: (optional, None) A dict to add the keys that are present
+            (and their values) to. In a bounded instance, these count as
+            hits, and the others as misses.
+        """
+        mapping, bounds = self._mapping, self._bounds
+        missing, seen = [], set()
+
+        for key in keys:
+            if key in seen:
+                continue
+
+            seen.add(key)
+
+            if key in mapping and (bounds is None or not self._expired(key)):
+                if found is not None:
+                    value = found[key] = mapping[key]
+
+                    if value.__class__ is Lazy:
+                        found[key] = resolve_stored(mapping, key, value)
+
+                    if bounds is not None:
+                        bounds.hits += 1
+                        _move_to_end(mapping, key)
+            else:
+                missing.append(key)
+
+                if found is not None and bounds is not None:
+                    bounds.misses += 1
+
+        return missing
+
+    def _fill(self, keys, values):
+        """
+        Build and store the values for missing keys.
+
+        keys: A list of the missing keys.
+        values: The dict to add the built values to (returned).
+        """
+        if not keys:
+            return values
+        elif self._batch_factory is not None:
+            values.update(self._fetch(keys))
+        elif self._default_factory is not None:
+            for key in keys:
+                values[key] = self.__missing__(key)
+        else:
+            raise KeyError(keys[0])
+
+        return values
+
+    def _fetch(self, keys):
+        """
+        Build and store the values for missing keys with one call to
+        batch_factory. Keys it doesn't return are built by
+        default_factory, or raise a KeyError.
+
+        keys: A list of the missing keys.
+
+        Returns a dict of the keys to their values.
+        """
+        built = self._batch_factory(keys)
+        values, unbuilt = {}, []
+
+        for key in keys:
+            if key in built:
+                self[key] = values[key] = built[key]
+            else:
+                unbuilt.append(key)
+
+        if unbuilt:
+            if self._default_factory is None:
+                raise KeyError(unbuilt[0])
+
+            for key in unbuilt:
+                values[key] = self.__missing__(key)
+
+        return values
+
     def __missing__(self, key):
         """
         Add a missing element.
@@ -98,8 +650,14 @@ class AttrDefault(MutableAttr):
     def __getstate__(self):
         """
         Serialize the object.
+
+        The bounds of a bounded instance (and the batch_factory, if
+        there is one) are added to the end of the state, so other
+        instances can still be loaded by older versions. Statistics
+        aren't kept, and expiry times start over when the object is
+        loaded.
         """
-        return (
+        state = (
             self._default_factory,
             self._mapping,
             self._sequence_type,
@@ -107,24 +665,52 @@ class AttrDefault(MutableAttr):
             self._allow_invalid_attributes,
         )
 
+        bounds, batch_factory = self._bounds, self._batch_factory
+
+        if bounds is not None:
+            state += (bounds.maxsize, bounds.ttl, batch_factory)
+        elif batch_factory is not None:
+            state += (None, None, batch_factory)
+
+        return state
+
     def __setstate__(self, state):
         """
         Deserialize the object.
         """
         (default_factory, mapping, sequence_type, pass_key,
-         allow_invalid_attributes) = state
+         allow_invalid_attributes) = state[:5]
+        maxsize, ttl, batch_factory = state[5:] or (None, None, None)
 
-        self._setattr('_default_factory', default_factory)
+        self._setattr(
+            '_config',
+            Configuration(sequence_type, default_factory, pass_key,
+                          batch_factory)
+        )
         self._setattr('_mapping', mapping)
-        self._setattr('_sequence_type', sequence_type)
-        self._setattr('_pass_key', pass_key)
         self._setattr('_allow_invalid_attributes', allow_invalid_attributes)
+        self._set_bounds(maxsize, ttl)
 
     @classmethod
     def _constructor(cls, mapping, configuration):
         """
         A standardized constructor.
+
+        configuration: A Configuration, which the new instance will
+            share, or a (sequence_type, default_factory, pass_key)
+            tuple.
         """
-        sequence_type, default_factory, pass_key = configuration
-        return cls(default_factory, mapping, sequence_type=sequence_type,
-                   pass_key=pass_key)
+        if not isinstance(configuration, Configuration):
+            sequence_type, default_factory, pass_key = configuration
+            return cls(default_factory, mapping, sequence_type=sequence_type,
+                       pass_key=pass_key)
+
+        # mapping is always a Mapping, so there is nothing for __init__
+        # to check
+        attr = cls.__new__(cls)
+        attr._setattr('_mapping', mapping)
+        attr._setattr('_config', configuration)
+        attr._setattr('_allow_invalid_attributes', False)
+        attr._setattr('_bounds', None)
+
+        return attr
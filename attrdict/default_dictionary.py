@@ -0,0 +1,141 @@
+"""
+A dict that implements MutableAttr, with defaultdict support.
+"""
+from attrdict.configuration import Configuration, setting
+from attrdict.mixins import INSTANCE_SLOTS, MutableAttr
+
+import six
+
+
+__all__ = ['AttrDefaultDict']
+
+
+class AttrDefaultDict(dict, MutableAttr):
+    """
+    A dict that implements MutableAttr, with defaultdict support.
+
+    default_factory: (optional, None) The factory used to build values
+        for missing keys.
+    items: (optional, None) A mapping (or a sequence of key-value
+        pairs).
+    sequence_type: (optional, tuple) The type sequences accessed as
+        attributes are converted to.
+    pass_key: (optional, False) Whether the missing key is passed to
+        default_factory.
+
+    Like collections.defaultdict, missing keys are handled by
+    __missing__, which dict only calls when a lookup fails, so looking
+    up a key that is present never runs Python code. Like AttrDict,
+    nested Mappings accessed as attributes are copied (so changes made
+    to them aren't seen by the parent).
+    """
+    # __dict__ is only created if something other than these is set
+    # (e.g., a cache of children, or invalid attributes)
+    __slots__ = (
+        '_config', '_allow_invalid_attributes',
+    ) + INSTANCE_SLOTS
+
+    _sequence_type = setting('sequence_type')
+    _default_factory = setting('default_factory')
+    _pass_key = setting('pass_key')
+    _shares_config = True
+
+    def __init__(self, default_factory=None, items=None, sequence_type=tuple,
+                 pass_key=False):
+        if items is None:
+            super(AttrDefaultDict, self).__init__()
+        else:
+            super(AttrDefaultDict, self).__init__(items)
+
+        self._setattr(
+            '_config', Configuration(sequence_type, default_factory, pass_key)
+        )
+        self._setattr('_allow_invalid_attributes', False)
+
+    def _configuration(self):
+        """
+        The configuration for an AttrDefaultDict instance (a
+        (sequence_type, default_factory, pass_key) tuple, for subclasses
+        with their own _constructor).
+        """
+        config = self._config
+
+        if self._shares_config:
+            return config
+
+        return config.sequence_type, config.default_factory, config.pass_key
+
+    def __missing__(self, key):
+        """
+        Add a missing element.
+        """
+        config = self._config
+        default_factory = config.default_factory
+
+        if default_factory is None:
+            raise KeyError(key)
+        elif config.pass_key:
+            value = default_factory(key)
+        else:
+            value = default_factory()
+
+        self[key] = value
+
+        return value
+
+    def __getstate__(self):
+        """
+        Serialize the object.
+        """
+        return (
+            self._default_factory,
+            self.copy(),
+            self._sequence_type,
+            self._pass_key,
+            self._allow_invalid_attributes,
+        )
+
+    def __setstate__(self, state):
+        """
+        Deserialize the object.
+        """
+        (default_factory, mapping, sequence_type, pass_key,
+         allow_invalid_attributes) = state
+
+        self.update(mapping)
+        self._setattr(
+            '_config', Configuration(sequence_type, default_factory, pass_key)
+        )
+        self._setattr('_allow_invalid_attributes', allow_invalid_attributes)
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        return six.u(
+            "AttrDefaultDict({default_factory}, {pass_key}, {contents})"
+        ).format(
+            default_factory=repr(self._default_factory),
+            pass_key=repr(self._pass_key),
+            contents=super(AttrDefaultDict, self).__repr__(),
+        )
+
+    @classmethod
+    def _constructor(cls, mapping, configuration):
+        """
+        A standardized constructor.
+
+        configuration: A Configuration, which the new instance will
+            share, or a (sequence_type, default_factory, pass_key)
+            tuple.
+        """
+        if not isinstance(configuration, Configuration):
+            configuration = Configuration(*configuration)
+
+        # skip __init__, so the default configuration isn't looked up
+        attr = cls.__new__(cls)
+        dict.update(attr, mapping)
+        attr._setattr('_config', configuration)
+        attr._setattr('_allow_invalid_attributes', False)
+
+        return attr
@@ -1,7 +1,8 @@
 """
 A dict that implements MutableAttr.
 """
-from attrdict.mixins import MutableAttr
+from attrdict.configuration import Configuration, setting
+from attrdict.mixins import INSTANCE_SLOTS, MutableAttr
 
 import six
 
@@ -13,17 +14,30 @@ class AttrDict(dict, MutableAttr):
     """
     A dict that implements MutableAttr.
     """
+    # __dict__ is only created if something other than these is set
+    # (e.g., a cache of children, or invalid attributes)
+    __slots__ = (
+        '_config', '_allow_invalid_attributes',
+    ) + INSTANCE_SLOTS
+
+    _sequence_type = setting('sequence_type')
+    _shares_config = True
+
     def __init__(self, *args, **kwargs):
         super(AttrDict, self).__init__(*args, **kwargs)
 
-        self._setattr('_sequence_type', tuple)
+        self._setattr('_config', Configuration())
         self._setattr('_allow_invalid_attributes', False)
 
     def _configuration(self):
         """
-        The configuration for an attrmap instance.
+        The configuration for an attrmap instance (its sequence_type,
+        for subclasses with their own _constructor).
         """
-        return self._sequence_type
+        if self._shares_config:
+            return self._config
+
+        return self._config.sequence_type
 
     def __getstate__(self):
         """
@@ -41,7 +55,7 @@ class AttrDict(dict, MutableAttr):
         """
         mapping, sequence_type, allow_invalid_attributes = state
         self.update(mapping)
-        self._setattr('_sequence_type', sequence_type)
+        self._setattr('_config', Configuration(sequence_type))
         self._setattr('_allow_invalid_attributes', allow_invalid_attributes)
 
     def __repr__(self):
@@ -53,8 +67,17 @@ class AttrDict(dict, MutableAttr):
     def _constructor(cls, mapping, configuration):
         """
         A standardized constructor.
+
+        configuration: A Configuration, which the new instance will
+            share, or a sequence_type.
         """
-        attr = cls(mapping)
-        attr._setattr('_sequence_type', configuration)
+        if not isinstance(configuration, Configuration):
+            configuration = Configuration(configuration)
+
+        # skip __init__, so the default configuration isn't looked up
+        attr = cls.__new__(cls)
+        dict.update(attr, mapping)
+        attr._setattr('_config', configuration)
+        attr._setattr('_allow_invalid_attributes', False)
 
         return attr
@@ -0,0 +1,292 @@
+"""
+An immutable, hashable implementation of Attr.
+"""
+from collections import Mapping, Sequence, Set
+
+import six
+
+from attrdict.merge import MAPPING_TYPES
+from attrdict.mixins import INSTANCE_SLOTS, Attr
+
+
+__all__ = ['FrozenAttr']
+
+
+class FrozenAttr(Attr):
+    """
+    An immutable, hashable implementation of Attr, for using mappings
+    as dictionary keys or set members.
+
+    items: (optional, None) A mapping (or a sequence of key-value
+        pairs).
+
+    Values are frozen when the FrozenAttr is built: nested Mappings
+    become FrozenAttrs, Sets become frozensets, bytearrays become
+    bytes, and other (non-string) Sequences become tuples, so values
+    look the same whether they are accessed as items or as attributes.
+    Other values are stored as-is, so a FrozenAttr holding an
+    unhashable value can't be hashed.
+
+    The hash is computed the first time it is needed, and then cached.
+    Comparing two FrozenAttrs with different hashes doesn't need to
+    look at their values.
+    """
+    __slots__ = ('_mapping', '_hash') + INSTANCE_SLOTS
+
+    # values are already converted when they are stored
+    _sequence_type = None
+
+    def __init__(self, items=None):
+        if items is None:
+            items = {}
+        elif not isinstance(items, Mapping):
+            items = dict(items)
+
+        object.__setattr__(self, '_mapping', self._freeze(items))
+        object.__setattr__(self, '_hash', None)
+
+    @classmethod
+    def _frozen(cls, mapping):
+        """
+        Build an instance around a mapping with already-frozen values.
+        """
+        attr = cls.__new__(cls)
+        object.__setattr__(attr, '_mapping', mapping)
+        object.__setattr__(attr, '_hash', None)
+
+        return attr
+
+    @classmethod
+    def _freeze(cls, mapping):
+        """
+        Build a dict of the key-value pairs in a mapping, with all
+        nested values frozen.
+
+        mapping: A Mapping.
+
+        Shared values are frozen once, and a ValueError is raised for
+        cycles (which can't be hashed).
+        """
+        if mapping.__class__ is cls:  # already frozen
+            return mapping._mapping
+
+        def freezable(value):
+            """
+            Whether a value needs to be frozen.
+            """
+            if value.__class__ is cls:
+                return False
+            elif isinstance(value, (MAPPING_TYPES, bytearray)):
+                return True
+            elif isinstance(value, (six.string_types, six.binary_type)):
+                return False
+
+            return isinstance(value, (Sequence, Set))
+
+        # id of original value: (original value, frozen value). The
+        # original is kept so its id can't be reused by another value.
+        frozen = {}
+        # id of a value being frozen: its key-value pairs or elements,
+        # read exactly once (Mappings may build their values on access)
+        contents = {}
+        stack = [(mapping, False)]
+
+        def lookup(element):
+            """
+            The frozen version of an element.
+            """
+            entry = frozen.get(id(element))
+
+            return element if entry is None else entry[1]
+
+        while stack:
+            value, ready = stack.pop()
+            ident = id(value)
+
+            if ident in frozen or not freezable(value):
+                continue
+            elif not ready:
+                if ident in contents:
+                    raise ValueError("Can't freeze a cycle")
+
+                stack.append((value, True))
+
+                if isinstance(value, MAPPING_TYPES):
+                    elements = contents[ident] = list(six.iteritems(value))
+                    stack.extend((element, False) for _, element in elements)
+                elif isinstance(value, bytearray):
+                    contents[ident] = None
+                else:
+                    elements = contents[ident] = list(value)
+                    stack.extend((element, False) for element in elements)
+
+                continue
+
+            elements = contents.pop(ident)
+
+            if isinstance(value, MAPPING_TYPES):
+                result = dict(
+                    (key, lookup(element)) for key, element in elements
+                )
+
+                if value is not mapping:
+                    result = cls._frozen(result)
+            elif isinstance(value, bytearray):
+                result = six.binary_type(value)
+            elif isinstance(value, Set):
+                result = frozenset(lookup(element) for element in elements)
+            else:
+                result = tuple(lookup(element) for element in elements)
+
+            frozen[ident] = (value, result)
+
+        return frozen[id(mapping)][1]
+
+    def _configuration(self):
+        """
+        The configuration for a FrozenAttr instance (it has none).
+        """
+        return None
+
+    def __getitem__(self, key):
+        """
+        Access a value associated with a key.
+        """
+        return self._mapping[key]
+
+    def __len__(self):
+        """
+        Check the length of the mapping.
+        """
+        return len(self._mapping)
+
+    def __iter__(self):
+        """
+        Iterated through the keys.
+        """
+        return iter(self._mapping)
+
+    def __contains__(self, key):
+        """
+        Check whether the mapping contains a key.
+        """
+        return key in self._mapping
+
+    def get(self, key, default=None):
+        """
+        Access a value associated with a key, or default if there is no
+        such key.
+        """
+        return self._mapping.get(key, default)
+
+    def keys(self):
+        """
+        The keys of the mapping.
+        """
+        return self._mapping.keys()
+
+    def values(self):
+        """
+        The values of the mapping.
+        """
+        return self._mapping.values()
+
+    def items(self):
+        """
+        The key-value pairs of the mapping.
+        """
+        return self._mapping.items()
+
+    def __hash__(self):
+        """
+        Hash the key-value pairs of the mapping (computed once).
+        """
+        if self._hash is None:
+            object.__setattr__(
+                self, '_hash', hash(frozenset(six.iteritems(self._mapping)))
+            )
+
+        return self._hash
+
+    def __eq__(self, other):
+        """
+        Check whether the mapping is equal to another mapping.
+        """
+        if other is self:
+            return True
+        elif isinstance(other, FrozenAttr):
+            if len(self._mapping) != len(other._mapping):
+                return False
+
+            try:
+                if hash(self) != hash(other):
+                    return False
+            except TypeError:  # holds an unhashable value
+                pass
+
+            other = other._mapping
+        elif not isinstance(other, MAPPING_TYPES):
+            return NotImplemented
+        elif len(self._mapping) != len(other):
+            return False
+
+        return self._mapping == other
+
+    def __ne__(self, other):
+        """
+        Check whether the mapping is not equal to another mapping.
+        """
+        equal = self.__eq__(other)
+
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
+    def __setattr__(self, key, value):
+        """
+        FrozenAttrs are immutable.
+        """
+        raise TypeError(
+            "'{cls}' does not allow attribute creation.".format(
+                cls=self.__class__.__name__
+            )
+        )
+
+    def __delattr__(self, key):
+        """
+        FrozenAttrs are immutable.
+        """
+        raise TypeError(
+            "'{cls}' does not allow attribute deletion.".format(
+                cls=self.__class__.__name__
+            )
+        )
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        return six.u("FrozenAttr({mapping})").format(
+            mapping=repr(self._mapping)
+        )
+
+    def __getstate__(self):
+        """
+        Serialize the object.
+        """
+        return self._mapping
+
+    def __setstate__(self, state):
+        """
+        Deserialize the object.
+        """
+        object.__setattr__(self, '_mapping', state)
+        object.__setattr__(self, '_hash', None)
+
+    @classmethod
+    def _constructor(cls, mapping, configuration):
+        """
+        A standardized constructor.
+        """
+        return cls(mapping)
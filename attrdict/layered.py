@@ -0,0 +1,170 @@
+"""
+An Attr that lazily merges a stack of mappings.
+"""
+from collections import Mapping
+
+import six
+
+from attrdict.merge import merge_all
+from attrdict.mixins import Attr
+
+
+__all__ = ['LayeredAttr']
+
+
+class LayeredAttr(Attr):
+    """
+    An Attr that overlays a stack of mappings, resolving keys as they
+    are accessed instead of merging the mappings up front.
+
+    layers: (optional, ()) A sequence of mappings (or sequences of
+        key-value pairs). Later layers are favored, following the same
+        rules as merge (i.e., a LayeredAttr is equal to merging its
+        layers from left to right).
+    sequence_type: (optional, tuple) The type sequences accessed as
+        attributes are converted to.
+
+    Layers are not copied, so changes to them will be visible through
+    the LayeredAttr.
+    """
+    def __init__(self, layers=(), sequence_type=tuple):
+        self._layers = tuple(
+            layer if isinstance(layer, Mapping) else dict(layer)
+            for layer in layers
+        )
+        self._sequence_type = sequence_type
+
+    def _configuration(self):
+        """
+        The configuration for a LayeredAttr instance.
+        """
+        return self._sequence_type
+
+    def __getitem__(self, key):
+        """
+        Access a value associated with a key.
+
+        If the value is a Mapping that is overlaid by Mappings in other
+        layers, a LayeredAttr of those Mappings will be returned.
+        """
+        found = []
+
+        for layer in reversed(self._layers):
+            if key not in layer:
+                continue
+
+            value = layer[key]
+
+            if not isinstance(value, Mapping):
+                if not found:
+                    return value
+
+                break  # overwritten by the mappings already found
+
+            found.append(value)
+
+        if not found:
+            raise KeyError(key)
+        elif len(found) == 1:
+            return found[0]
+
+        found.reverse()
+
+        return self.__class__(found, sequence_type=self._sequence_type)
+
+    def __contains__(self, key):
+        """
+        Check whether any layer contains a key.
+        """
+        return any(key in layer for layer in self._layers)
+
+    def __len__(self):
+        """
+        Check the number of distinct keys across all layers.
+        """
+        return len(frozenset().union(*self._layers))
+
+    def __iter__(self):
+        """
+        Iterate through the distinct keys of all layers.
+        """
+        seen = set()
+
+        for layer in self._layers:
+            for key in layer:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __add__(self, other):
+        """
+        Add a mapping as a new top layer, creating a new LayeredAttr.
+
+        other: A mapping.
+        """
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        return self.__class__(
+            self._layers + self._layers_of(other),
+            sequence_type=self._sequence_type
+        )
+
+    def __radd__(self, other):
+        """
+        Add a mapping as a new bottom layer, creating a new LayeredAttr.
+
+        other: A mapping.
+        """
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        return self.__class__(
+            self._layers_of(other) + self._layers,
+            sequence_type=self._sequence_type
+        )
+
+    @staticmethod
+    def _layers_of(mapping):
+        """
+        The layers that make up a mapping.
+        """
+        if isinstance(mapping, LayeredAttr):
+            return mapping._layers
+
+        return (mapping,)
+
+    def materialize(self):
+        """
+        Merge all layers into a new dict.
+        """
+        return merge_all(*self._layers)
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        return six.u("LayeredAttr({layers})").format(
+            layers=repr(list(self._layers))
+        )
+
+    def __getstate__(self):
+        """
+        Serialize the object.
+        """
+        return (self._layers, self._sequence_type)
+
+    def __setstate__(self, state):
+        """
+        Deserialize the object.
+        """
+        layers, sequence_type = state
+        self._layers = layers
+        self._sequence_type = sequence_type
+
+    @classmethod
+    def _constructor(cls, mapping, configuration):
+        """
+        A standardized constructor.
+        """
+        return cls(cls._layers_of(mapping), sequence_type=configuration)
@@ -0,0 +1,193 @@
+"""
+A marker for values that are computed the first time they are read.
+"""
+from collections import ItemsView, ValuesView
+from threading import Lock
+
+import six
+
+
+__all__ = ['Lazy']
+
+
+class Lazy(object):
+    """
+    A value that is computed the first time it is read from an Attr.
+
+    function: The callable that computes the value.
+    args: Positional arguments to call function with.
+    kwargs: Keyword arguments to call function with.
+
+    Store a Lazy in an Attr (e.g., attr.pattern = Lazy(re.compile,
+    'a+')) and function is called the first time the value is read
+    through __getitem__, get, values, items or as an attribute (or
+    compared with ==). AttrMap and AttrDefault then replace the Lazy
+    with its value, so later reads cost nothing extra. (AttrDict and
+    AttrDefaultDict are dicts, so item access returns the Lazy itself;
+    it is resolved when accessed as an attribute.)
+
+    function is called at most once, even if several threads read the
+    value at the same time. If it raises, nothing is kept, and the next
+    read calls it again. Merging (and other operations that don't read
+    values, like copying and iteration) carries a Lazy along without
+    calling function.
+    """
+    __slots__ = ('_function', '_args', '_kwargs', '_value', '_done', '_lock')
+
+    def __init__(self, function, *args, **kwargs):
+        self._function = function
+        self._args = args
+        self._kwargs = kwargs
+        self._value = None
+        self._done = False
+        self._lock = Lock()
+
+    @classmethod
+    def _resolved(cls, value):
+        """
+        Build a Lazy whose value has already been computed.
+        """
+        lazy = cls(None)
+        lazy._value = value
+        lazy._done = True
+
+        return lazy
+
+    def resolve(self):
+        """
+        The value, computed the first time this is called.
+        """
+        if not self._done:
+            with self._lock:
+                if not self._done:  # not computed while waiting
+                    self._value = self._function(*self._args, **self._kwargs)
+                    self._done = True
+
+                    # the value is all that is needed now
+                    self._function = self._args = self._kwargs = None
+
+        return self._value
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        if self._done:
+            return six.u("Lazy(resolved={value!r})").format(value=self._value)
+
+        return six.u("Lazy({function!r})").format(function=self._function)
+
+    def __reduce__(self):
+        """
+        Serialize the object (a Lazy that hasn't been resolved is
+        pickled with its function and arguments).
+        """
+        if self._done:
+            return (_resolved, (self._value,))
+
+        return (_unresolved, (self._function, self._args, self._kwargs))
+
+
+def _resolved(value):
+    """
+    Unpickle a resolved Lazy.
+    """
+    return Lazy._resolved(value)
+
+
+def _unresolved(function, args, kwargs):
+    """
+    Unpickle a Lazy that hasn't been resolved.
+    """
+    return Lazy(function, *args, **kwargs)
+
+
+def resolve_stored(mapping, key, lazy):
+    """
+    Resolve a Lazy stored in a mapping, and replace it with its value
+    (unless something else has been stored under key in the meantime).
+
+    mapping: The mutable mapping the Lazy is stored in.
+    key: The key the Lazy is stored under.
+    lazy: The Lazy.
+    """
+    value = lazy.resolve()
+
+    if mapping.get(key) is lazy:
+        mapping[key] = value
+
+    return value
+
+
+class ResolvedValuesView(ValuesView):
+    """
+    A view of the values of an Attr that stores its values in a dict
+    (as _mapping), resolving Lazy values as they are reached (with
+    the Attr's _resolve).
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        attr = self._mapping  # the view's mapping is the Attr
+
+        for key, value in six.iteritems(attr._mapping):
+            if value.__class__ is Lazy:
+                value = attr._resolve(key, value)
+
+            yield value
+
+
+class ResolvedItemsView(ItemsView):
+    """
+    A view of the key-value pairs of an Attr that stores its values in
+    a dict (as _mapping), resolving Lazy values as they are reached
+    (with the Attr's _resolve).
+    """
+    __slots__ = ()
+
+    def __iter__(self):
+        attr = self._mapping  # the view's mapping is the Attr
+
+        for key, value in six.iteritems(attr._mapping):
+            if value.__class__ is Lazy:
+                value = attr._resolve(key, value)
+
+            yield key, value
+
+    def __contains__(self, item):
+        key, value = item
+        attr = self._mapping
+
+        if key not in attr:  # never build a missing value
+            return False
+
+        found = attr.get(key)
+
+        return found is value or found == value
+
+
+def equal_resolved(attr, other):
+    """
+    Compare the values of an Attr that stores its values in a dict (as
+    _mapping) with those of a mapping, key by key, resolving Lazy
+    values on either side.
+
+    attr: The Attr.
+    other: A Mapping of the same length.
+    """
+    for key, value in six.iteritems(attr._mapping):
+        if key not in other:
+            return False
+
+        other_value = other[key]
+
+        if value.__class__ is Lazy:
+            value = attr._resolve(key, value)
+
+        if other_value.__class__ is Lazy:
+            other_value = other_value.resolve()
+
+        if not (value is other_value or value == other_value):
+            return False
+
+    return True
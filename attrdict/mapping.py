@@ -5,7 +5,13 @@ from collections import Mapping
 
 import six
 
-from attrdict.mixins import MutableAttr
+from attrdict.configuration import Configuration, setting
+from attrdict.lazy import (
+    Lazy, ResolvedItemsView, ResolvedValuesView, equal_resolved,
+    resolve_stored,
+)
+from attrdict.merge import MAPPING_TYPES
+from attrdict.mixins import INSTANCE_SLOTS, MutableAttr
 
 
 __all__ = ['AttrMap']
@@ -15,39 +21,65 @@ class AttrMap(MutableAttr):
     """
     An implementation of MutableAttr.
     """
+    # __dict__ is only created if something other than these is set
+    # (e.g., a cache of children, or invalid attributes)
+    __slots__ = (
+        '_mapping', '_config', '_allow_invalid_attributes',
+    ) + INSTANCE_SLOTS
+
+    _sequence_type = setting('sequence_type')
+    _shares_config = True
+
     def __init__(self, items=None, sequence_type=tuple):
         if items is None:
             items = {}
         elif not isinstance(items, Mapping):
             items = dict(items)
 
-        self._setattr('_sequence_type', sequence_type)
+        self._setattr('_config', Configuration(sequence_type))
         self._setattr('_mapping', items)
         self._setattr('_allow_invalid_attributes', False)
 
     def _configuration(self):
         """
-        The configuration for an attrmap instance.
+        The configuration for an attrmap instance (its sequence_type,
+        for subclasses with their own _constructor).
         """
-        return self._sequence_type
+        if self._shares_config:
+            return self._config
+
+        return self._config.sequence_type
 
     def __getitem__(self, key):
         """
         Access a value associated with a key.
         """
-        return self._mapping[key]
+        value = self._mapping[key]
+
+        if value.__class__ is Lazy:
+            return resolve_stored(self._mapping, key, value)
+
+        return value
+
+    def _resolve(self, key, lazy):
+        """
+        Resolve a Lazy stored under key, replacing it with its value.
+        """
+        return resolve_stored(self._mapping, key, lazy)
 
     def __setitem__(self, key, value):
         """
         Add a key-value pair to the instance.
         """
         self._mapping[key] = value
+        self._forget_child(key)
 
     def __delitem__(self, key):
         """
         Delete a key-value pair
         """
         del self._mapping[key]
+        self._forget_child(key)
 
     def __len__(self):
         """
@@ -61,6 +93,70 @@ class AttrMap(MutableAttr):
         """
         return iter(self._mapping)
 
+    def __contains__(self, key):
+        """
+        Check whether the mapping contains a key.
+        """
+        return key in self._mapping
+
+    def get(self, key, default=None):
+        """
+        Access a value associated with a key, or default if there is no
+        such key.
+        """
+        value = self._mapping.get(key, default)
+
+        if value.__class__ is Lazy and value is not default:
+            return self._resolve(key, value)
+
+        return value
+
+    def keys(self):
+        """
+        The keys of the mapping.
+        """
+        return self._mapping.keys()
+
+    def values(self):
+        """
+        The values of the mapping.
+        """
+        return ResolvedValuesView(self)
+
+    def items(self):
+        """
+        The key-value pairs of the mapping.
+        """
+        return ResolvedItemsView(self)
+
+    def __eq__(self, other):
+        """
+        Check whether the mapping is equal to another mapping.
+        """
+        if other is self:
+            return True
+        elif isinstance(other, AttrMap):
+            other = other._mapping
+        elif not isinstance(other, MAPPING_TYPES):
+            return NotImplemented
+
+        if len(self._mapping) != len(other):
+            return False
+
+        # the stored values may differ only by Lazy values
+        return self._mapping == other or equal_resolved(self, other)
+
+    def __ne__(self, other):
+        """
+        Check whether the mapping is not equal to another mapping.
+        """
+        equal = self.__eq__(other)
+
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
     def __repr__(self):
         """
         Return a string representation of the object.
@@ -86,12 +182,25 @@ class AttrMap(MutableAttr):
         """
         mapping, sequence_type, allow_invalid_attributes = state
         self._setattr('_mapping', mapping)
-        self._setattr('_sequence_type', sequence_type)
+        self._setattr('_config', Configuration(sequence_type))
         self._setattr('_allow_invalid_attributes', allow_invalid_attributes)
 
     @classmethod
     def _constructor(cls, mapping, configuration):
         """
         A standardized constructor.
+
+        configuration: A Configuration, which the new instance will
+            share, or a sequence_type.
         """
-        return cls(mapping, sequence_type=configuration)
+        if not isinstance(configuration, Configuration):
+            return cls(mapping, sequence_type=configuration)
+
+        # mapping is always a Mapping, so there is nothing for __init__
+        # to check
+        attr = cls.__new__(cls)
+        attr._setattr('_mapping', mapping)
+        attr._setattr('_config', configuration)
+        attr._setattr('_allow_invalid_attributes', False)
+
+        return attr
@@ -1,44 +1,155 @@
 """
 A right-favoring Mapping merge.
+
+Merges are done with an explicit stack rather than recursion, so
+mappings can be nested arbitrarily deep.
 """
 from collections import Mapping
 
+import six
+
+
+__all__ = ['merge', 'merge_all']
+
+
+# isinstance checks against ABCs are slow, so check for dict first
+MAPPING_TYPES = (dict, Mapping)
+
+
+def _stored(mapping):
+    """
+    The Mapping an object stores its values in, so they can be read
+    without resolving any Lazy values (see attrdict.lazy).
+    """
+    if isinstance(mapping, dict):
+        return mapping
 
-__all__ = ['merge']
+    return getattr(mapping, '_mapping', mapping)
 
 
-def merge(left, right):
+def merge(left, right, share=False):
     """
     Merge two mappings objects together, combining overlapping Mappings,
     and favoring right-values
 
     left: The left Mapping object.
     right: The right (favored) Mapping object.
+    share: (optional, False) Also reuse a nested Mapping from one input
+        when the other input's Mapping for that key is empty, rather
+        than copying it. The result shares those subtrees with the
+        inputs, so changes made to them will be seen by both.
+
+    Subtrees found in only one input are always reused, and only the
+    Mappings on the path down to a key found in both inputs are copied.
+    At each level, the larger side is copied wholesale and only the
+    keys of the smaller side are visited, so the cost depends on the
+    size of the overlap rather than on the size of the inputs.
+
+    Values are read from the Mappings each object stores them in, so
+    Lazy values (see attrdict.lazy) are carried through unresolved.
 
     NOTE: This is not commutative (merge(a,b) != merge(b,a)).
     """
+    left, right = _stored(left), _stored(right)
+    merged = {}
+    stack = [(merged, left, right)]
+
+    while stack:
+        target, left, right = stack.pop()
+
+        # Copy the larger side wholesale, and only look at the keys of
+        # the smaller side one at a time.
+        if len(left) <= len(right):
+            target.update(right)
+
+            for key in left:
+                if key not in target:  # only in the left Mapping
+                    target[key] = left[key]
+                    continue
+
+                right_value = target[key]
+
+                if isinstance(right_value, MAPPING_TYPES):
+                    left_value = left[key]
+
+                    if isinstance(left_value, MAPPING_TYPES):
+                        if share and not (left_value and right_value):
+                            if not right_value:  # keep the left Mapping
+                                target[key] = left_value
+
+                            continue
+
+                        nested = target[key] = {}
+                        stack.append(
+                            (nested, _stored(left_value), _stored(right_value))
+                        )
+        else:
+            target.update(left)
+
+            for key in right:
+                right_value = right[key]
+
+                if key in target and isinstance(right_value, MAPPING_TYPES):
+                    left_value = target[key]
+
+                    if isinstance(left_value, MAPPING_TYPES):
+                        if share and not (left_value and right_value):
+                            if left_value:  # keep the left Mapping
+                                continue
+                        else:
+                            nested = target[key] = {}
+                            stack.append((
+                                nested, _stored(left_value),
+                                _stored(right_value),
+                            ))
+                            continue
+
+                target[key] = right_value
+
+    return merged
+
+
+def merge_all(*mappings):
+    """
+    Merge any number of mappings together in a single pass, combining
+    overlapping Mappings, and favoring values from later mappings.
+
+    mappings: The Mapping objects to merge, from least to most favored.
+
+    merge_all(a, b, c) is equal to merge(merge(a, b), c), but doesn't
+    build the intermediate merges. Only keys holding Mappings in more
+    than one mapping are merged recursively.
+    """
     merged = {}
+    stack = [(merged, [_stored(mapping) for mapping in mappings])]
+
+    while stack:
+        target, layers = stack.pop()
+        overlaid = {}  # keys with Mappings to merge: those Mappings
+
+        for mapping in layers:
+            # target isn't changed until the update, so it still holds
+            # the values of earlier layers for any overlapping keys.
+            for key in mapping if target else ():
+                if key not in target:
+                    continue
 
-    left_keys = frozenset(left)
-    right_keys = frozenset(right)
+                value = mapping[key]
 
-    # Items only in the left Mapping
-    for key in left_keys - right_keys:
-        merged[key] = left[key]
+                if isinstance(value, MAPPING_TYPES):
+                    previous = target[key]
 
-    # Items only in the right Mapping
-    for key in right_keys - left_keys:
-        merged[key] = right[key]
+                    if isinstance(previous, MAPPING_TYPES):
+                        overlaid.setdefault(key, [previous]).append(value)
+                elif overlaid:
+                    overlaid.pop(key, None)
 
-    # in both
-    for key in left_keys & right_keys:
-        left_value = left[key]
-        right_value = right[key]
+            target.update(mapping)
 
-        if (isinstance(left_value, Mapping) and
-                isinstance(right_value, Mapping)):  # recursive merge
-            merged[key] = merge(left_value, right_value)
-        else:  # overwrite with right value
-            merged[key] = right_value
+        for key, nested_layers in six.iteritems(overlaid):
+            nested = target[key] = {}
+            stack.append(
+                (nested, [_stored(layer) for layer in nested_layers])
+            )
 
     return merged
@@ -7,13 +7,131 @@ import re
 
 import six
 
-from attrdict.merge import merge
+from attrdict.lazy import Lazy
+from attrdict.merge import MAPPING_TYPES, _stored, merge, merge_all
+from attrdict.path import MISSING, lookup, parse_path
+from attrdict.sequence import is_lazy
 
 
 __all__ = ['Attr', 'MutableAttr']
 
 
-@six.add_metaclass(ABCMeta)
+# Keys that look like public attributes
+VALID_NAME = re.compile('^[A-Za-z][A-Za-z0-9_]*$')
+
+# The maximum number of keys a class will remember the validity of
+VALID_NAME_CACHE_SIZE = 4096
+
+# Exact types of values that _build never converts
+_LEAF_TYPES = frozenset(
+    (bool, float, complex, type(None), six.text_type, six.binary_type) +
+    six.integer_types
+)
+
+# The __slots__ a subclass needs to keep a (lazily created) __dict__ and
+# weak references. The Python 2 ABCs don't define __slots__, so there,
+# instances always have both.
+INSTANCE_SLOTS = (
+    () if hasattr(Mapping, '__weakref__') else ('__dict__', '__weakref__')
+)
+
+# Stands in for arguments that weren't passed
+_DEFAULT = object()
+
+
+class AttrMeta(ABCMeta):
+    """
+    The metaclass for Attr classes.
+
+    Each class gets its own memo of which keys are valid attribute
+    names (see Attr._valid_name). As the validity of a key depends on
+    the attributes of the class and its bases, assigning or deleting a
+    class attribute clears the memo of that class and its subclasses.
+
+    A class that overrides _constructor without also setting
+    _shares_config is given the configurations _constructor took before
+    Configurations were shared (see Attr._shares_config).
+    """
+    def __init__(cls, name, bases, namespace):
+        super(AttrMeta, cls).__init__(name, bases, namespace)
+
+        type.__setattr__(cls, '_valid_names', {})
+
+        if '_constructor' in namespace:
+            type.__setattr__(
+                cls, '_shares_config', namespace.get('_shares_config', False)
+            )
+
+    def __setattr__(cls, key, value):
+        super(AttrMeta, cls).__setattr__(key, value)
+
+        _clear_valid_names(cls)
+
+    def __delattr__(cls, key):
+        super(AttrMeta, cls).__delattr__(key)
+
+        _clear_valid_names(cls)
+
+
+class _MissingAttribute(AttributeError):
+    """
+    The AttributeError raised for an attribute that isn't there.
+
+    Misses are common (e.g., hasattr, or getattr with a default), and
+    usually the error is caught without ever being looked at, so the
+    message is only formatted if it is asked for.
+    """
+    def __str__(self):
+        cls, key = self.args
+
+        return "'{cls}' instance has no attribute '{name}'".format(
+            cls=cls.__name__, name=key
+        )
+
+
+def _clear_valid_names(cls):
+    """
+    Forget which keys are valid attribute names for a class and all of
+    its subclasses.
+    """
+    classes = [cls]
+
+    while classes:
+        current = classes.pop()
+        valid_names = current.__dict__.get('_valid_names')
+
+        if valid_names is not None:
+            valid_names.clear()
+
+        classes.extend(type.__subclasses__(current))
+
+
+def _copy_mappings(mapping):
+    """
+    Copy a Mapping, and every Mapping nested in it, into dicts (other
+    values, including Sequences, aren't copied).
+
+    mapping: A Mapping.
+    """
+    copied = {}
+    stack = [(copied, _stored(mapping))]
+
+    while stack:
+        target, source = stack.pop()
+
+        for key in source:
+            value = source[key]
+
+            if isinstance(value, MAPPING_TYPES):
+                nested = target[key] = {}
+                stack.append((nested, _stored(value)))
+            else:
+                target[key] = value
+
+    return copied
+
+
+@six.add_metaclass(AttrMeta)
 class Attr(Mapping):
     """
     A mixin class for a mapping that allows for attribute-style access
@@ -34,7 +152,36 @@ class Attr(Mapping):
         sequence accessed as an attribute will be a different object
         than if accessed as an attribute than if it is accessed as an
         item.
+
+    Subclasses may set _cache_children to True to keep the wrapper
+    built for each nested value, so that repeated attribute access
+    returns the same object (i.e., attr.foo is attr.foo). A cached
+    wrapper is reused for as long as the key holds the same value.
+    Only wrappers that are views of the stored Mapping (i.e., whose
+    _mapping is that Mapping) are cached, as copies (e.g., converted
+    sequences) would miss changes made to the stored value in place.
+    Attrs that are dicts (AttrDict and AttrDefaultDict) copy nested
+    Mappings, so they never cache children (use from_nested instead).
+
+    Subclasses may set _share_subtrees to True to have addition merge
+    with merge(..., share=True), reusing nested Mappings from the
+    operands instead of copying them.
+
+    _shares_config is True for classes whose _constructor accepts the
+    shared Configuration returned by _configuration. A subclass that
+    overrides _constructor gets the configuration it always has (e.g.,
+    a sequence_type for AttrMap), unless it sets _shares_config itself.
+
+    Attr and MutableAttr define empty __slots__, so subclasses can
+    avoid giving each instance a __dict__ (see AttrMap).
     """
+    __slots__ = ()
+
+    _cache_children = False
+    _children = None
+    _share_subtrees = False
+    _shares_config = False
+
     @abstractmethod
     def _configuration(self):
         """
@@ -63,27 +210,32 @@ class Attr(Mapping):
         This differs from __getitem__, because it returns a new instance
         of an Attr (if the value is a Mapping object).
         """
-        if key not in self:
-            raise AttributeError(
-                "'{cls} instance has no attribute '{name}'".format(
-                    cls=self.__class__.__name__, name=key
-                )
-            )
+        try:
+            value = self[key]
+        except KeyError:
+            raise _MissingAttribute(self.__class__, key)
 
-        return self._build(self[key])
+        return self._child(key, value)
 
     def __getattr__(self, key):
         """
         Access an item as an attribute.
         """
-        if key not in self or not self._valid_name(key):
-            raise AttributeError(
-                "'{cls}' instance has no attribute '{name}'".format(
-                    cls=self.__class__.__name__, name=key
-                )
-            )
-
-        return self._build(self[key])
+        # getattr only passes strings, so key is always hashable
+        try:
+            valid = self._valid_names[key]
+        except KeyError:
+            valid = self._valid_name(key)
+
+        if valid:
+            try:
+                value = self[key]
+            except KeyError:
+                pass
+            else:
+                return self._child(key, value)
+
+        raise _MissingAttribute(self.__class__, key)
 
     def __add__(self, other):
         """
@@ -96,7 +248,10 @@ class Attr(Mapping):
         if not isinstance(other, Mapping):
             return NotImplemented
 
-        return self._constructor(merge(self, other), self._configuration())
+        return self._constructor(
+            merge(self, other, share=self._share_subtrees),
+            self._configuration()
+        )
 
     def __radd__(self, other):
         """
@@ -109,7 +264,69 @@ class Attr(Mapping):
         if not isinstance(other, Mapping):
             return NotImplemented
 
-        return self._constructor(merge(other, self), self._configuration())
+        return self._constructor(
+            merge(other, self, share=self._share_subtrees),
+            self._configuration()
+        )
+
+    @classmethod
+    def merge_all(cls, *others):
+        """
+        Merge any number of mappings into a new instance of this class.
+
+        others: The mappings to merge, from least to most favored. The
+            first instance of this class among them is used to configure
+            the new instance. If there is none, the configuration of
+            cls() is used.
+
+        Equal to others[0] + others[1] + ..., but merges all mappings
+        in a single pass (see attrdict.merge.merge_all).
+        """
+        for other in others:
+            if isinstance(other, cls):
+                configuration = other._configuration()
+                break
+        else:
+            configuration = cls()._configuration()
+
+        return cls._constructor(merge_all(*others), configuration)
+
+    def get_path(self, path, default=_DEFAULT, wrap=False):
+        """
+        Access a nested value by its path (e.g., attr.get_path('a.b[0]')
+        is attr['a']['b'][0]).
+
+        path: A path (see attrdict.path), or a tuple of keys.
+        default: (optional) The value returned if there is nothing at
+            path. By default, a KeyError is raised.
+        wrap: (optional, False) Build the value as if it were accessed
+            as an attribute (e.g., a Mapping is returned as an Attr).
+
+        Unlike a chain of attributes, this reads the raw values, so no
+        Attrs are built along the way, and keys that aren't valid
+        attribute names can be used. Missing keys are never added (i.e.,
+        default_factory isn't called).
+        """
+        value = _stored(self)
+
+        for key in parse_path(path):
+            value = lookup(value, key)
+
+            if value is MISSING:
+                if default is _DEFAULT:
+                    raise KeyError(path)
+
+                return default
+
+        return self._build(value) if wrap else value
+
+    def has_path(self, path):
+        """
+        Check whether there is a value at a path (see get_path).
+
+        path: A path (see attrdict.path), or a tuple of keys.
+        """
+        return self.get_path(path, MISSING) is not MISSING
 
     def _build(self, obj):
         """
@@ -118,22 +335,74 @@ class Attr(Mapping):
 
         obj: An object that was a key-value pair in the mapping. If obj
             is a mapping, self._constructor(obj, self._configuration())
-            will be called. If obj is a non-string/bytes sequence, and
-            self._sequence_type is not None, the obj will be converted
-            to type _sequence_type and build will be called on its
-            elements.
+            will be called (unless obj is already an instance of this
+            class, in which case it is returned as-is). If obj is a
+            non-string/bytes sequence, and self._sequence_type is not
+            None, the obj will be converted to type _sequence_type and
+            build will be called on its elements. If _sequence_type is
+            LazySequence, elements will instead be built as they are
+            accessed. If obj is a Lazy, it is resolved first.
         """
-        if isinstance(obj, Mapping):
+        cls = obj.__class__
+
+        if cls is Lazy:
+            obj = obj.resolve()
+            cls = obj.__class__
+
+        if cls in _LEAF_TYPES or cls is self.__class__:  # nothing to do
+            pass
+        elif isinstance(obj, MAPPING_TYPES):
             obj = self._constructor(obj, self._configuration())
         elif (isinstance(obj, Sequence) and
               not isinstance(obj, (six.string_types, six.binary_type))):
             sequence_type = getattr(self, '_sequence_type', None)
 
-            if sequence_type:
+            if is_lazy(sequence_type):
+                obj = sequence_type(obj, self._build)
+            elif sequence_type:
                 obj = sequence_type(self._build(element) for element in obj)
 
         return obj
 
+    def _child(self, key, value):
+        """
+        Build the attribute-style version of the value stored at key.
+
+        key: The key the value is stored under.
+        value: The value stored under key.
+
+        If _cache_children is set, and the built object is a view of
+        value, it is cached, and returned on subsequent calls as long as
+        key is still associated with the same value.
+        """
+        if not self._cache_children:
+            return self._build(value)
+
+        children = self._children
+
+        if children is None:
+            children = {}
+            object.__setattr__(self, '_children', children)
+        else:
+            cached = children.get(key)
+
+            if cached is not None and cached[0] is value:
+                return cached[1]
+
+        child = self._build(value)
+
+        if getattr(child, '_mapping', None) is value:
+            children[key] = (value, child)
+
+        return child
+
+    def _forget_child(self, key):
+        """
+        Drop the cached wrapper (if any) for a key.
+        """
+        if self._children is not None:
+            self._children.pop(key, None)
+
     @classmethod
     def _valid_name(cls, key):
         """
@@ -145,20 +414,45 @@ class Attr(Mapping):
          * The key doesn't overlap with any class attributes (for Attr,
             those would be 'get', 'items', 'keys', 'values', 'mro', and
             'register').
+
+        Results are remembered per-class (see AttrMeta).
         """
-        return (
+        valid_names = cls._valid_names
+
+        try:
+            return valid_names[key]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable, so not a string
+            return False
+
+        valid = bool(
             isinstance(key, six.string_types) and
-            re.match('^[A-Za-z][A-Za-z0-9_]*$', key) and
+            VALID_NAME.match(key) and
             not hasattr(cls, key)
         )
 
+        if len(valid_names) < VALID_NAME_CACHE_SIZE:
+            valid_names[key] = valid
 
-@six.add_metaclass(ABCMeta)
+        return valid
+
+
+@six.add_metaclass(AttrMeta)
 class MutableAttr(Attr, MutableMapping):
     """
     A mixin class for a mapping that allows for attribute-style access
     of values.
+
+    Subclasses whose nested Mappings can't be changed in place, but
+    whose children write changes back to them (e.g., ThreadSafeAttrMap)
+    may set _write_through_children to True, so that set_path and
+    del_path make their changes through children.
     """
+    __slots__ = ()
+
+    _write_through_children = False
+
     def _setattr(self, key, value):
         """
         Add an attribute to the object, without attempting to add it as
@@ -166,6 +460,242 @@ class MutableAttr(Attr, MutableMapping):
         """
         super(MutableAttr, self).__setattr__(key, value)
 
+    def __iadd__(self, other):
+        """
+        Merge a mapping into this Attr in place (see deep_update).
+
+        other: A mapping.
+        """
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        self.deep_update(other)
+
+        return self
+
+    @classmethod
+    def from_nested(cls, obj, configuration=_DEFAULT):
+        """
+        Convert a tree of nested Mappings and Sequences to instances of
+        this class (and _sequence_type) all at once, so that values
+        are already converted when they are accessed as attributes.
+
+        obj: A Mapping.
+        configuration: (optional) The configuration (see
+            _configuration) used for every new instance. By default,
+            the configuration of cls().
+
+        Objects that appear in the tree more than once are converted
+        once, so they remain shared. Cycles are allowed as long as they
+        pass through a Mapping. A cycle made up only of Sequences can't
+        be converted, and raises a ValueError.
+        """
+        if not isinstance(obj, Mapping):
+            raise TypeError(
+                "'{cls}' can only be built from a Mapping".format(
+                    cls=cls.__name__
+                )
+            )
+
+        if configuration is _DEFAULT:
+            configuration = cls()._configuration()
+
+        root = cls._constructor({}, configuration)
+        sequence_type = getattr(root, '_sequence_type', None)
+
+        if is_lazy(sequence_type):  # elements are converted, not wrapped
+            sequence_type = list
+
+        def convertible(value):
+            """
+            Whether a value will be converted.
+            """
+            return isinstance(value, MAPPING_TYPES) or bool(
+                sequence_type and
+                isinstance(value, Sequence) and
+                not isinstance(value, (six.string_types, six.binary_type))
+            )
+
+        # id of original object: (original object, conversion). The
+        # original is kept so its id can't be reused by another object.
+        converted = {id(obj): (obj, root)}
+        # Each Mapping's key-value pairs (and each Sequence's elements)
+        # are read exactly once, as Mappings may build their values on
+        # access.
+        top = list(six.iteritems(obj))
+        mappings = [(root, top)]  # instances to fill in, and their items
+        pending = {}  # id of a Sequence waiting on its elements: elements
+        stack = [value for _, value in top if convertible(value)]
+
+        def conversion(value):
+            """
+            The converted version of a value.
+            """
+            entry = converted.get(id(value))
+
+            return value if entry is None else entry[1]
+
+        while stack:
+            current = stack[-1]
+            ident = id(current)
+
+            if ident in converted:
+                stack.pop()
+            elif isinstance(current, MAPPING_TYPES):
+                # Mappings can be created before their values are
+                # converted, which is what allows cycles.
+                stack.pop()
+                instance = cls._constructor({}, configuration)
+                converted[ident] = (current, instance)
+                items = list(six.iteritems(current))
+                mappings.append((instance, items))
+
+                stack.extend(
+                    value for _, value in items
+                    if convertible(value) and id(value) not in converted
+                )
+            else:
+                revisited = ident in pending
+
+                if revisited:
+                    elements = pending[ident]
+                else:
+                    elements = pending[ident] = list(current)
+
+                waiting = [
+                    element for element in elements
+                    if convertible(element) and id(element) not in converted
+                ]
+
+                if not waiting:
+                    stack.pop()
+                    del pending[ident]
+                    converted[ident] = (
+                        current,
+                        sequence_type(conversion(element)
+                                      for element in elements),
+                    )
+                    continue
+
+                if revisited:
+                    for element in waiting:
+                        if id(element) in pending:
+                            raise ValueError(
+                                "Can't convert a cycle of Sequences"
+                            )
+
+                stack.extend(waiting)
+
+        for instance, items in mappings:
+            for key, value in items:
+                instance[key] = conversion(value)
+
+        return root
+
+    def set_path(self, path, value, create=False):
+        """
+        Set a nested value by its path (e.g., attr.set_path('a.b[0]', 1)
+        is attr['a']['b'][0] = 1).
+
+        path: A path (see attrdict.path), or a tuple of keys.
+        value: The value.
+        create: (optional, False) Add an empty dict for each missing
+            key on the way to the value, rather than raising a KeyError.
+        """
+        target, key = self._path_parent(path, create)
+
+        try:
+            target[key] = value
+        except IndexError:
+            raise KeyError(path)
+
+    def del_path(self, path):
+        """
+        Delete a nested value by its path (e.g., attr.del_path('a.b')
+        is del attr['a']['b']).
+
+        path: A path (see attrdict.path), or a tuple of keys.
+        """
+        target, key = self._path_parent(path)
+
+        try:
+            del target[key]
+        except (KeyError, IndexError):
+            raise KeyError(path)
+
+    def _path_parent(self, path, create=False):
+        """
+        The container holding the last key of a path, and that key.
+
+        path: A path (see attrdict.path), or a tuple of keys.
+        create: (optional, False) Add an empty dict for each missing
+            key, rather than raising a KeyError.
+        """
+        keys = parse_path(path)
+
+        if not keys:
+            raise ValueError("The path is empty")
+
+        target = self
+
+        for key in keys[:-1]:
+            value = lookup(target, key)
+
+            if value is MISSING:
+                if not create or not isinstance(target, MutableMapping):
+                    raise KeyError(path)
+
+                target[key] = {}
+                value = lookup(target, key)  # the value may be converted
+
+            if (isinstance(target, MutableAttr) and
+                    target._write_through_children and
+                    isinstance(value, MAPPING_TYPES)):
+                value = target._child(key, value)
+
+            target = value
+
+        return target, keys[-1]
+
+    def deep_update(self, other):
+        """
+        Merge a mapping into this Attr in place, combining overlapping
+        Mappings, and favoring values from other.
+
+        other: A mapping.
+
+        Unlike addition, this doesn't build a new Attr: nested mutable
+        Mappings are updated in place (so the change will be seen by
+        anything else that holds them), and only keys from other are
+        visited. Mappings taken from other are copied, so later updates
+        don't change other.
+        """
+        stack = [(self, _stored(other))]
+
+        while stack:
+            target, source = stack.pop()
+
+            for key in source:
+                value = source[key]
+
+                if key in target and isinstance(value, MAPPING_TYPES):
+                    current = target[key]
+
+                    if isinstance(current, MutableMapping):
+                        if target is self:
+                            self._forget_child(key)
+
+                        stack.append((current, _stored(value)))
+                        continue
+                    elif isinstance(current, MAPPING_TYPES):
+                        value = merge(current, _copy_mappings(value))
+                    else:
+                        value = _copy_mappings(value)
+                elif isinstance(value, MAPPING_TYPES):
+                    value = _copy_mappings(value)
+
+                target[key] = value
+
     def __setattr__(self, key, value):
         """
         Add an attribute.
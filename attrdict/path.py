@@ -0,0 +1,214 @@
+"""
+Paths to values nested in mappings and sequences.
+
+A path is a string of keys separated by dots (e.g., 'db.hosts[0].name'):
+ * A key is any sequence of characters other than '.', '[', ']' and
+    '\\'. A backslash escapes the character after it (e.g., 'a\\.b' is
+    the key 'a.b').
+ * [<integer>] is an integer key (or index into a sequence), and may
+    follow a key directly (e.g., 'hosts[0]', 'grid[1][-1]').
+ * ['<key>'] (or ["<key>"]) is a key that may contain any characters.
+    Backslashes escape characters within the quotes.
+
+A tuple of keys may be used in place of a string.
+"""
+from collections import Sequence
+
+import six
+
+from attrdict.lazy import Lazy
+from attrdict.merge import MAPPING_TYPES, _stored
+
+
+__all__ = ['parse_path']
+
+
+# The maximum number of paths that will be remembered
+PATH_CACHE_SIZE = 4096
+
+# path string: tuple of keys
+_PATHS = {}
+
+# Stands in for values that aren't there
+MISSING = object()
+
+
+def parse_path(path):
+    """
+    Split a path into a tuple of keys.
+
+    path: A path string, or a tuple of keys (which is returned as-is).
+
+    Parsed paths are remembered, so parsing the same path again is a
+    single dict lookup. Raises a ValueError if the path isn't valid.
+    """
+    try:
+        return _PATHS[path]
+    except KeyError:
+        pass
+    except TypeError:  # unhashable, so not a string
+        return tuple(path)
+
+    if not isinstance(path, six.string_types):
+        return tuple(path)
+
+    keys = _parse(path)
+
+    if len(_PATHS) < PATH_CACHE_SIZE:
+        _PATHS[path] = keys
+
+    return keys
+
+
+def _parse(path):
+    """
+    Split a path string into a tuple of keys.
+    """
+    keys = []
+    index, length = 0, len(path)
+
+    while True:
+        if path.startswith('[', index):
+            index = _parse_bracket(path, index, keys)
+        else:
+            index = _parse_key(path, index, keys)
+
+        while path.startswith('[', index):
+            index = _parse_bracket(path, index, keys)
+
+        if index == length:
+            return tuple(keys)
+        elif path[index] != '.':
+            raise _invalid(path, "expected '.' at {0}".format(index))
+
+        index += 1
+
+
+def _parse_key(path, index, keys):
+    """
+    Parse the unquoted key starting at index, add it to keys, and
+    return the index after it.
+    """
+    characters = []
+    length = len(path)
+
+    while index < length:
+        character = path[index]
+
+        if character in '.[':
+            break
+        elif character == ']':
+            raise _invalid(path, "unexpected ']' at {0}".format(index))
+        elif character == '\\':
+            index += 1
+
+            if index == length:
+                raise _invalid(path, "nothing to escape at the end")
+
+            character = path[index]
+
+        characters.append(character)
+        index += 1
+
+    if not characters:
+        raise _invalid(path, "empty key at {0}".format(index))
+
+    keys.append(path[:0].join(characters))
+
+    return index
+
+
+def _parse_bracket(path, index, keys):
+    """
+    Parse the bracketed key starting at index (the '['), add it to
+    keys, and return the index after the ']'.
+    """
+    start, length = index, len(path)
+    index += 1
+
+    if path.startswith(("'", '"'), index):
+        quote = path[index]
+        characters = []
+        index += 1
+
+        while index < length and path[index] != quote:
+            if path[index] == '\\':
+                index += 1
+
+                if index == length:
+                    break
+
+            characters.append(path[index])
+            index += 1
+
+        if index == length:
+            raise _invalid(path, "unclosed quote at {0}".format(start + 1))
+
+        key = path[:0].join(characters)
+        index += 1
+    else:
+        end = path.find(']', index)
+        text = path[index:end]
+        key = None
+
+        if end != -1 and text.lstrip('-').isdigit():
+            try:
+                key = int(text)
+            except ValueError:  # e.g., '--1', or non-ASCII digits
+                pass
+
+        if key is None:
+            raise _invalid(
+                path, "expected an integer or a quoted key at {0}".format(
+                    index
+                )
+            )
+
+        index = end
+
+    if not path.startswith(']', index):
+        raise _invalid(path, "unclosed '[' at {0}".format(start))
+
+    keys.append(key)
+
+    return index + 1
+
+
+def _invalid(path, reason):
+    """
+    The error raised for a path that can't be parsed.
+    """
+    return ValueError("Invalid path {0!r}: {1}".format(path, reason))
+
+
+def lookup(container, key):
+    """
+    The value stored under key in container, or MISSING if there is
+    none.
+
+    container: A Mapping, or a Sequence (which can only be indexed by
+        integers).
+    key: The key.
+
+    Values are read from the Mapping an Attr stores them in, so no Attrs
+    are built (and default_factory isn't called). A Lazy value is
+    resolved.
+    """
+    if container.__class__ is dict:
+        value = container.get(key, MISSING)
+    elif isinstance(container, MAPPING_TYPES):
+        value = _stored(container).get(key, MISSING)
+    elif (isinstance(container, Sequence) and
+          isinstance(key, six.integer_types) and
+          not isinstance(container, (six.string_types, six.binary_type))):
+        try:
+            value = container[key]
+        except IndexError:
+            return MISSING
+    else:
+        return MISSING
+
+    if value.__class__ is Lazy:
+        return value.resolve()
+
+    return value
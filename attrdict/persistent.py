@@ -0,0 +1,773 @@
+"""
+A MutableAttr backed by a persistent (hash array mapped trie) mapping,
+which can be snapshotted in constant time.
+"""
+from collections import Mapping
+
+import six
+
+from attrdict.configuration import Configuration, setting
+from attrdict.merge import MAPPING_TYPES, _stored
+from attrdict.mixins import _DEFAULT, INSTANCE_SLOTS, MutableAttr
+
+
+__all__ = ['PersistentAttr', 'PersistentMap']
+
+
+# The number of bits of a key's hash used at each level of the trie
+_BITS = 5
+_LEVEL_MASK = (1 << _BITS) - 1
+
+# Hashes are treated as unsigned 64-bit integers
+_HASH_MASK = (1 << 64) - 1
+
+# Stands in for missing values
+_MISSING = object()
+
+
+def _hash(key):
+    """
+    The hash of a key, as used to place it in the trie.
+    """
+    return hash(key) & _HASH_MASK
+
+
+def _popcount(value):
+    """
+    The number of bits set in an integer.
+    """
+    return bin(value).count('1')
+
+
+class _BitmapNode(object):
+    """
+    A node of the trie. Each bit set in bitmap corresponds to an entry,
+    which is either a (key, value) pair, or a node holding all keys
+    whose hashes share that prefix.
+    """
+    __slots__ = ('bitmap', 'entries')
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _CollisionNode(object):
+    """
+    A node holding the (key, value) pairs of keys with equal hashes.
+    """
+    __slots__ = ('hash', 'entries')
+
+    def __init__(self, hashed, entries):
+        self.hash = hashed
+        self.entries = entries
+
+
+_EMPTY = _BitmapNode(0, ())
+
+
+def _find(node, hashed, key, default):
+    """
+    Look up the value for a key in the trie, or default if it is
+    missing.
+    """
+    shift = 0
+
+    while True:
+        if node.__class__ is _CollisionNode:
+            if node.hash == hashed:
+                for entry in node.entries:
+                    if entry[0] is key or entry[0] == key:
+                        return entry[1]
+
+            return default
+
+        bit = 1 << ((hashed >> shift) & _LEVEL_MASK)
+
+        if not node.bitmap & bit:
+            return default
+
+        entry = node.entries[_popcount(node.bitmap & (bit - 1))]
+
+        if entry.__class__ is tuple:
+            if entry[0] is key or entry[0] == key:
+                return entry[1]
+
+            return default
+
+        node = entry
+        shift += _BITS
+
+
+def _pair(shift, first_hash, first, second_hash, second):
+    """
+    Build the node holding two (key, value) pairs whose hashes match
+    below shift.
+    """
+    if first_hash == second_hash:
+        return _CollisionNode(first_hash, (first, second))
+
+    first_bit = (first_hash >> shift) & _LEVEL_MASK
+    second_bit = (second_hash >> shift) & _LEVEL_MASK
+
+    if first_bit == second_bit:
+        return _BitmapNode(
+            1 << first_bit,
+            (_pair(shift + _BITS, first_hash, first, second_hash, second),)
+        )
+    elif first_bit < second_bit:
+        entries = (first, second)
+    else:
+        entries = (second, first)
+
+    return _BitmapNode((1 << first_bit) | (1 << second_bit), entries)
+
+
+def _assoc(node, shift, hashed, key, value):
+    """
+    Build a copy of a (sub)trie with a key set to a value.
+
+    Returns the new node (which is node itself if nothing changed), and
+    whether the key was added. Only the nodes on the path to the key
+    are copied.
+    """
+    if node.__class__ is _CollisionNode:
+        entries = node.entries
+
+        if node.hash != hashed:  # move it down a level, then add to that
+            node = _BitmapNode(
+                1 << ((node.hash >> shift) & _LEVEL_MASK), (node,)
+            )
+        else:
+            for index, entry in enumerate(entries):
+                if entry[0] is key or entry[0] == key:
+                    if entry[1] is value:
+                        return node, False
+
+                    return _CollisionNode(
+                        hashed,
+                        entries[:index] + ((key, value),) +
+                        entries[index + 1:]
+                    ), False
+
+            return _CollisionNode(hashed, entries + ((key, value),)), True
+
+    bit = 1 << ((hashed >> shift) & _LEVEL_MASK)
+    index = _popcount(node.bitmap & (bit - 1))
+    entries = node.entries
+
+    if not node.bitmap & bit:
+        return _BitmapNode(
+            node.bitmap | bit,
+            entries[:index] + ((key, value),) + entries[index:]
+        ), True
+
+    entry = entries[index]
+
+    if entry.__class__ is not tuple:
+        child, added = _assoc(entry, shift + _BITS, hashed, key, value)
+
+        if child is entry:
+            return node, False
+    elif entry[0] is key or entry[0] == key:
+        if entry[1] is value:
+            return node, False
+
+        child, added = (key, value), False
+    else:
+        child = _pair(
+            shift + _BITS, _hash(entry[0]), entry, hashed, (key, value)
+        )
+        added = True
+
+    return _BitmapNode(
+        node.bitmap, entries[:index] + (child,) + entries[index + 1:]
+    ), added
+
+
+def _without(node, shift, hashed, key):
+    """
+    Build a copy of a (sub)trie without a key.
+
+    Returns node itself if the key is missing, None if nothing is left,
+    or a (key, value) pair if only that is left (so that it can be
+    moved up into the parent node).
+    """
+    entries = node.entries
+
+    if node.__class__ is _CollisionNode:
+        if node.hash == hashed:
+            for index, entry in enumerate(entries):
+                if entry[0] is key or entry[0] == key:
+                    entries = entries[:index] + entries[index + 1:]
+
+                    if len(entries) == 1:
+                        return entries[0]
+
+                    return _CollisionNode(hashed, entries)
+
+        return node
+
+    bit = 1 << ((hashed >> shift) & _LEVEL_MASK)
+
+    if not node.bitmap & bit:
+        return node
+
+    index = _popcount(node.bitmap & (bit - 1))
+    entry = entries[index]
+
+    if entry.__class__ is not tuple:
+        child = _without(entry, shift + _BITS, hashed, key)
+
+        if child is entry:
+            return node
+    elif entry[0] is key or entry[0] == key:
+        child = None
+    else:
+        return node
+
+    if child is not None:
+        if len(entries) == 1 and child.__class__ is tuple:
+            return child
+
+        return _BitmapNode(
+            node.bitmap, entries[:index] + (child,) + entries[index + 1:]
+        )
+
+    entries = entries[:index] + entries[index + 1:]
+
+    if not entries:
+        return None
+    elif len(entries) == 1 and entries[0].__class__ is tuple:
+        return entries[0]
+
+    return _BitmapNode(node.bitmap & ~bit, entries)
+
+
+def _iterate(root):
+    """
+    Iterate through the (key, value) pairs in a trie.
+    """
+    stack = [root]
+
+    while stack:
+        for entry in stack.pop().entries:
+            if entry.__class__ is tuple:
+                yield entry
+            else:
+                stack.append(entry)
+
+
+class PersistentMap(Mapping):
+    """
+    An immutable Mapping stored as a hash array mapped trie.
+
+    items: (optional, None) A mapping (or a sequence of key-value
+        pairs).
+
+    Rather than changing the mapping, set and delete return a new
+    PersistentMap. These take O(log n) time and memory, as the new
+    PersistentMap shares everything except the path to the changed key
+    with the original.
+    """
+    __slots__ = ('_root', '_length')
+
+    def __init__(self, items=None):
+        root, length = _EMPTY, 0
+
+        if items is not None:
+            if isinstance(items, MAPPING_TYPES):
+                items = six.iteritems(items)
+
+            for key, value in items:
+                root, added = _assoc(root, 0, _hash(key), key, value)
+                length += added
+
+        self._root = root
+        self._length = length
+
+    @classmethod
+    def _make(cls, root, length):
+        """
+        Build a PersistentMap around an existing trie.
+        """
+        mapping = cls.__new__(cls)
+        mapping._root = root
+        mapping._length = length
+
+        return mapping
+
+    def set(self, key, value):
+        """
+        Build a new PersistentMap with a key set to a value.
+        """
+        root, added = _assoc(self._root, 0, _hash(key), key, value)
+
+        if root is self._root:
+            return self
+
+        return self._make(root, self._length + added)
+
+    def delete(self, key):
+        """
+        Build a new PersistentMap without a key.
+        """
+        hashed = _hash(key)
+        root = _without(self._root, 0, hashed, key)
+
+        if root is self._root:
+            raise KeyError(key)
+        elif root is None:
+            root = _EMPTY
+        elif root.__class__ is tuple:
+            root = _BitmapNode(
+                1 << (_hash(root[0]) & _LEVEL_MASK), (root,)
+            )
+
+        return self._make(root, self._length - 1)
+
+    def __getitem__(self, key):
+        """
+        Access a value associated with a key.
+        """
+        value = _find(self._root, _hash(key), key, _MISSING)
+
+        if value is _MISSING:
+            raise KeyError(key)
+
+        return value
+
+    def get(self, key, default=None):
+        """
+        Access a value associated with a key, or default if there is no
+        such key.
+        """
+        return _find(self._root, _hash(key), key, default)
+
+    def __contains__(self, key):
+        """
+        Check whether the mapping contains a key.
+        """
+        return _find(self._root, _hash(key), key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        """
+        Check the length of the mapping.
+        """
+        return self._length
+
+    def __iter__(self):
+        """
+        Iterate through the keys.
+        """
+        for key, _ in _iterate(self._root):
+            yield key
+
+    def _items(self):
+        """
+        Iterate through the key-value pairs.
+        """
+        return _iterate(self._root)
+
+    def __eq__(self, other):
+        """
+        Check whether the mapping is equal to another mapping.
+        """
+        if other is self:
+            return True
+        elif isinstance(other, PersistentMap):
+            if other._root is self._root:
+                return True
+        elif not isinstance(other, MAPPING_TYPES):
+            return NotImplemented
+
+        if len(other) != self._length:
+            return False
+
+        for key, value in _iterate(self._root):
+            other_value = other.get(key, _MISSING)
+
+            if other_value is _MISSING or not (
+                    other_value is value or other_value == value):
+                return False
+
+        return True
+
+    def __ne__(self, other):
+        """
+        Check whether the mapping is not equal to another mapping.
+        """
+        equal = self.__eq__(other)
+
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        return six.u("PersistentMap({mapping})").format(
+            mapping=repr(dict(self._items()))
+        )
+
+    def __reduce__(self):
+        """
+        Serialize the object.
+        """
+        return (self.__class__, (dict(self._items()),))
+
+
+def _persist(value):
+    """
+    Convert a value so it can be stored in a PersistentMap without
+    being shared with anything that could change it: Mappings (nested
+    in Mappings) are converted to PersistentMaps.
+
+    Raises a ValueError for Mappings that contain themselves.
+    """
+    if (value.__class__ is PersistentMap or
+            not isinstance(value, MAPPING_TYPES)):
+        return value
+
+    # id of original value: (original value, converted value). The
+    # original is kept so its id can't be reused by another value.
+    converted = {}
+    # id of a Mapping being converted: its key-value pairs, read exactly
+    # once (Mappings may build their values on access)
+    contents = {}
+    stack = [(value, False)]
+
+    while stack:
+        current, ready = stack.pop()
+        ident = id(current)
+
+        if ident in converted:
+            continue
+        elif isinstance(current, PersistentAttr):
+            converted[ident] = (current, current._map)
+            continue
+        elif (current.__class__ is PersistentMap or
+                not isinstance(current, MAPPING_TYPES)):
+            continue
+        elif not ready:
+            if ident in contents:
+                raise ValueError("Can't store a Mapping that contains itself")
+
+            items = contents[ident] = list(six.iteritems(current))
+            stack.append((current, True))
+            stack.extend((element, False) for _, element in items)
+            continue
+
+        root, length = _EMPTY, 0
+
+        for key, element in contents.pop(ident):
+            entry = converted.get(id(element))
+
+            if entry is not None:
+                element = entry[1]
+
+            root, added = _assoc(root, 0, _hash(key), key, element)
+            length += added
+
+        converted[ident] = (current, PersistentMap._make(root, length))
+
+    return converted[id(value)][1]
+
+
+class PersistentAttr(MutableAttr):
+    """
+    A MutableAttr backed by a PersistentMap, which can be snapshotted
+    in constant time.
+
+    items: (optional, None) A mapping (or a sequence of key-value
+        pairs).
+    sequence_type: (optional, tuple) The type sequences accessed as
+        attributes are converted to.
+
+    snapshot returns a new PersistentAttr that shares its storage with
+    the original, and changing either one afterwards takes O(log n)
+    time (copying only the path to the changed key) without affecting
+    the other.
+
+    Nested Mappings are stored as PersistentMaps, so they can't be
+    changed behind a snapshot's back. Accessing one as an attribute
+    returns a PersistentAttr that writes changes back to its parent
+    (so attr.db.host = 'localhost' works). If the parent's value for
+    that key is replaced in the meantime, the child stops writing back,
+    and becomes an independent PersistentAttr.
+
+    Only Mappings are converted: other mutable values (such as lists)
+    are shared between snapshots, as they would be by a shallow copy.
+    """
+    __slots__ = (
+        '_map', '_config', '_allow_invalid_attributes', '_parent', '_key',
+    ) + INSTANCE_SLOTS
+
+    _sequence_type = setting('sequence_type')
+    _shares_config = True
+    _write_through_children = True
+
+    def __init__(self, items=None, sequence_type=tuple):
+        if items is None:
+            items = {}
+        elif not isinstance(items, Mapping):
+            items = dict(items)
+
+        self._setattr('_map', _persist(items))
+        self._setattr('_config', Configuration(sequence_type))
+        self._setattr('_allow_invalid_attributes', False)
+        self._setattr('_parent', None)
+        self._setattr('_key', None)
+
+    @classmethod
+    def _make(cls, mapping, configuration, parent=None, key=None):
+        """
+        Build an instance around a PersistentMap.
+
+        mapping: The PersistentMap.
+        configuration: The Configuration of the instance.
+        parent: (optional, None) The PersistentAttr that mapping is
+            stored in, which changes will be written back to.
+        key: (optional, None) The key mapping is stored under in parent.
+        """
+        attr = cls.__new__(cls)
+        attr._setattr('_map', mapping)
+        attr._setattr('_config', configuration)
+        attr._setattr('_allow_invalid_attributes', False)
+        attr._setattr('_parent', parent)
+        attr._setattr('_key', key)
+
+        return attr
+
+    def snapshot(self):
+        """
+        Build a new PersistentAttr with the same contents, in O(1).
+
+        Changes made to either this object or the snapshot afterwards
+        won't be seen by the other.
+        """
+        return self._make(self._map, self._config)
+
+    def _configuration(self):
+        """
+        The configuration for a PersistentAttr instance (its
+        sequence_type, for subclasses with their own _constructor).
+        """
+        if self._shares_config:
+            return self._config
+
+        return self._config.sequence_type
+
+    def _replace(self, mapping):
+        """
+        Replace the PersistentMap backing this object, and write the
+        change back up through its parents.
+        """
+        attr = self
+
+        while True:
+            parent, previous = attr._parent, attr._map
+            attr._setattr('_map', mapping)
+
+            if parent is None:
+                break
+            elif parent._map.get(attr._key, _MISSING) is not previous:
+                attr._setattr('_parent', None)  # parent has moved on
+                break
+
+            mapping = parent._map.set(attr._key, mapping)
+            attr = parent
+
+    def _child(self, key, value):
+        """
+        Build the attribute-style version of the value stored at key,
+        which writes changes to nested Mappings back to this object.
+        """
+        if value.__class__ is PersistentMap:
+            return self._make(value, self._config, self, key)
+
+        return super(PersistentAttr, self)._child(key, value)
+
+    def __getitem__(self, key):
+        """
+        Access a value associated with a key.
+        """
+        return self._map[key]
+
+    def __setitem__(self, key, value):
+        """
+        Add a key-value pair to the instance.
+        """
+        self._replace(self._map.set(key, _persist(value)))
+        self._forget_child(key)
+
+    def __delitem__(self, key):
+        """
+        Delete a key-value pair
+        """
+        self._replace(self._map.delete(key))
+        self._forget_child(key)
+
+    def __len__(self):
+        """
+        Check the length of the mapping.
+        """
+        return len(self._map)
+
+    def __iter__(self):
+        """
+        Iterated through the keys.
+        """
+        return iter(self._map)
+
+    def __contains__(self, key):
+        """
+        Check whether the mapping contains a key.
+        """
+        return key in self._map
+
+    def get(self, key, default=None):
+        """
+        Access a value associated with a key, or default if there is no
+        such key.
+        """
+        return self._map.get(key, default)
+
+    def deep_update(self, other):
+        """
+        Merge a mapping into this Attr in place, combining overlapping
+        Mappings, and favoring values from other.
+
+        other: A mapping.
+
+        Each value from other is set in the PersistentMap holding it,
+        so only the paths down to the keys of other are copied, taking
+        O(log n) time per key.
+        """
+        top = list(six.iteritems(_stored(other)))
+        # [PersistentMap being updated, pairs left to set, key in parent]
+        stack = [[self._map, iter(top), None]]
+
+        while stack:
+            frame = stack[-1]
+            mapping, items = frame[0], frame[1]
+
+            for key, value in items:
+                if isinstance(value, MAPPING_TYPES):
+                    current = mapping.get(key)
+
+                    if current.__class__ is PersistentMap:
+                        frame[0] = mapping
+                        stack.append([
+                            current,
+                            iter(list(six.iteritems(_stored(value)))),
+                            key,
+                        ])
+                        break
+
+                mapping = mapping.set(key, _persist(value))
+            else:
+                stack.pop()
+
+                if not stack:
+                    self._replace(mapping)
+                    break
+
+                parent = stack[-1]
+                parent[0] = parent[0].set(frame[2], mapping)
+
+        for key, _ in top:
+            self._forget_child(key)
+
+    def __eq__(self, other):
+        """
+        Check whether the mapping is equal to another mapping.
+        """
+        if isinstance(other, PersistentAttr):
+            other = other._map
+
+        return self._map.__eq__(other)
+
+    def __ne__(self, other):
+        """
+        Check whether the mapping is not equal to another mapping.
+        """
+        equal = self.__eq__(other)
+
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
+    @classmethod
+    def from_nested(cls, obj, configuration=_DEFAULT):
+        """
+        Convert a tree of nested Mappings to a PersistentAttr.
+
+        obj: A Mapping.
+        configuration: (optional) The configuration (see
+            _configuration) of the new instance. By default, the
+            configuration of cls().
+
+        PersistentAttrs always convert nested Mappings when they are
+        stored, so this is the same as building a new instance.
+        Sequences are stored as they are, and Mappings that contain
+        themselves raise a ValueError.
+        """
+        if not isinstance(obj, Mapping):
+            raise TypeError(
+                "'{cls}' can only be built from a Mapping".format(
+                    cls=cls.__name__
+                )
+            )
+
+        if configuration is _DEFAULT:
+            configuration = cls()._configuration()
+
+        return cls._constructor(obj, configuration)
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        return six.u("PersistentAttr({mapping})").format(
+            mapping=repr(dict(self._map._items()))
+        )
+
+    def __getstate__(self):
+        """
+        Serialize the object.
+        """
+        return (
+            self._map,
+            self._sequence_type,
+            self._allow_invalid_attributes
+        )
+
+    def __setstate__(self, state):
+        """
+        Deserialize the object.
+        """
+        mapping, sequence_type, allow_invalid_attributes = state
+        self._setattr('_map', mapping)
+        self._setattr('_config', Configuration(sequence_type))
+        self._setattr('_allow_invalid_attributes', allow_invalid_attributes)
+        self._setattr('_parent', None)
+        self._setattr('_key', None)
+
+    @classmethod
+    def _constructor(cls, mapping, configuration):
+        """
+        A standardized constructor.
+
+        configuration: A Configuration, which the new instance will
+            share, or a sequence_type.
+        """
+        if not isinstance(configuration, Configuration):
+            configuration = Configuration(configuration)
+
+        return cls._make(_persist(mapping), configuration)
@@ -0,0 +1,207 @@
+"""
+Pulling the values at many paths out of many mappings at once.
+"""
+from collections import deque
+from itertools import islice
+
+import six
+
+from attrdict.lazy import Lazy
+from attrdict.merge import _stored
+from attrdict.path import MISSING, lookup, parse_path
+
+
+__all__ = ['Projector', 'project']
+
+
+# The most chunks of records a pool of workers is given at a time
+MAX_PENDING_CHUNKS = 32
+
+# The number of rows columns are built from at a time
+_TRANSPOSE_SIZE = 1000
+
+
+def project(paths, default=None):
+    """
+    Build a Projector for some paths (see Projector).
+
+    paths: An iterable of paths (see attrdict.path).
+    default: (optional, None) The value used for a path that a record
+        has nothing at.
+    """
+    return Projector(paths, default)
+
+
+class Projector(object):
+    """
+    Pulls the values at a fixed set of paths out of mappings.
+
+    paths: An iterable of paths (see attrdict.path).
+    default: (optional, None) The value used for a path that a record
+        has nothing at.
+
+    Calling a Projector with a mapping (a record) returns a tuple of
+    the values at each path. Like get_path, values are read from the
+    Mappings Attrs store them in, so no Attrs are built, and
+    default_factory is never called.
+
+    The paths are parsed once, and merged into a trie, so a prefix
+    shared by several paths (e.g., 'user' in 'user.id' and 'user.name')
+    is only looked up once per record.
+    """
+    __slots__ = ('_paths', '_default', '_steps', '_outputs')
+
+    def __init__(self, paths, default=None):
+        self._paths = tuple(paths)
+        self._default = default
+
+        # The trie is flattened into steps, each looking up a key in
+        # the value found by an earlier step (or in the record, for
+        # step 0). Step i's value goes in slot i + 1, and slot 0 holds
+        # the record.
+        steps = []
+        slots = {}  # (parent slot, key): slot
+        outputs = []
+
+        for path in self._paths:
+            slot = 0
+
+            for key in parse_path(path):
+                child = slots.get((slot, key))
+
+                if child is None:
+                    steps.append((slot, key))
+                    child = slots[(slot, key)] = len(steps)
+
+                slot = child
+
+            outputs.append(slot)
+
+        self._steps = tuple(steps)
+        self._outputs = tuple(outputs)
+
+    @property
+    def paths(self):
+        """
+        The paths, in the order their values are returned.
+        """
+        return self._paths
+
+    def __call__(self, record):
+        """
+        The values at each path in a record, as a tuple.
+
+        record: A Mapping.
+        """
+        values = [_stored(record)]
+        append = values.append
+
+        for parent, key in self._steps:
+            container = values[parent]
+
+            if container.__class__ is dict:
+                value = container.get(key, MISSING)
+
+                if value.__class__ is Lazy:
+                    value = value.resolve()
+            else:
+                value = lookup(container, key)
+
+            append(value)
+
+        default = self._default
+
+        return tuple([
+            default if value is MISSING else value
+            for value in [values[slot] for slot in self._outputs]
+        ])
+
+    def rows(self, records, executor=None, chunksize=1000):
+        """
+        Project each of many records, in a single pass.
+
+        records: An iterable of Mappings.
+        executor: (optional, None) A concurrent.futures Executor (e.g.,
+            a ProcessPoolExecutor) to project records on. The records
+            (and the values projected) must be picklable to be sent to
+            a process. By default, records are projected by the calling
+            thread.
+        chunksize: (optional, 1000) The number of records to send to a
+            worker at a time.
+
+        Returns an iterator of tuples (see __call__), in the same order
+        as records. With an executor, records are read in chunks as
+        rows are consumed, so only a limited number of chunks (see
+        MAX_PENDING_CHUNKS) are held at a time.
+        """
+        if executor is None:
+            return six.moves.map(self, records)
+        elif chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+
+        return self._pooled_rows(records, executor, chunksize)
+
+    def columns(self, records, executor=None, chunksize=1000):
+        """
+        Project each of many records, in a single pass, into columns.
+
+        records: An iterable of Mappings.
+        executor: (optional, None) See rows.
+        chunksize: (optional, 1000) See rows.
+
+        Returns a list with a list of values for each path.
+        """
+        columns = [[] for _ in self._outputs]
+        rows = self.rows(records, executor, chunksize)
+
+        while True:
+            chunk = list(islice(rows, _TRANSPOSE_SIZE))
+
+            if not chunk:
+                return columns
+
+            # zip(*chunk) turns a chunk of rows into a chunk of columns
+            for column, values in zip(columns, zip(*chunk)):
+                column.extend(values)
+
+    def _pooled_rows(self, records, executor, chunksize):
+        """
+        Project records in chunks on an executor (see rows).
+        """
+        records = iter(records)
+        pending = deque()
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < MAX_PENDING_CHUNKS:
+                chunk = list(islice(records, chunksize))
+
+                if chunk:
+                    pending.append(executor.submit(_project, self, chunk))
+                else:
+                    exhausted = True
+
+            if not pending:
+                return
+
+            for row in pending.popleft().result():
+                yield row
+
+    def __reduce__(self):
+        """
+        Serialize the object (it is rebuilt from its paths).
+        """
+        return (Projector, (self._paths, self._default))
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        return six.u("Projector({paths!r})").format(paths=list(self._paths))
+
+
+def _project(projector, records):
+    """
+    Project a chunk of records (in a worker of Projector.rows).
+    """
+    return [projector(record) for record in records]
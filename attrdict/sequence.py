@@ -0,0 +1,141 @@
+"""
+A lazily-built sequence view for use as an Attr's sequence_type.
+"""
+from collections import Sequence
+
+import six
+
+
+__all__ = ['LazySequence', 'is_lazy']
+
+
+class LazySequence(Sequence):
+    """
+    A read-only view of a sequence that converts its elements as they
+    are accessed, instead of all at once.
+
+    sequence: The underlying sequence.
+    build: The function used to convert elements (i.e., Attr._build).
+
+    Pass LazySequence as an Attr's sequence_type to use it. Indexing
+    only converts the requested element, and slicing returns another
+    LazySequence over the same underlying sequence.
+    """
+    def __init__(self, sequence, build, _indices=None):
+        self._sequence = sequence
+        self._build = build
+        # (start, step, length) into sequence, or None for all of it
+        self._indices = _indices
+
+    def _range(self):
+        """
+        The indices of the underlying sequence covered by this view.
+        """
+        if self._indices is None:
+            return six.moves.range(len(self._sequence))
+
+        start, step, length = self._indices
+
+        return six.moves.range(start, start + step * length, step)
+
+    def __getitem__(self, index):
+        """
+        Access an element (or a slice) of the sequence.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            length = len(six.moves.range(start, stop, step))
+
+            if self._indices is not None:
+                offset, scale, _ = self._indices
+                start, step = offset + start * scale, step * scale
+
+            return self.__class__(
+                self._sequence, self._build, (start, step, length)
+            )
+
+        if self._indices is None:
+            return self._build(self._sequence[index])
+
+        start, step, length = self._indices
+
+        if index < 0:
+            index += length
+
+        if not 0 <= index < length:
+            raise IndexError("sequence index out of range")
+
+        return self._build(self._sequence[start + index * step])
+
+    def __len__(self):
+        """
+        Check the length of the sequence.
+        """
+        if self._indices is None:
+            return len(self._sequence)
+
+        return self._indices[2]
+
+    def __iter__(self):
+        """
+        Iterate through the (converted) elements.
+        """
+        build = self._build
+
+        if self._indices is None:
+            for element in self._sequence:
+                yield build(element)
+        else:
+            sequence = self._sequence
+
+            for index in self._range():
+                yield build(sequence[index])
+
+    def __eq__(self, other):
+        """
+        Compare the sequence element-wise against another sequence.
+        """
+        if other is self:
+            return True
+
+        if (not isinstance(other, Sequence) or
+                isinstance(other, (six.string_types, six.binary_type))):
+            return NotImplemented
+
+        if len(self) != len(other):
+            return False
+
+        return all(a == b for a, b in six.moves.zip(self, other))
+
+    def __ne__(self, other):
+        """
+        Compare the sequence element-wise against another sequence.
+        """
+        equal = self.__eq__(other)
+
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        sequence = self._sequence
+
+        return six.u("LazySequence({sequence})").format(
+            sequence=repr([sequence[index] for index in self._range()])
+        )
+
+
+def is_lazy(sequence_type):
+    """
+    Check whether a sequence_type is LazySequence (or a subclass).
+    """
+    return (
+        isinstance(sequence_type, type) and
+        issubclass(sequence_type, LazySequence)
+    )
@@ -0,0 +1,205 @@
+"""
+An AttrDefault that calls default_factory once per missing key, no
+matter how many threads are waiting for it.
+"""
+import sys
+from threading import Event, Lock, current_thread
+
+import six
+
+from attrdict.configuration import Configuration
+from attrdict.default import AttrDefault
+from attrdict.merge import MAPPING_TYPES
+
+
+__all__ = ['SingleFlightAttrDefault']
+
+
+class _Flight(object):
+    """
+    A call to default_factory in progress, which other threads can
+    wait for.
+    """
+    __slots__ = ('done', 'thread', 'value', 'error')
+
+    def __init__(self):
+        self.done = Event()
+        self.thread = current_thread()
+        self.value = None
+        self.error = None  # the sys.exc_info of a failed call
+
+
+class SingleFlightAttrDefault(AttrDefault):
+    """
+    An AttrDefault that calls default_factory at most once at a time for
+    each missing key.
+
+    The first thread to miss a key calls default_factory. Any other
+    thread that misses the same key before the call has finished waits
+    for it, and gets the same value (or the same exception). A failed
+    call leaves nothing behind: the key stays missing, so the next miss
+    calls default_factory again.
+
+    Looking up a key that is present doesn't take a lock (accessing a
+    nested Mapping as an attribute only does the first time it is
+    wrapped). flight_stats counts the calls to default_factory, the
+    misses that were coalesced into another thread's call, and the
+    calls that failed.
+
+    Nested Mappings accessed as attributes are cached (see
+    _cache_children), so every thread that reaches one through the same
+    parent shares its calls in progress.
+
+    A default_factory that looks up the key it is building raises a
+    RuntimeError rather than waiting for itself.
+    """
+    __slots__ = ('_flights', '_flight_lock', '_flight_counts')
+
+    _cache_children = True
+    _shares_config = True
+
+    def __init__(self, default_factory=None, items=None, sequence_type=tuple,
+                 pass_key=False):
+        super(SingleFlightAttrDefault, self).__init__(
+            default_factory, items, sequence_type, pass_key
+        )
+
+        self._start_flights()
+
+    def _start_flights(self):
+        """
+        Set up the (unshared) state for tracking calls in progress.
+        """
+        self._setattr('_flights', {})
+        self._setattr('_flight_lock', Lock())
+        self._setattr('_flight_counts', [0, 0, 0])  # calls, coalesced, errors
+
+    def flight_stats(self):
+        """
+        A dict of counts: 'calls' to default_factory, misses that were
+        'coalesced' into a call made by another thread, and calls that
+        raised 'errors'.
+        """
+        with self._flight_lock:
+            calls, coalesced, errors = self._flight_counts
+
+        return {'calls': calls, 'coalesced': coalesced, 'errors': errors}
+
+    def _child(self, key, value):
+        """
+        Build (or reuse) the attribute-style version of the value stored
+        at key, so that threads don't build competing children.
+
+        Only building a child that will be cached takes the lock: cached
+        children, and values that aren't Mappings, are returned without
+        it.
+        """
+        if not isinstance(value, MAPPING_TYPES):  # never cached
+            return self._build(value)
+
+        children = self._children
+
+        if children is not None:
+            cached = children.get(key)
+
+            if cached is not None and cached[0] is value:
+                return cached[1]
+
+        with self._flight_lock:
+            return super(SingleFlightAttrDefault, self)._child(key, value)
+
+    def __missing__(self, key):
+        """
+        Add a missing element, or wait for the thread already adding it.
+        """
+        counts = self._flight_counts
+
+        with self._flight_lock:
+            if key in self._mapping:  # added while waiting for the lock
+                return self._mapping[key]
+
+            flight = self._flights.get(key)
+
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                counts[0] += 1
+                leader = True
+            elif flight.thread is current_thread():
+                raise RuntimeError(
+                    "default_factory looked up the key it is building: "
+                    "{key!r}".format(key=key)
+                )
+            else:
+                counts[1] += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+
+            if flight.error is not None:
+                six.reraise(*flight.error)
+
+            return flight.value
+
+        try:
+            if self._pass_key:
+                value = self._default_factory(key)
+            else:
+                value = self._default_factory()
+        except BaseException:
+            flight.error = sys.exc_info()
+
+            with self._flight_lock:
+                counts[2] += 1
+                del self._flights[key]
+
+            flight.done.set()
+            raise
+
+        flight.value = value
+
+        with self._flight_lock:
+            self[key] = value
+            del self._flights[key]
+
+        flight.done.set()
+
+        return value
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        return six.u(
+            "SingleFlightAttrDefault({default_factory}, {pass_key}, "
+            "{mapping})"
+        ).format(
+            default_factory=repr(self._default_factory),
+            pass_key=repr(self._pass_key),
+            mapping=repr(self._mapping),
+        )
+
+    def __setstate__(self, state):
+        """
+        Deserialize the object.
+        """
+        super(SingleFlightAttrDefault, self).__setstate__(state)
+        self._start_flights()
+
+    @classmethod
+    def _constructor(cls, mapping, configuration):
+        """
+        A standardized constructor.
+
+        configuration: A Configuration, which the new instance will
+            share, or a (sequence_type, default_factory, pass_key)
+            tuple.
+        """
+        attr = super(SingleFlightAttrDefault, cls)._constructor(
+            mapping, configuration
+        )
+
+        if isinstance(configuration, Configuration):  # __init__ was skipped
+            attr._start_flights()
+
+        return attr
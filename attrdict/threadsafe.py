@@ -0,0 +1,412 @@
+"""
+A thread-safe implementation of AttrMap.
+"""
+from collections import Mapping
+from threading import Lock
+
+import six
+
+from attrdict.configuration import Configuration
+from attrdict.lazy import Lazy
+from attrdict.mapping import AttrMap
+from attrdict.merge import MAPPING_TYPES, merge
+from attrdict.mixins import _DEFAULT
+
+
+__all__ = ['ThreadSafeAttrMap']
+
+
+_MISSING = object()
+
+
+def _own(value):
+    """
+    Copy a value so it can be stored in a ThreadSafeAttrMap without
+    being shared with anything that could change it: Mappings (nested
+    in Mappings) are copied to dicts.
+
+    Raises a ValueError for Mappings that contain themselves.
+    """
+    if not isinstance(value, MAPPING_TYPES):
+        return value
+
+    # id of original value: (original value, copied value). The
+    # original is kept so its id can't be reused by another value.
+    copied = {}
+    # id of a Mapping being copied: its key-value pairs, read exactly
+    # once (Mappings may build their values on access)
+    contents = {}
+    stack = [(value, False)]
+
+    while stack:
+        current, ready = stack.pop()
+        ident = id(current)
+
+        if ident in copied:
+            continue
+        elif isinstance(current, ThreadSafeAttrMap):
+            # never changed in place
+            copied[ident] = (current, current._mapping)
+            continue
+        elif not isinstance(current, MAPPING_TYPES):
+            continue
+        elif not ready:
+            if ident in contents:
+                raise ValueError("Can't store a Mapping that contains itself")
+
+            items = contents[ident] = list(six.iteritems(current))
+            stack.append((current, True))
+            stack.extend((element, False) for _, element in items)
+            continue
+
+        result = {}
+
+        for key, element in contents.pop(ident):
+            entry = copied.get(id(element))
+            result[key] = element if entry is None else entry[1]
+
+        copied[ident] = (current, result)
+
+    return copied[id(value)][1]
+
+
+class ThreadSafeAttrMap(AttrMap):
+    """
+    An AttrMap that can be shared between threads.
+
+    items: (optional, None) A mapping (or a sequence of key-value
+        pairs).
+    sequence_type: (optional, tuple) The type sequences accessed as
+        attributes are converted to.
+
+    The dict backing the instance is never changed in place. Each
+    change copies it, makes the change to the copy, and swaps the copy
+    in, while holding a lock, so reads never take the lock or wait for
+    a writer, and always see either the old or the new contents (never
+    a change half-made). Compound operations (setdefault, pop, popitem,
+    update, deep_update and +=) are atomic.
+
+    Writes cost O(n) in the size of the mapping being changed, so this
+    suits mappings that are read far more often than they are written
+    (e.g., shared configuration).
+
+    Nested Mappings are copied to dicts when they are stored, so they
+    can't be changed behind the instance's back. Accessing one as an
+    attribute returns a ThreadSafeAttrMap that shares its parent's lock
+    and writes changes back to its parent (so attr.db.host = 'localhost'
+    is atomic too). Each change is made to the parent's value for that
+    key at the time of the change, even if it has been replaced since
+    the child was built (reading through the child sees its value as of
+    the child's last change). If the parent no longer holds a Mapping
+    under that key, the child stops writing back, and becomes an
+    independent ThreadSafeAttrMap. Other mutable values (such as lists)
+    are stored as-is, and are not protected.
+    """
+    __slots__ = ('_lock', '_parent', '_key')
+
+    _write_through_children = True
+    _shares_config = True
+
+    def __init__(self, items=None, sequence_type=tuple):
+        super(ThreadSafeAttrMap, self).__init__(items, sequence_type)
+
+        self._setattr('_mapping', _own(self._mapping))
+        self._setattr('_lock', Lock())
+        self._setattr('_parent', None)
+        self._setattr('_key', None)
+
+    @classmethod
+    def _make(cls, mapping, configuration, lock, parent=None, key=None):
+        """
+        Build an instance around a dict that is already owned.
+
+        mapping: The dict.
+        configuration: The Configuration of the instance.
+        lock: The Lock that changes are made under.
+        parent: (optional, None) The ThreadSafeAttrMap that mapping is
+            stored in, which changes will be written back to.
+        key: (optional, None) The key mapping is stored under in parent.
+        """
+        attr = cls.__new__(cls)
+        attr._setattr('_mapping', mapping)
+        attr._setattr('_config', configuration)
+        attr._setattr('_allow_invalid_attributes', False)
+        attr._setattr('_lock', lock)
+        attr._setattr('_parent', parent)
+        attr._setattr('_key', key)
+
+        return attr
+
+    def _current(self):
+        """
+        The dict currently stored at this object's place in the tree,
+        which changes should be made to. Must be called with the lock
+        held.
+
+        A child refreshes its view of its parent's value for its key (so
+        changes made through a view that was built before another
+        thread's change aren't lost). If that value is no longer a
+        dict, the child stops writing back, and keeps its own dict.
+        """
+        path = []
+        attr = self
+
+        while attr._parent is not None:
+            path.append(attr)
+            attr = attr._parent
+
+        mapping = attr._mapping
+
+        for attr in reversed(path):
+            value = mapping.get(attr._key)
+
+            if value.__class__ is dict:
+                attr._setattr('_mapping', value)
+            else:
+                attr._setattr('_parent', None)  # parent has moved on
+
+            mapping = attr._mapping
+
+        return mapping
+
+    def _replace(self, mapping):
+        """
+        Swap in the dict backing this object, and write the change back
+        up through its parents. Must be called with the lock held, after
+        _current.
+        """
+        attr = self
+        attr._setattr('_mapping', mapping)
+
+        while attr._parent is not None:
+            mapping = dict(attr._parent._mapping)
+            mapping[attr._key] = attr._mapping
+            attr = attr._parent
+            attr._setattr('_mapping', mapping)
+
+    def _child(self, key, value):
+        """
+        Build the attribute-style version of the value stored at key,
+        which writes changes to nested Mappings back to this object.
+        """
+        if value.__class__ is dict:
+            return self._make(value, self._config, self._lock, self, key)
+
+        return super(ThreadSafeAttrMap, self)._child(key, value)
+
+    def __getitem__(self, key):
+        """
+        Access a value associated with a key.
+
+        A Lazy value is resolved, but (as the dict backing the instance
+        is never changed in place) it isn't replaced with its value.
+        """
+        value = self._mapping[key]
+
+        if value.__class__ is Lazy:
+            return value.resolve()
+
+        return value
+
+    def _resolve(self, key, lazy):
+        """
+        Resolve a Lazy stored under key (without replacing it, as the
+        dict backing the instance is never changed in place).
+        """
+        return lazy.resolve()
+
+    def __setitem__(self, key, value):
+        """
+        Add a key-value pair to the instance.
+        """
+        value = _own(value)
+
+        with self._lock:
+            mapping = dict(self._current())
+            mapping[key] = value
+            self._replace(mapping)
+
+        self._forget_child(key)
+
+    def __delitem__(self, key):
+        """
+        Delete a key-value pair
+        """
+        with self._lock:
+            mapping = dict(self._current())
+            del mapping[key]
+            self._replace(mapping)
+
+        self._forget_child(key)
+
+    def setdefault(self, key, default=None):
+        """
+        Access a value associated with a key, first setting it to
+        default if there is no such key.
+        """
+        value = self._mapping.get(key, _MISSING)
+
+        if value is not _MISSING:
+            return value
+
+        default = _own(default)
+
+        with self._lock:
+            mapping = self._current()
+            value = mapping.get(key, _MISSING)
+
+            if value is not _MISSING:  # set by another thread
+                return value
+
+            mapping = dict(mapping)
+            mapping[key] = default
+            self._replace(mapping)
+
+        return default
+
+    def pop(self, key, default=_MISSING):
+        """
+        Remove a key and return its value, or default if there is no
+        such key (raising a KeyError if no default is given).
+        """
+        with self._lock:
+            mapping = self._current()
+
+            if key not in mapping:
+                if default is _MISSING:
+                    raise KeyError(key)
+
+                return default
+
+            mapping = dict(mapping)
+            value = mapping.pop(key)
+            self._replace(mapping)
+
+        self._forget_child(key)
+
+        return value
+
+    def popitem(self):
+        """
+        Remove and return a key-value pair (raising a KeyError if the
+        mapping is empty).
+        """
+        with self._lock:
+            mapping = dict(self._current())
+            key, value = mapping.popitem()
+            self._replace(mapping)
+
+        self._forget_child(key)
+
+        return key, value
+
+    def clear(self):
+        """
+        Remove all key-value pairs.
+        """
+        with self._lock:
+            self._current()
+            self._replace({})
+
+        if self._children is not None:
+            self._children.clear()
+
+    def update(*args, **kwargs):
+        """
+        Add the key-value pairs from a mapping (or a sequence of
+        key-value pairs) and keyword arguments, in a single change.
+        """
+        # self is taken from args, so 'self' can be used as a keyword
+        self, args = args[0], args[1:]
+
+        if len(args) > 1:
+            raise TypeError(
+                "update expected at most 1 argument, got {count}".format(
+                    count=len(args)
+                )
+            )
+
+        items = _own(dict(*args, **kwargs))
+
+        with self._lock:
+            mapping = dict(self._current())
+            mapping.update(items)
+            self._replace(mapping)
+
+        for key in items:
+            self._forget_child(key)
+
+    def deep_update(self, other):
+        """
+        Merge a mapping into this Attr in a single change, combining
+        overlapping Mappings, and favoring values from other.
+
+        other: A mapping.
+
+        Only the nested dicts on the path down to a key found in both
+        are copied.
+        """
+        other = _own(other)
+
+        with self._lock:
+            self._replace(merge(self._current(), other, share=True))
+
+        for key in other:
+            self._forget_child(key)
+
+    @classmethod
+    def from_nested(cls, obj, configuration=_DEFAULT):
+        """
+        Convert a tree of nested Mappings to a ThreadSafeAttrMap.
+
+        obj: A Mapping.
+        configuration: (optional) The configuration (see
+            _configuration) of the new instance. By default, the
+            configuration of cls().
+
+        ThreadSafeAttrMaps always copy nested Mappings when they are
+        stored (and wrap them as they are accessed), so this is the
+        same as building a new instance. Sequences are stored as they
+        are, and Mappings that contain themselves raise a ValueError.
+        """
+        if not isinstance(obj, Mapping):
+            raise TypeError(
+                "'{cls}' can only be built from a Mapping".format(
+                    cls=cls.__name__
+                )
+            )
+
+        if configuration is _DEFAULT:
+            configuration = cls()._configuration()
+
+        return cls._constructor(obj, configuration)
+
+    def __repr__(self):
+        """
+        Return a string representation of the object.
+        """
+        return six.u("ThreadSafeAttrMap({mapping})").format(
+            mapping=repr(self._mapping)
+        )
+
+    def __setstate__(self, state):
+        """
+        Deserialize the object.
+        """
+        super(ThreadSafeAttrMap, self).__setstate__(state)
+        self._setattr('_lock', Lock())
+        self._setattr('_parent', None)
+        self._setattr('_key', None)
+
+    @classmethod
+    def _constructor(cls, mapping, configuration):
+        """
+        A standardized constructor.
+
+        configuration: A Configuration, which the new instance will
+            share, or a sequence_type.
+        """
+        if not isinstance(configuration, Configuration):
+            configuration = Configuration(configuration)
+
+        return cls._make(_own(mapping), configuration, Lock())
@@ -0,0 +1,58 @@
+"""
+Benchmarks for item lookups in defaultdict-style mappings.
+
+Compares AttrDefault and AttrDefaultDict against
+collections.defaultdict, for keys that are present (hits) and keys
+that have to be built (misses).
+
+    python benchmarks/default.py
+"""
+from __future__ import print_function
+
+import timeit
+from collections import defaultdict
+
+from attrdict import AttrDefault, AttrDefaultDict
+
+
+NUMBER = 200000
+
+
+def best(statement):
+    """
+    The best time per call (in nanoseconds) for a statement.
+    """
+    return min(
+        timeit.repeat(statement, number=NUMBER, repeat=5)
+    ) / NUMBER * 1e9
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    print("{0:<16} {1:>10} {2:>10} {3:>10}".format(
+        'class', 'item hit', 'item miss', 'attr hit'
+    ))
+
+    for build in (lambda: defaultdict(int),
+                  lambda: AttrDefault(int),
+                  lambda: AttrDefaultDict(int)):
+        mapping = build()
+        mapping['foo'] = 0
+        keys = iter(range(NUMBER * 5))
+        hit = best(lambda: mapping['foo'])
+        miss = best(lambda: mapping[next(keys)])
+
+        if hasattr(mapping, '_configuration'):
+            attribute = '{0:>8.0f}ns'.format(best(lambda: mapping.foo))
+        else:
+            attribute = '{0:>10}'.format('-')
+
+        print("{0:<16} {1:>8.0f}ns {2:>8.0f}ns {3}".format(
+            mapping.__class__.__name__, hit, miss, attribute
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmarks for attribute access hits and misses.
+
+    python benchmarks/getattr.py
+"""
+from __future__ import print_function
+
+import timeit
+
+from attrdict import AttrDefault, AttrDict, AttrMap
+
+
+NUMBER = 200000
+
+
+def best(function):
+    """
+    The best time per call (in nanoseconds) for a function.
+    """
+    return min(timeit.repeat(function, number=NUMBER, repeat=5)) / NUMBER * 1e9
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    print("{0:<12} {1:>10} {2:>14} {3:>14} {4:>14}".format(
+        'class', 'hit', 'hasattr miss', 'getattr miss', 'private miss'
+    ))
+
+    for mapping in (AttrMap({'foo': 'bar'}), AttrDict({'foo': 'bar'}),
+                    AttrDefault(None, {'foo': 'bar'})):
+        hit = best(lambda: mapping.foo)
+        miss = best(lambda: hasattr(mapping, 'missing'))
+        default = best(lambda: getattr(mapping, 'missing', None))
+        private = best(lambda: hasattr(mapping, '_missing'))
+
+        print(
+            "{0:<12} {1:>8.0f}ns {2:>12.0f}ns {3:>12.0f}ns {4:>12.0f}ns"
+            .format(
+                mapping.__class__.__name__, hit, miss, default, private
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
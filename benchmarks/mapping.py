@@ -0,0 +1,71 @@
+"""
+Benchmarks for the Mapping methods of AttrMap and AttrDefault.
+
+Compares the methods delegating to the underlying mapping against the
+generic versions inherited from the Mapping ABC, and against a dict.
+
+    python benchmarks/mapping.py
+"""
+from __future__ import print_function
+
+from collections import Mapping
+import timeit
+
+from attrdict import AttrDefault, AttrMap
+
+
+NUMBER = 100000
+
+
+def best(function):
+    """
+    The best time per call (in nanoseconds) for a function.
+    """
+    return min(timeit.repeat(function, number=NUMBER, repeat=5)) / NUMBER * 1e9
+
+
+def cases(mapping, other):
+    """
+    The operations to time, as (name, operation, generic operation).
+    """
+    return (
+        ('get (hit)', lambda: mapping.get('key50'),
+         lambda: Mapping.get(mapping, 'key50')),
+        ('get (miss)', lambda: mapping.get('missing'),
+         lambda: Mapping.get(mapping, 'missing')),
+        ('in (hit)', lambda: 'key50' in mapping,
+         lambda: Mapping.__contains__(mapping, 'key50')),
+        ('in (miss)', lambda: 'missing' in mapping,
+         lambda: Mapping.__contains__(mapping, 'missing')),
+        ('list(items())', lambda: list(mapping.items()),
+         lambda: list(Mapping.items(mapping))),
+        ('== (equal)', lambda: mapping == other,
+         lambda: Mapping.__eq__(mapping, other)),
+        ('== (other length)', lambda: mapping == {},
+         lambda: Mapping.__eq__(mapping, {})),
+    )
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    raw = dict(('key{0}'.format(index), index) for index in range(100))
+
+    print("{0:<12} {1:<18} {2:>10} {3:>10} {4:>10}".format(
+        'class', 'operation', 'generic', 'delegated', 'dict'
+    ))
+
+    dict_cases = cases(raw, dict(raw))
+
+    for mapping in (AttrMap(dict(raw)), AttrDefault(None, dict(raw))):
+        for (name, after, before), (_, plain, _) in zip(
+                cases(mapping, dict(raw)), dict_cases):
+            print("{0:<12} {1:<18} {2:>8.0f}ns {3:>8.0f}ns {4:>8.0f}ns".format(
+                mapping.__class__.__name__, name,
+                best(before), best(after), best(plain)
+            ))
+
+
+if __name__ == '__main__':
+    main()
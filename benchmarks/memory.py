@@ -0,0 +1,60 @@
+"""
+Benchmarks for the memory used by each instance of the Attr classes.
+
+Measures the memory allocated while building many small instances, less
+the memory used by the mappings they wrap. Requires Python 3.4+.
+
+    python benchmarks/memory.py
+"""
+from __future__ import print_function
+
+import gc
+import tracemalloc
+
+from attrdict import AttrDefault, AttrDict, AttrMap
+
+
+COUNT = 100000
+
+
+def allocated(build):
+    """
+    The bytes allocated per object by a function that builds a list of
+    COUNT objects.
+    """
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        objects = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(objects) == COUNT
+
+    return size / float(COUNT)
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    items = [{'key': index} for index in range(COUNT)]
+    dicts = allocated(lambda: [dict(item) for item in items])
+
+    cases = (
+        ('AttrMap', lambda: [AttrMap(item) for item in items], 0),
+        ('AttrDefault', lambda: [AttrDefault(None, item) for item in items],
+         0),
+        ('AttrDict', lambda: [AttrDict(item) for item in items], dicts),
+    )
+
+    print("{0:<12} {1:>14}".format('class', 'bytes/instance'))
+
+    for name, build, wrapped in cases:
+        print("{0:<12} {1:>14.0f}".format(name, allocated(build) - wrapped))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmarks for attrdict.merge on wide and deep inputs.
+
+Compares merge against the original recursive implementation, which
+built frozensets of both sides' keys at every level.
+
+    python benchmarks/merge.py
+"""
+from __future__ import print_function
+
+from collections import Mapping
+import sys
+import timeit
+
+from attrdict.merge import merge, merge_all
+
+
+def recursive_merge(left, right):
+    """
+    merge as it was before it used an explicit stack.
+    """
+    merged = {}
+
+    left_keys = frozenset(left)
+    right_keys = frozenset(right)
+
+    for key in left_keys - right_keys:
+        merged[key] = left[key]
+
+    for key in right_keys - left_keys:
+        merged[key] = right[key]
+
+    for key in left_keys & right_keys:
+        left_value = left[key]
+        right_value = right[key]
+
+        if (isinstance(left_value, Mapping) and
+                isinstance(right_value, Mapping)):
+            merged[key] = recursive_merge(left_value, right_value)
+        else:
+            merged[key] = right_value
+
+    return merged
+
+
+def wide(size, offset=0):
+    """
+    A flat mapping with size keys, each holding a small mapping.
+    """
+    return dict(
+        ('key{0}'.format(index), {'value': index})
+        for index in range(offset, offset + size)
+    )
+
+
+def deep(depth, leaf):
+    """
+    A mapping nested depth levels deep, with a few keys per level.
+    """
+    mapping = {'leaf': leaf}
+
+    for level in range(depth):
+        mapping = {'child': mapping, 'level': level, 'tag': leaf}
+
+    return mapping
+
+
+def best(function, number):
+    """
+    The best time per call (in milliseconds) for a function.
+    """
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e3
+
+
+def compare(name, left, right, number):
+    """
+    Time merging left and right with each implementation.
+    """
+    try:
+        before = '{0:.2f}ms'.format(
+            best(lambda: recursive_merge(left, right), number)
+        )
+    except RuntimeError:  # RecursionError
+        before = 'too deep'
+
+    after = best(lambda: merge(left, right), number)
+    shared = best(lambda: merge(left, right, share=True), number)
+
+    print("{0:<28} {1:>10} {2:>8.2f}ms {3:>8.2f}ms".format(
+        name, before, after, shared
+    ))
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    print("{0:<28} {1:>10} {2:>10} {3:>10}".format(
+        'input', 'recursive', 'merge', 'shared'
+    ))
+
+    compare('wide, 50k keys, 50% overlap', wide(50000), wide(50000, 25000), 5)
+    compare('wide, 50k keys, 10 overrides', wide(50000), wide(10), 5)
+    compare('wide, 10 keys, 50k overrides', wide(10), wide(50000), 5)
+    compare('deep, 500 levels', deep(500, 1), deep(500, 2), 50)
+
+    depth = sys.getrecursionlimit() * 2
+    compare('deep, {0} levels'.format(depth), deep(depth, 1), deep(depth, 2),
+            5)
+
+    layers = [wide(10000, offset) for offset in range(0, 8000, 1000)]
+    folded = best(lambda: reduce_merge(layers), 3)
+    single = best(lambda: merge_all(*layers), 3)
+    print("{0:<28} {1:>8.2f}ms {2:>8.2f}ms (merge vs merge_all)".format(
+        '8 layers, 10k keys', folded, single
+    ))
+
+
+def reduce_merge(layers):
+    """
+    Merge layers pairwise.
+    """
+    merged = {}
+
+    for layer in layers:
+        merged = merge(merged, layer)
+
+    return merged
+
+
+if __name__ == '__main__':
+    main()
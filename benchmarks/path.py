@@ -0,0 +1,51 @@
+"""
+Benchmarks for reading nested values by path.
+
+Compares a chain of attributes (which builds an Attr for each level)
+with get_path, and with indexing the underlying dicts directly, for a
+value four levels deep.
+
+    python benchmarks/path.py
+"""
+from __future__ import print_function
+
+import timeit
+
+from attrdict import AttrDict, AttrMap
+
+
+NUMBER = 200000
+
+
+def best(statement):
+    """
+    The best time per call (in nanoseconds) for a statement.
+    """
+    return min(
+        timeit.repeat(statement, number=NUMBER, repeat=5)
+    ) / NUMBER * 1e9
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    data = {'a': {'b': {'c': {'d': 1}}}}
+
+    print("{0:<10} {1:>10} {2:>10} {3:>10}".format(
+        'class', 'attributes', 'get_path', 'dicts'
+    ))
+
+    for cls in (AttrMap, AttrDict):
+        attr = cls(data)
+        attributes = best(lambda: attr.a.b.c.d)
+        path = best(lambda: attr.get_path('a.b.c.d'))
+        dicts = best(lambda: data['a']['b']['c']['d'])
+
+        print("{0:<10} {1:>8.0f}ns {2:>8.0f}ns {3:>8.0f}ns".format(
+            cls.__name__, attributes, path, dicts
+        ))
+
+
+if __name__ == '__main__':
+    main()
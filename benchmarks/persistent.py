@@ -0,0 +1,73 @@
+"""
+Benchmarks for PersistentAttr snapshots and updates.
+
+Compares taking a snapshot against copy.deepcopy of an AttrDict, and
+the cost of changing a value in each.
+
+    python benchmarks/persistent.py
+"""
+from __future__ import print_function
+
+import copy
+import timeit
+
+from attrdict import AttrDict, PersistentAttr
+
+
+def best(function, number):
+    """
+    The best time per call (in microseconds) for a function.
+    """
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def tree(size):
+    """
+    A config-like tree with size sections of ten keys each.
+    """
+    return dict(
+        ('section{0}'.format(index), dict(
+            ('key{0}'.format(key), key) for key in range(10)
+        ))
+        for index in range(size)
+    )
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    print("{0:>6} {1:>14} {2:>14} {3:>14} {4:>14}".format(
+        'size', 'deepcopy', 'snapshot', 'dict set', 'persistent set'
+    ))
+
+    for size in (10, 100, 1000, 10000):
+        raw = tree(size)
+        attr = AttrDict(raw)
+        persistent = PersistentAttr(raw)
+        number = max(1, 10000 // size)
+
+        def dict_set():
+            """
+            Change a nested value in the AttrDict.
+            """
+            attr['section1']['key1'] = 0
+
+        def persistent_set():
+            """
+            Change a nested value in the PersistentAttr.
+            """
+            persistent.section1.key1 = 0
+
+        print("{0:>6} {1:>12.1f}us {2:>12.1f}us {3:>12.1f}us {4:>12.1f}us"
+              .format(
+                  size,
+                  best(lambda: copy.deepcopy(attr), number),
+                  best(persistent.snapshot, 10000),
+                  best(dict_set, 10000),
+                  best(persistent_set, 10000),
+              ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmarks for pulling many fields out of many records.
+
+Compares reading 20 fields from each of a batch of AttrDict records
+with chains of attributes, with get_path, and with a Projector (as
+rows, and as columns). Prints the time per record, in microseconds.
+
+    python benchmarks/projection.py
+"""
+from __future__ import print_function
+
+import timeit
+
+from attrdict import AttrDict, project
+
+
+RECORDS = 10000
+
+# 20 fields, under 4 top-level keys
+PATHS = [
+    '{0}.{1}'.format(section, field)
+    for section in ('user', 'req', 'resp', 'meta')
+    for field in ('a', 'b', 'c', 'd', 'e')
+]
+
+
+def best(statement):
+    """
+    The best time per record (in microseconds) for a statement that
+    processes every record.
+    """
+    return min(timeit.repeat(statement, number=1, repeat=3)) / RECORDS * 1e6
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    records = [
+        AttrDict(
+            (section, dict((field, index) for field in 'abcde'))
+            for section in ('user', 'req', 'resp', 'meta')
+        )
+        for index in range(RECORDS)
+    ]
+    keys = [tuple(path.split('.')) for path in PATHS]
+    projector = project(PATHS)
+
+    def attributes():
+        """
+        Read every field with a chain of attributes.
+        """
+        return [
+            tuple(getattr(getattr(record, section), field)
+                  for section, field in keys)
+            for record in records
+        ]
+
+    def paths():
+        """
+        Read every field with get_path.
+        """
+        return [
+            tuple(record.get_path(path) for path in PATHS)
+            for record in records
+        ]
+
+    assert attributes() == paths() == list(projector.rows(records))
+
+    for name, statement in (
+            ('attributes', attributes),
+            ('get_path', paths),
+            ('rows', lambda: list(projector.rows(records))),
+            ('columns', lambda: projector.columns(records))):
+        print("{0:<12} {1:>8.1f}us".format(name, best(statement)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmarks for ThreadSafeAttrMap under concurrent access.
+
+Compares a ThreadSafeAttrMap against an AttrMap guarded by a single
+Lock (taken for reads and writes alike), for a read-heavy workload
+(1% writes) and a mixed one (10% writes), at 1 to 32 threads. Prints
+the total throughput in thousands of operations per second.
+
+    python benchmarks/threadsafe.py
+
+On a build with a global interpreter lock, throughput can't scale with
+the number of threads; the numbers show the cost of the locking. On a
+free-threaded build, readers of a ThreadSafeAttrMap run in parallel.
+"""
+from __future__ import print_function
+
+import random
+import time
+from threading import Lock, Thread
+
+from attrdict import AttrMap, ThreadSafeAttrMap
+
+
+OPERATIONS = 20000  # per thread
+KEYS = ['key{0}'.format(index) for index in range(100)]
+
+
+class LockedAttrMap(object):
+    """
+    An AttrMap with every access made under one Lock.
+    """
+    def __init__(self, items):
+        self.attr = AttrMap(items)
+        self.lock = Lock()
+
+    def read(self, key):
+        """
+        Read a nested value.
+        """
+        with self.lock:
+            return self.attr.section[key]
+
+    def write(self, key, value):
+        """
+        Write a nested value.
+        """
+        with self.lock:
+            self.attr.section[key] = value
+
+
+class ThreadSafe(object):
+    """
+    A ThreadSafeAttrMap, with the same interface as LockedAttrMap.
+    """
+    def __init__(self, items):
+        self.attr = ThreadSafeAttrMap(items)
+
+    def read(self, key):
+        """
+        Read a nested value.
+        """
+        return self.attr.section[key]
+
+    def write(self, key, value):
+        """
+        Write a nested value.
+        """
+        self.attr.section[key] = value
+
+
+def run(wrapper, threads, write_ratio):
+    """
+    The throughput (in thousands of operations per second) of threads
+    threads, each reading and writing random keys.
+    """
+    def work(seed):
+        """
+        Do OPERATIONS reads and writes.
+        """
+        rng = random.Random(seed)
+        read, write = wrapper.read, wrapper.write
+
+        for _ in range(OPERATIONS):
+            key = rng.choice(KEYS)
+
+            if rng.random() < write_ratio:
+                write(key, 0)
+            else:
+                read(key)
+
+    workers = [Thread(target=work, args=(seed,)) for seed in range(threads)]
+    start = time.time()
+
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join()
+
+    return threads * OPERATIONS / (time.time() - start) / 1000
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    items = {'section': dict((key, 0) for key in KEYS)}
+
+    for name, write_ratio in (('read-heavy', 0.01), ('mixed', 0.1)):
+        print("{0} ({1:.0%} writes), kops/s".format(name, write_ratio))
+        print("{0:>8} {1:>12} {2:>12}".format(
+            'threads', 'locked', 'threadsafe'
+        ))
+
+        for threads in (1, 2, 4, 8, 16, 32):
+            print("{0:>8} {1:>12.0f} {2:>12.0f}".format(
+                threads,
+                max(run(LockedAttrMap(items), threads, write_ratio)
+                    for _ in range(3)),
+                max(run(ThreadSafe(items), threads, write_ratio)
+                    for _ in range(3)),
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Microbenchmarks for Attr._valid_name.
+
+Compares the memoized check against the original uncached version
+(a regular expression lookup plus hasattr) for each class.
+
+    python benchmarks/valid_name.py
+"""
+from __future__ import print_function
+
+import re
+import timeit
+
+import six
+
+from attrdict import AttrDefault, AttrDict, AttrMap
+
+
+NUMBER = 200000
+
+
+def uncached_valid_name(cls, key):
+    """
+    _valid_name as it was before names were memoized.
+    """
+    return (
+        isinstance(key, six.string_types) and
+        re.match('^[A-Za-z][A-Za-z0-9_]*$', key) and
+        not hasattr(cls, key)
+    )
+
+
+def best(function):
+    """
+    The best time per call (in nanoseconds) for a function.
+    """
+    return min(timeit.repeat(function, number=NUMBER, repeat=5)) / NUMBER * 1e9
+
+
+def main():
+    """
+    Run the benchmarks.
+    """
+    print("{0:<12} {1:<10} {2:>10} {3:>10} {4:>8}".format(
+        'class', 'key', 'uncached', 'memoized', 'speedup'
+    ))
+
+    for cls in (AttrMap, AttrDict, AttrDefault):
+        for key in ('foo', 'get', '_private'):
+            before = best(lambda: uncached_valid_name(cls, key))
+            after = best(lambda: cls._valid_name(key))
+
+            print("{0:<12} {1:<10} {2:>8.0f}ns {3:>8.0f}ns {4:>7.1f}x".format(
+                cls.__name__, key, before, after, before / after
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+Tests for the AsyncAttrDefault class.
+"""
+from nose.tools import assert_equals, assert_false, assert_raises, assert_true
+from six import PY2
+
+
+if not PY2:
+    def new_loop():
+        """
+        Make a new event loop the current one.
+        """
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        return loop
+
+    def test_shared_fill():
+        """
+        Waiters for the same key share one call to default_factory.
+        """
+        import asyncio
+
+        from attrdict.aio import AsyncAttrDefault
+        from attrdict.lazy import Lazy
+
+        loop = new_loop()
+        pending = []
+
+        def load(key):
+            """
+            Start loading a key.
+            """
+            pending.append(loop.create_future())
+            return pending[-1]
+
+        attr = AsyncAttrDefault(load, pass_key=True)
+
+        try:
+            first, second = attr.aget('acme'), attr.aget('acme')
+            assert_equals(len(pending), 1)
+            assert_false('acme' in attr)
+            assert_raises(KeyError, lambda: attr['acme'])
+            assert_raises(AttributeError, lambda: attr.acme)
+
+            loop.call_soon(pending[0].set_result, {'tenant': 'acme'})
+            results = loop.run_until_complete(asyncio.gather(first, second))
+
+            assert_equals(results, [{'tenant': 'acme'}] * 2)
+            assert_equals(attr, {'acme': {'tenant': 'acme'}})
+            assert_equals(attr._fills, {})
+
+            # hits don't call default_factory
+            assert_equals(
+                loop.run_until_complete(attr.aget('acme')), {'tenant': 'acme'}
+            )
+            assert_equals(len(pending), 1)
+
+            # factories don't have to be asynchronous
+            attr = AsyncAttrDefault(list, {'sub': {}})
+            assert_equals(loop.run_until_complete(attr.aget('foo')), [])
+            assert_equals(attr, {'foo': [], 'sub': {}})
+
+            # nested mappings are cached, so they share fills
+            assert_true(isinstance(attr.sub, AsyncAttrDefault))
+            assert_true(attr.sub is attr.sub)
+            assert_equals(loop.run_until_complete(attr.sub.aget('bar')), [])
+
+            attr = AsyncAttrDefault()
+            assert_raises(
+                KeyError, loop.run_until_complete, attr.aget('missing')
+            )
+
+            # Lazy values are resolved by every kind of read
+            attr = AsyncAttrDefault(None, {'x': Lazy(lambda: 5)})
+            assert_equals(attr.get('x'), 5)
+            assert_equals(list(attr.values()), [5])
+            assert_equals(list(attr.items()), [('x', 5)])
+            assert_equals(attr, {'x': 5})
+            assert_equals(
+                AsyncAttrDefault(None, {'x': Lazy(lambda: 5)}), {'x': 5}
+            )
+            assert_equals(loop.run_until_complete(attr.aget('x')), 5)
+
+            # workers can't await default_factory, so prefill is refused
+            attr = AsyncAttrDefault(load, pass_key=True)
+            assert_raises(TypeError, attr.prefill, ['k'])
+            assert_equals(attr, {})
+            assert_equals(len(pending), 1)  # load wasn't called
+        finally:
+            loop.close()
+
+    def test_errors():
+        """
+        Every waiter gets the exception, and the key stays missing.
+        """
+        import asyncio
+
+        from attrdict.aio import AsyncAttrDefault
+
+        loop = new_loop()
+        pending = []
+
+        def load():
+            """
+            Start loading a value.
+            """
+            pending.append(loop.create_future())
+            return pending[-1]
+
+        attr = AsyncAttrDefault(load)
+
+        try:
+            waiters = asyncio.gather(
+                attr.aget('key'), attr.aget('key'), return_exceptions=True
+            )
+            loop.call_soon(pending[0].set_exception, ValueError('down'))
+            results = loop.run_until_complete(waiters)
+
+            assert_true(all(isinstance(result, ValueError)
+                            for result in results))
+            assert_false('key' in attr)
+            assert_equals(attr._fills, {})
+
+            waiter = attr.aget('key')
+            assert_equals(len(pending), 2)
+            loop.call_soon(pending[1].set_result, 'loaded')
+            assert_equals(loop.run_until_complete(waiter), 'loaded')
+
+            def fail():
+                """
+                Fail before returning an awaitable.
+                """
+                raise ValueError('failed')
+
+            attr = AsyncAttrDefault(fail)
+            assert_raises(ValueError, loop.run_until_complete, attr.aget('a'))
+        finally:
+            loop.close()
+
+    def test_cancellation():
+        """
+        A fill is only cancelled once nobody is waiting for it.
+        """
+        import asyncio
+
+        from attrdict.aio import AsyncAttrDefault
+
+        loop = new_loop()
+        pending = []
+
+        def load():
+            """
+            Start loading a value.
+            """
+            pending.append(loop.create_future())
+            return pending[-1]
+
+        attr = AsyncAttrDefault(load)
+
+        try:
+            first, second = attr.aget('key'), attr.aget('key')
+            first.cancel()
+            loop.call_soon(pending[0].set_result, 'value')
+
+            assert_equals(loop.run_until_complete(second), 'value')
+            assert_false(pending[0].cancelled())
+            assert_equals(attr.key, 'value')
+
+            # once every waiter is gone, so is the fill
+            first, second = attr.aget('other'), attr.aget('other')
+            first.cancel()
+            second.cancel()
+            loop.run_until_complete(asyncio.sleep(0))
+
+            assert_true(pending[1].cancelled())
+            assert_false('other' in attr)
+            assert_equals(attr._fills, {})
+
+            # cancelling every fill
+            waiter = attr.aget('other')
+            assert_equals(attr.cancel_pending(), 1)
+            assert_raises(
+                asyncio.CancelledError, loop.run_until_complete, waiter
+            )
+            assert_true(pending[2].cancelled())
+            assert_false('other' in attr)
+            assert_equals(attr.cancel_pending(), 0)
+
+            # a value set during a fill is kept
+            waiter = attr.aget('set')
+            attr['set'] = 'explicit'
+            loop.call_soon(pending[3].set_result, 'filled')
+            assert_equals(loop.run_until_complete(waiter), 'filled')
+            assert_equals(attr.set, 'explicit')
+        finally:
+            loop.close()
+
+    def test_pickling():
+        """
+        Pickled instances don't carry fills with them.
+        """
+        import pickle
+
+        from attrdict.aio import AsyncAttrDefault
+
+        attr = AsyncAttrDefault(list, {'foo': 'bar'})
+        loaded = pickle.loads(pickle.dumps(attr))
+
+        assert_equals(loaded, attr)
+        assert_equals(loaded._fills, {})
+        assert_equals(
+            repr(AsyncAttrDefault(None, {'foo': 'bar'})),
+            "AsyncAttrDefault(None, False, {'foo': 'bar'})"
+        )
@@ -1,10 +1,20 @@
 """
 Tests for the AttrDefault class.
 """
-from nose.tools import assert_equals, assert_raises
+from nose.tools import assert_equals, assert_false, assert_raises, assert_true
 from six import PY2
 
 
+def square(key):
+    """
+    A picklable default_factory for prefilling (negative keys fail).
+    """
+    if key < 0:
+        raise ValueError(key)
+
+    return key * key
+
+
 def test_method_missing():
     """
     default values for AttrDefault
@@ -50,3 +60,310 @@ def test_repr():
             ("AttrDefault(<", " 'list'>, True, {'foo': 'bar'})")
         )
     )
+
+
+def test_lookups():
+    """
+    Checking for keys doesn't call default_factory.
+    """
+    from attrdict.default import AttrDefault
+
+    default = AttrDefault(list, {'foo': 'bar'}, sequence_type=None)
+
+    assert_true('foo' in default)
+    assert_false('missing' in default)
+    assert_equals(default.get('missing'), None)
+    assert_equals(default.get('missing', 'value'), 'value')
+    assert_raises(AttributeError, lambda: default._private)
+    assert_equals(default, {'foo': 'bar'})
+
+    # attribute access and item access still do
+    assert_equals(default.missing, [])
+    assert_true('missing' in default)
+    assert_equals(default, {'foo': 'bar', 'missing': []})
+    assert_true(default == AttrDefault(None, {'foo': 'bar', 'missing': []}))
+    assert_false(default != {'foo': 'bar', 'missing': []})
+    assert_true(default != {'foo': 'bar'})
+
+
+def test_maxsize():
+    """
+    Bounded AttrDefaults remove the least recently used keys.
+    """
+    from attrdict.default import AttrDefault
+
+    calls = []
+
+    def load(key):
+        """
+        Record a call.
+        """
+        calls.append(key)
+        return key.upper()
+
+    attr = AttrDefault(load, pass_key=True, maxsize=2)
+
+    assert_equals(attr.foo, 'FOO')
+    assert_equals(attr['bar'], 'BAR')
+    assert_equals(attr.foo, 'FOO')  # foo is now the most recent
+    assert_equals(attr.baz, 'BAZ')  # so bar is evicted
+
+    assert_equals(list(attr), ['foo', 'baz'])
+    assert_false('bar' in attr)
+    assert_equals(calls, ['foo', 'bar', 'baz'])
+    assert_equals(attr, {'foo': 'FOO', 'baz': 'BAZ'})
+    assert_equals(
+        attr.cache_stats(),
+        {'hits': 1, 'misses': 3, 'evictions': 1, 'expirations': 0,
+         'size': 2, 'maxsize': 2, 'ttl': None}
+    )
+
+    # setting a key counts as using it
+    attr['foo'] = 'set'
+    attr['qux'] = 'set'
+    assert_equals(list(attr), ['foo', 'qux'])
+
+    del attr.foo
+    assert_equals(list(attr), ['qux'])
+
+    # the last items passed in are kept
+    attr = AttrDefault(None, [('a', 1), ('b', 2), ('c', 3)], maxsize=2)
+    assert_equals(attr, {'b': 2, 'c': 3})
+    assert_raises(KeyError, lambda: attr['a'])
+    assert_equals(attr.cache_stats()['misses'], 1)
+
+    attr = AttrDefault(list, maxsize=0)
+    assert_equals(attr['a'], [])
+    assert_equals(attr, {})
+
+    assert_equals(AttrDefault(list).cache_stats(), None)
+    assert_raises(ValueError, AttrDefault, list, maxsize=-1)
+    assert_raises(ValueError, AttrDefault, list, ttl=0)
+
+
+def test_ttl():
+    """
+    Keys expire ttl seconds after they are set.
+    """
+    from attrdict.default import AttrDefault
+
+    now = [0]
+    attr = AttrDefault(lambda: now[0], {'given': 'value'}, ttl=10)
+    attr._bounds.clock = lambda: now[0]
+    attr._bounds.expires['given'] = 10
+
+    assert_equals(attr.created, 0)
+
+    now[0] = 5
+    assert_equals(attr.created, 0)
+    assert_true('given' in attr)
+
+    now[0] = 10
+    assert_false('given' in attr)
+    assert_equals(attr.get('created', 'expired'), 'expired')
+    assert_equals(attr, {})
+
+    attr['first'] = attr['second'] = 'set'
+    now[0] = 20
+    assert_equals(attr.second, 20)  # expired, so built again
+    assert_equals(len(attr), 2)
+    assert_equals(attr.purge_expired(), 1)
+    assert_equals(attr, {'second': 20})
+    assert_equals(
+        attr.cache_stats(),
+        {'hits': 1, 'misses': 2, 'evictions': 0, 'expirations': 4,
+         'size': 1, 'maxsize': None, 'ttl': 10}
+    )
+
+    assert_equals(AttrDefault(list, maxsize=1).purge_expired(), 0)
+
+
+def test_bounded_pickling():
+    """
+    Bounded AttrDefaults keep their bounds when pickled, and unbounded
+    ones are pickled as before.
+    """
+    import pickle
+
+    from attrdict.default import AttrDefault
+
+    attr = AttrDefault(list, {'foo': 'bar', 'baz': 'qux'}, maxsize=2, ttl=60)
+    attr.foo
+    loaded = pickle.loads(pickle.dumps(attr))
+
+    assert_equals(loaded, attr)
+    assert_equals(list(loaded), ['baz', 'foo'])
+    assert_equals(loaded.cache_stats()['maxsize'], 2)
+    assert_equals(loaded.cache_stats()['ttl'], 60)
+    assert_equals(loaded.cache_stats()['hits'], 0)
+
+    loaded.new
+    assert_equals(list(loaded), ['foo', 'new'])
+
+    assert_equals(len(AttrDefault(list).__getstate__()), 5)
+
+    # state from before bounds existed
+    old = AttrDefault.__new__(AttrDefault)
+    old.__setstate__((list, {'foo': 'bar'}, tuple, False, False))
+    assert_equals(old, {'foo': 'bar'})
+    assert_equals(old.cache_stats(), None)
+
+
+def test_bounded_iteration():
+    """
+    Bounded AttrDefaults can be looked up while they are iterated over.
+    """
+    from attrdict.default import AttrDefault
+
+    attr = AttrDefault(None, {'a': 1, 'b': 2}, maxsize=10)
+
+    for key in attr:
+        attr[key]
+
+    for key in attr.keys():
+        getattr(attr, key)
+
+    for key, _ in attr.items():
+        attr[key]
+
+    assert_equals(dict((key, attr[key]) for key in attr), {'a': 1, 'b': 2})
+    assert_equals(sorted(attr.values()), [1, 2])
+    assert_equals(attr.cache_stats()['hits'], 8)
+
+
+def test_batch_factory():
+    """
+    Missing keys are built together by batch_factory.
+    """
+    import pickle
+    from collections import Counter
+
+    from attrdict.default import AttrDefault
+
+    batches = []
+
+    def load(keys):
+        """
+        Look up several keys at once (except 'unknown').
+        """
+        batches.append(keys)
+        return dict((key, key.upper()) for key in keys if key != 'unknown')
+
+    attr = AttrDefault(None, {'foo': 'present'}, batch_factory=load)
+
+    assert_equals(
+        attr.get_many(['foo', 'bar', 'baz', 'bar']),
+        {'foo': 'present', 'bar': 'BAR', 'baz': 'BAZ'}
+    )
+    assert_equals(batches, [['bar', 'baz']])
+    assert_equals(attr, {'foo': 'present', 'bar': 'BAR', 'baz': 'BAZ'})
+
+    # nothing missing, no call
+    assert_equals(attr.get_many(['foo', 'bar']),
+                  {'foo': 'present', 'bar': 'BAR'})
+    assert_equals(attr.prefetch(['foo']), 0)
+    assert_equals(len(batches), 1)
+
+    assert_equals(attr.prefetch(iter(['qux', 'foo', 'quux'])), 2)
+    assert_equals(batches[-1], ['qux', 'quux'])
+    assert_equals(attr.quux, 'QUUX')
+
+    # single misses use batch_factory when there is no default_factory
+    assert_equals(attr.single, 'SINGLE')
+    assert_equals(batches[-1], ['single'])
+    assert_raises(KeyError, lambda: attr['unknown'])
+    assert_raises(KeyError, attr.get_many, ['new', 'unknown'])
+    assert_equals(attr.new, 'NEW')  # the values that were built are kept
+
+    # default_factory builds the rest
+    attr = AttrDefault(lambda: 'default', batch_factory=load)
+    assert_equals(attr.get_many(['a', 'unknown']),
+                  {'a': 'A', 'unknown': 'default'})
+    assert_equals(attr.other, 'default')
+
+    # without a batch_factory, default_factory is called for each key
+    attr = AttrDefault(lambda key: key * 2, {'a': 1}, pass_key=True)
+    assert_equals(attr.get_many('ab'), {'a': 1, 'b': 'bb'})
+    assert_raises(KeyError, AttrDefault(None, {'a': 1}).get_many, 'ab')
+    assert_equals(AttrDefault(None, {'a': 1}).get_many('a'), {'a': 1})
+
+    # nested AttrDefaults share the batch_factory
+    attr = AttrDefault(None, {'sub': {}}, batch_factory=load)
+    assert_equals(attr.sub.get_many(['x']), {'x': 'X'})
+
+    # bounded instances count hits and misses
+    attr = AttrDefault(None, {'foo': 'bar'}, batch_factory=load, maxsize=2)
+    attr.get_many(['foo', 'a', 'b'])
+    assert_equals(attr, {'a': 'A', 'b': 'B'})
+    assert_equals(attr.cache_stats()['hits'], 1)
+    assert_equals(attr.cache_stats()['misses'], 2)
+
+    loaded = pickle.loads(pickle.dumps(
+        AttrDefault(None, {'foo': 'bar'}, batch_factory=Counter)
+    ))
+    assert_equals(loaded.get_many(['foo', 'baz']), {'foo': 'bar', 'baz': 1})
+
+
+def test_prefill():
+    """
+    prefill builds missing values on a pool of workers.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from threading import Lock
+
+    from attrdict.default import AttrDefault
+
+    calls = []
+    lock = Lock()
+
+    def load(key):
+        """
+        Record a call (from a worker thread).
+        """
+        with lock:
+            calls.append(key)
+
+        return square(key)
+
+    attr = AttrDefault(load, {0: 'present'}, pass_key=True)
+    reports = []
+
+    result = attr.prefill(
+        range(-2, 20), chunksize=3,
+        progress=lambda done, total: reports.append((done, total))
+    )
+
+    assert_equals(result['filled'], 19)
+    assert_equals(sorted(result['failures']), [-2, -1])
+    assert_true(isinstance(result['failures'][-1], ValueError))
+    assert_equals(sorted(calls), [-2, -1] + list(range(1, 20)))
+    assert_equals(attr[0], 'present')
+    assert_equals(attr[19], 361)
+    assert_false(-1 in attr)
+    assert_equals(len(reports), 7)
+    assert_equals(reports[-1], (21, 21))
+
+    # nothing missing
+    assert_equals(attr.prefill(range(5)), {'filled': 0, 'failures': {}})
+
+    # on a given executor, without pass_key
+    attr = AttrDefault(list)
+
+    with ThreadPoolExecutor(2) as executor:
+        assert_equals(attr.prefill('abc', executor=executor)['filled'], 3)
+        assert_equals(attr.prefill('d', executor=executor)['filled'], 1)
+
+    assert_equals(attr, {'a': [], 'b': [], 'c': [], 'd': []})
+
+    # in processes
+    attr = AttrDefault(square, pass_key=True, maxsize=10)
+
+    with ProcessPoolExecutor(2) as executor:
+        result = attr.prefill(range(-1, 10), executor=executor, chunksize=4)
+
+    assert_equals(result['filled'], 10)
+    assert_equals(list(result['failures']), [-1])
+    assert_equals(attr[9], 81)
+
+    assert_raises(KeyError, AttrDefault().prefill, ['a'])
+    assert_raises(ValueError, AttrDefault(list).prefill, ['a'], chunksize=0)
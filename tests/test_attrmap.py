@@ -1,7 +1,7 @@
 """
 Tests for the AttrMap class.
 """
-from nose.tools import assert_equals
+from nose.tools import assert_equals, assert_false, assert_true
 
 
 def test_repr():
@@ -19,3 +19,25 @@ def test_repr():
         repr(AttrMap({1: AttrMap({'foo': 'bar'})})),
         "AttrMap({1: AttrMap({'foo': 'bar'})})"
     )
+
+
+def test_equality():
+    """
+    AttrMap equality with other mappings.
+    """
+    from attrdict.default import AttrDefault
+    from attrdict.layered import LayeredAttr
+    from attrdict.mapping import AttrMap
+
+    mapping = AttrMap({'foo': 'bar'})
+
+    assert_true(mapping == mapping)
+    assert_true(mapping == AttrMap({'foo': 'bar'}))
+    assert_true(mapping == AttrMap(AttrMap({'foo': 'bar'})))
+    assert_true(mapping == AttrDefault(None, {'foo': 'bar'}))
+    assert_true(AttrDefault(None, {'foo': 'bar'}) == mapping)
+    assert_true(mapping == LayeredAttr([{'foo': 'bar'}]))
+    assert_false(mapping == AttrMap({'foo': 'baz'}))
+    assert_false(mapping == AttrMap({'foo': 'bar', 'lorem': 'ipsum'}))
+    assert_false(mapping == [('foo', 'bar')])
+    assert_true(mapping != AttrMap())
@@ -141,6 +141,89 @@ def test_attrdefault():
         yield test
 
 
+def test_attrdefaultdict():
+    """
+    Run AttrDefaultDict against the common tests.
+    """
+    from attrdict.default_dictionary import AttrDefaultDict
+
+    view_methods = (2, 7) <= version_info < (3,)
+
+    def constructor(items=None, sequence_type=tuple):
+        """
+        Build a new AttrDefaultDict.
+        """
+        return AttrDefaultDict(None, items, sequence_type)
+
+    for test in common(AttrDefaultDict, constructor=constructor,
+                       mutable=True, iter_methods=True,
+                       view_methods=view_methods, recursive=False):
+        yield test
+
+
+def test_singleflightattrdefault():
+    """
+    Run SingleFlightAttrDefault against the common tests.
+    """
+    from attrdict.singleflight import SingleFlightAttrDefault
+
+    def constructor(items=None, sequence_type=tuple):
+        """
+        Build a new SingleFlightAttrDefault.
+        """
+        if items is None:
+            items = {}
+
+        return SingleFlightAttrDefault(None, items, sequence_type)
+
+    for test in common(SingleFlightAttrDefault, constructor=constructor,
+                       mutable=True):
+        yield test
+
+
+def test_persistentattr():
+    """
+    Run PersistentAttr against the common tests.
+    """
+    from attrdict.persistent import PersistentAttr
+
+    for test in common(PersistentAttr, mutable=True):
+        # copies don't share nested mappings (see test_persistent)
+        if test[0] not in (copying, deepcopying):
+            yield test
+
+
+def test_threadsafeattrmap():
+    """
+    Run ThreadSafeAttrMap against the common tests.
+    """
+    from attrdict.threadsafe import ThreadSafeAttrMap
+
+    for test in common(ThreadSafeAttrMap, mutable=True):
+        # copies don't share nested mappings (see test_threadsafe)
+        if test[0] not in (copying, deepcopying):
+            yield test
+
+
+def test_layeredattr():
+    """
+    Run LayeredAttr against the common tests.
+    """
+    from attrdict.layered import LayeredAttr
+
+    def constructor(items=None, sequence_type=tuple):
+        """
+        Build a new LayeredAttr.
+        """
+        if items is None:
+            items = {}
+
+        return LayeredAttr([items], sequence_type)
+
+    for test in common(LayeredAttr, constructor=constructor):
+        yield test
+
+
 def common(cls, constructor=None, mutable=False, iter_methods=False,
            view_methods=False, recursive=True):
     """
@@ -0,0 +1,176 @@
+"""
+Tests for the Configuration class.
+"""
+from nose.tools import (assert_equals, assert_false, assert_not_equals,
+                        assert_raises, assert_true)
+
+
+def test_configuration():
+    """
+    Configurations are immutable and interned.
+    """
+    import pickle
+
+    from attrdict.configuration import Configuration
+
+    configuration = Configuration(list, dict, True)
+
+    assert_equals(configuration.sequence_type, list)
+    assert_equals(configuration.default_factory, dict)
+    assert_true(configuration.pass_key)
+    assert_equals(
+        repr(configuration),
+        "Configuration(sequence_type={0!r}, default_factory={1!r}, "
+        "pass_key=True, batch_factory=None)".format(list, dict)
+    )
+    assert_equals(configuration.batch_factory, None)
+
+    assert_true(Configuration(list, dict, True) is configuration)
+    assert_true(Configuration() is Configuration(tuple, None, False))
+    assert_false(Configuration() is configuration)
+    assert_not_equals(Configuration(), configuration)
+
+    def assign():
+        """
+        Change a setting.
+        """
+        configuration.sequence_type = tuple
+
+    def delete():
+        """
+        Remove a setting.
+        """
+        del configuration.sequence_type
+
+    assert_raises(AttributeError, assign)
+    assert_raises(AttributeError, delete)
+    assert_equals(configuration.sequence_type, list)
+
+    # replace
+    assert_true(
+        configuration.replace(sequence_type=tuple) is
+        Configuration(tuple, dict, True)
+    )
+    assert_true(configuration.replace() is configuration)
+    assert_raises(TypeError, lambda: configuration.replace(missing=True))
+
+    # unhashable settings
+    unhashable = Configuration([])
+    assert_false(Configuration([]) is unhashable)
+    assert_equals(Configuration([]), unhashable)
+
+    assert_true(pickle.loads(pickle.dumps(configuration)) is configuration)
+
+
+def test_shared_configuration():
+    """
+    Instances built from an Attr share its Configuration.
+    """
+    from attrdict.configuration import Configuration
+    from attrdict.default import AttrDefault
+    from attrdict.dictionary import AttrDict
+    from attrdict.mapping import AttrMap
+
+    for mapping in (AttrMap({'sub': {'alpha': {}}}, sequence_type=list),
+                    AttrDict({'sub': {'alpha': {}}}),
+                    AttrDefault(list, {'sub': {'alpha': {}}})):
+        configuration = mapping._configuration()
+
+        assert_true(isinstance(configuration, Configuration))
+        assert_true(mapping.sub._configuration() is configuration)
+        assert_true(mapping.sub.alpha._configuration() is configuration)
+        assert_true((mapping + {})._configuration() is configuration)
+        assert_true(
+            mapping.from_nested({}, configuration)._configuration() is
+            configuration
+        )
+
+        # settings can still be changed one at a time
+        mapping._setattr('_sequence_type', None)
+        assert_equals(mapping._sequence_type, None)
+        assert_equals(mapping._configuration().sequence_type, None)
+        assert_equals(mapping.sub._sequence_type, None)
+        assert_not_equals(configuration.sequence_type, None)
+
+
+def test_legacy_configuration():
+    """
+    _constructor still accepts the configurations it used to.
+    """
+    from attrdict.default import AttrDefault
+    from attrdict.dictionary import AttrDict
+    from attrdict.mapping import AttrMap
+
+    mapping = AttrMap._constructor({'foo': [1]}, list)
+    assert_equals(mapping.foo, [1])
+    assert_equals(mapping._sequence_type, list)
+
+    mapping = AttrDict._constructor({'foo': [1]}, list)
+    assert_equals(mapping.foo, [1])
+    assert_equals(mapping._sequence_type, list)
+
+    mapping = AttrDefault._constructor({}, (list, str.upper, True))
+    assert_equals(mapping.foo, 'FOO')
+    assert_equals(mapping._sequence_type, list)
+    assert_equals(mapping._default_factory, str.upper)
+    assert_true(mapping._pass_key)
+
+
+def test_overridden_constructor():
+    """
+    Subclasses that override _constructor are passed the configurations
+    they were passed before Configurations were shared.
+    """
+    from attrdict.default import AttrDefault
+    from attrdict.dictionary import AttrDict
+    from attrdict.mapping import AttrMap
+
+    class Map(AttrMap):
+        """
+        An AttrMap with its own _constructor.
+        """
+        @classmethod
+        def _constructor(cls, mapping, configuration):
+            return cls(mapping, sequence_type=configuration)
+
+    class Dict(AttrDict):
+        """
+        An AttrDict with its own _constructor.
+        """
+        @classmethod
+        def _constructor(cls, mapping, configuration):
+            attr = cls(mapping)
+            attr._setattr('_sequence_type', configuration)
+            return attr
+
+    class Default(AttrDefault):
+        """
+        An AttrDefault with its own _constructor.
+        """
+        @classmethod
+        def _constructor(cls, mapping, configuration):
+            sequence_type, default_factory, pass_key = configuration
+            return cls(default_factory, mapping, sequence_type, pass_key)
+
+    mapping = Map({'b': {'c': [1]}}, sequence_type=list)
+    assert_equals(mapping._configuration(), list)
+    assert_equals(mapping.b.c, [1])
+    assert_true(isinstance(mapping.b, Map))
+    assert_equals((mapping + {'d': 2}).d, 2)
+
+    mapping = Dict({'b': {'c': [1]}})
+    assert_equals(mapping._configuration(), tuple)
+    assert_equals(mapping.b.c, (1,))
+
+    mapping = Default(str.upper, {'b': {}}, list, True)
+    assert_equals(mapping._configuration(), (list, str.upper, True))
+    assert_equals(mapping.b.foo, 'FOO')
+
+    # subclasses that don't override _constructor still share
+    class Shared(AttrMap):
+        """
+        An AttrMap subclass.
+        """
+
+    mapping = Shared({'b': {}})
+    assert_true(mapping.b._configuration() is mapping._configuration())
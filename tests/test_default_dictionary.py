@@ -0,0 +1,92 @@
+"""
+Tests for the AttrDefaultDict class.
+"""
+from nose.tools import assert_equals, assert_false, assert_raises, assert_true
+from six import PY2
+
+
+def test_method_missing():
+    """
+    default values for AttrDefaultDict
+    """
+    from attrdict.default_dictionary import AttrDefaultDict
+
+    default_none = AttrDefaultDict()
+    default_list = AttrDefaultDict(list, sequence_type=None)
+    default_double = AttrDefaultDict(lambda value: value * 2, pass_key=True)
+
+    assert_raises(AttributeError, lambda: default_none.foo)
+    assert_raises(KeyError, lambda: default_none['foo'])
+    assert_equals(default_none, {})
+
+    assert_equals(default_list.foo, [])
+    assert_equals(default_list['bar'], [])
+    assert_equals(default_list, {'foo': [], 'bar': []})
+
+    assert_equals(default_double.foo, 'foofoo')
+    assert_equals(default_double['bar'], 'barbar')
+    assert_equals(default_double, {'foo': 'foofoo', 'bar': 'barbar'})
+
+    # lookups that don't add missing keys
+    default = AttrDefaultDict(list, {'foo': 'bar'})
+
+    assert_true('foo' in default)
+    assert_false('missing' in default)
+    assert_equals(default.get('missing'), None)
+    assert_raises(AttributeError, lambda: default._private)
+    assert_equals(default, {'foo': 'bar'})
+
+    # sequence_type applies to attributes
+    default = AttrDefaultDict(list, {'list': [{'foo': 'bar'}]})
+    assert_true(isinstance(default.list, tuple))
+    assert_true(isinstance(default.list[0], AttrDefaultDict))
+    assert_equals(default.list[0].missing, ())
+    assert_true(isinstance(default.missing, tuple))
+
+
+def test_repr():
+    """
+    repr(AttrDefaultDict)
+    """
+    from attrdict.default_dictionary import AttrDefaultDict
+
+    assert_equals(
+        repr(AttrDefaultDict(None)), "AttrDefaultDict(None, False, {})"
+    )
+
+    type_or_class = 'type' if PY2 else 'class'
+
+    assert_equals(
+        repr(AttrDefaultDict(list, {'foo': 'bar'}, pass_key=True)),
+        type_or_class.join(
+            ("AttrDefaultDict(<", " 'list'>, True, {'foo': 'bar'})")
+        )
+    )
+
+
+def test_pickling():
+    """
+    Pickled AttrDefaultDicts keep their settings.
+    """
+    import copy
+    import pickle
+
+    from attrdict.default_dictionary import AttrDefaultDict
+
+    attr = AttrDefaultDict(list, {'foo': {'bar': 'baz'}}, sequence_type=list,
+                           pass_key=False)
+    attr._setattr('_allow_invalid_attributes', True)
+
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        loaded = pickle.loads(pickle.dumps(attr, protocol))
+
+        assert_equals(loaded, attr)
+        assert_equals(loaded._config, attr._config)
+        assert_true(loaded._allow_invalid_attributes)
+        assert_equals(loaded['missing'], [])
+
+    copied = copy.deepcopy(attr)
+    assert_equals(copied.new, [])
+    assert_false('new' in attr)
+    assert_true(isinstance(attr.foo, AttrDefaultDict))
+    assert_equals(attr.foo.missing, [])
@@ -0,0 +1,180 @@
+"""
+Tests for the FrozenAttr class.
+"""
+from nose.tools import (assert_equals, assert_false, assert_not_equals,
+                        assert_raises, assert_true)
+
+
+def test_freezing():
+    """
+    Nested values are frozen when a FrozenAttr is built.
+    """
+    from attrdict.frozen import FrozenAttr
+    from attrdict.mapping import AttrMap
+
+    shared = {'a': 1}
+    attr = FrozenAttr({
+        'foo': 'bar',
+        'sub': {'list': [1, {'alpha': 'bravo'}], 'set': set([1, 2])},
+        'attr': AttrMap({'key': 'value'}),
+        'left': shared,
+        'right': shared,
+    })
+
+    assert_equals(attr.foo, 'bar')
+    assert_true(isinstance(attr['sub'], FrozenAttr))
+    assert_true(attr['sub'] is attr.sub)
+    assert_equals(attr.sub.list, (1, {'alpha': 'bravo'}))
+    assert_true(isinstance(attr.sub.list, tuple))
+    assert_equals(attr.sub.list[1].alpha, 'bravo')
+    assert_equals(attr.sub.set, frozenset([1, 2]))
+    assert_true(isinstance(attr.sub.set, frozenset))
+    assert_true(isinstance(attr.attr, FrozenAttr))
+    assert_true(attr.left is attr.right)
+    assert_equals(attr, FrozenAttr(attr))
+    assert_equals(FrozenAttr([('foo', 'bar')]), {'foo': 'bar'})
+
+    cycle = {}
+    cycle['cycle'] = cycle
+    assert_raises(ValueError, FrozenAttr, cycle)
+
+    sequence = []
+    sequence.append(sequence)
+    assert_raises(ValueError, FrozenAttr, {'sequence': sequence})
+
+    # immutable
+    def assign():
+        """
+        Assign an attribute.
+        """
+        attr.foo = 'baz'
+
+    def delete():
+        """
+        Delete an attribute.
+        """
+        del attr.foo
+
+    def set_item():
+        """
+        Assign an item.
+        """
+        attr['foo'] = 'baz'
+
+    assert_raises(TypeError, assign)
+    assert_raises(TypeError, delete)
+    assert_raises(TypeError, set_item)
+    assert_equals(attr.foo, 'bar')
+
+
+def test_hashing():
+    """
+    FrozenAttrs can be hashed, and compared by hash.
+    """
+    from attrdict.frozen import FrozenAttr
+
+    attr = FrozenAttr({'foo': 'bar', 'sub': {'list': [1, 2]}})
+    same = FrozenAttr({'sub': {'list': (1, 2)}, 'foo': 'bar'})
+    other = FrozenAttr({'foo': 'bar', 'sub': {'list': [1, 3]}})
+
+    assert_equals(hash(attr), hash(same))
+    assert_true(attr._hash is not None)
+    assert_equals({attr: 'value'}[same], 'value')
+    assert_equals(len(set([attr, same, other])), 2)
+
+    assert_equals(attr, same)
+    assert_not_equals(attr, other)
+    assert_not_equals(attr, FrozenAttr({'foo': 'bar'}))
+    assert_equals(attr, {'foo': 'bar', 'sub': {'list': (1, 2)}})
+    assert_not_equals(attr, {'foo': 'bar'})
+    assert_false(attr == [('foo', 'bar')])
+
+    class Unhashable(object):
+        """
+        A value that can be compared, but not hashed.
+        """
+        __hash__ = None
+
+        def __init__(self, value):
+            self.value = value
+
+        def __eq__(self, other):
+            """
+            Compare the values.
+            """
+            return self.value == other.value
+
+        def __ne__(self, other):
+            """
+            Compare the values.
+            """
+            return self.value != other.value
+
+    # unhashable values can be stored, but not hashed
+    unhashable = FrozenAttr({'object': Unhashable(1)})
+    assert_raises(TypeError, hash, unhashable)
+    assert_equals(unhashable, FrozenAttr({'object': Unhashable(1)}))
+    assert_not_equals(unhashable, FrozenAttr({'object': Unhashable(2)}))
+
+    assert_equals(FrozenAttr({'bytes': bytearray(b'abc')}).bytes, b'abc')
+
+
+def test_frozen_merging():
+    """
+    Adding to a FrozenAttr builds a new FrozenAttr.
+    """
+    import pickle
+
+    from attrdict.frozen import FrozenAttr
+    from attrdict.mapping import AttrMap
+
+    attr = FrozenAttr({'foo': 'bar', 'sub': {'alpha': 'bravo'}})
+
+    merged = attr + {'sub': {'charlie': ['delta']}}
+    assert_true(isinstance(merged, FrozenAttr))
+    assert_equals(
+        merged,
+        {'foo': 'bar', 'sub': {'alpha': 'bravo', 'charlie': ('delta',)}}
+    )
+    assert_equals(attr, {'foo': 'bar', 'sub': {'alpha': 'bravo'}})
+    hash(merged)
+
+    merged = {'lorem': 'ipsum'} + attr
+    assert_true(isinstance(merged, FrozenAttr))
+    assert_equals(merged.lorem, 'ipsum')
+
+    merged = AttrMap({'sub': {'echo': 'foxtrot'}}) + attr
+    assert_true(isinstance(merged, AttrMap))
+    assert_equals(merged.sub.echo, 'foxtrot')
+
+    merged = FrozenAttr.merge_all({'a': 1}, attr, {'b': [2]})
+    assert_true(isinstance(merged, FrozenAttr))
+    assert_equals(merged.b, (2,))
+
+    loaded = pickle.loads(pickle.dumps(attr))
+    assert_equals(loaded, attr)
+    assert_equals(hash(loaded), hash(attr))
+    assert_true(isinstance(loaded.sub, FrozenAttr))
+
+    assert_equals(
+        repr(FrozenAttr({'foo': {'bar': 'baz'}})),
+        "FrozenAttr({'foo': FrozenAttr({'bar': 'baz'})})"
+    )
+
+
+def test_freezing_views():
+    """
+    Mappings that build their values on access are frozen correctly.
+    """
+    from attrdict.frozen import FrozenAttr
+    from attrdict.layered import LayeredAttr
+
+    keys = 'abcdefgh'
+    attr = FrozenAttr(LayeredAttr([
+        dict((key, {'v': key}) for key in keys),
+        dict((key, {'w': key}) for key in keys),
+    ]))
+
+    for key in keys:
+        assert_true(isinstance(attr[key], FrozenAttr))
+        assert_equals(attr[key], {'v': key, 'w': key})
@@ -0,0 +1,80 @@
+"""
+Tests for the LayeredAttr class.
+"""
+from nose.tools import assert_equals, assert_false, assert_raises, assert_true
+
+
+def test_layers():
+    """
+    Values are resolved from the layers as they are accessed.
+    """
+    from attrdict.layered import LayeredAttr
+    from attrdict.merge import merge
+
+    defaults = {
+        'name': 'default',
+        'db': {'host': 'localhost', 'port': 5432, 'options': {'a': 1}},
+        'replaced': {'a': 1},
+        'list': [{'a': 'b'}],
+    }
+    site = {'db': {'host': 'db.example.com'}, 'replaced': 'scalar'}
+    request = {'db': {'options': {'b': 2}}, 'replaced': {'c': 3}}
+
+    layered = LayeredAttr([defaults, site, request])
+
+    assert_equals(layered.name, 'default')
+    assert_equals(layered.db.host, 'db.example.com')
+    assert_equals(layered.db.port, 5432)
+    assert_equals(layered.db.options, {'a': 1, 'b': 2})
+    assert_equals(layered.list[0].a, 'b')
+    assert_raises(KeyError, lambda: layered['fake'])
+    assert_raises(AttributeError, lambda: layered.fake)
+
+    # non-mappings hide mappings in lower layers
+    assert_equals(layered.replaced, {'c': 3})
+
+    # a mapping that isn't overlaid is returned as-is
+    assert_true(layered['list'] is defaults['list'])
+    assert_true(isinstance(layered['db'], LayeredAttr))
+
+    assert_true('name' in layered)
+    assert_false('fake' in layered)
+    assert_equals(len(layered), 4)
+    assert_equals(sorted(layered), ['db', 'list', 'name', 'replaced'])
+
+    expected = merge(merge(defaults, site), request)
+    assert_equals(layered, expected)
+    assert_equals(layered.materialize(), expected)
+    assert_true(type(layered.materialize()['db']) is dict)
+
+    # layers are live
+    site['name'] = 'site'
+    assert_equals(layered.name, 'site')
+
+
+def test_addition():
+    """
+    Adding to a LayeredAttr adds a layer.
+    """
+    from attrdict.layered import LayeredAttr
+    from attrdict.mapping import AttrMap
+
+    base = {'a': {'b': 1, 'c': 2}}
+    override = {'a': {'b': 3}}
+
+    layered = LayeredAttr([base]) + override
+    assert_true(isinstance(layered, LayeredAttr))
+    assert_equals(layered._layers, (base, override))
+    assert_equals(layered.a, {'b': 3, 'c': 2})
+
+    layered = override + LayeredAttr([base])
+    assert_equals(layered._layers, (override, base))
+    assert_equals(layered.a, {'b': 1, 'c': 2})
+
+    layered = LayeredAttr([base]) + LayeredAttr([override, {'d': 4}])
+    assert_equals(len(layered._layers), 3)
+
+    mapping = AttrMap(base)
+    layered = LayeredAttr([mapping, override])
+    assert_equals(layered.a.b, 3)
+    assert_equals(repr(LayeredAttr([{'a': 1}])), "LayeredAttr([{'a': 1}])")
@@ -0,0 +1,277 @@
+"""
+Tests for Lazy values.
+"""
+from nose.tools import assert_equals, assert_raises, assert_true
+
+
+def counter(value=None):
+    """
+    A function that counts its calls, and returns value.
+    """
+    calls = []
+
+    def function():
+        """
+        Count the call.
+        """
+        calls.append(None)
+        return value
+
+    return function, calls
+
+
+def test_resolve():
+    """
+    A Lazy is computed once, with the arguments it was given.
+    """
+    from attrdict.lazy import Lazy
+
+    function, calls = counter('value')
+    lazy = Lazy(function)
+
+    assert_true(repr(lazy).startswith('Lazy(<function'))
+    assert_equals(lazy.resolve(), 'value')
+    assert_equals(lazy.resolve(), 'value')
+    assert_equals(len(calls), 1)
+    assert_equals(repr(lazy), "Lazy(resolved='value')")
+
+    # references to the function and its arguments are dropped
+    assert_equals((lazy._function, lazy._args, lazy._kwargs),
+                  (None, None, None))
+
+    assert_equals(Lazy(int, '10', base=2).resolve(), 2)
+
+
+def test_failures():
+    """
+    Failures aren't kept, so the next read tries again.
+    """
+    from attrdict import AttrMap, Lazy
+
+    attempts = []
+
+    def flaky():
+        """
+        Fail the first time.
+        """
+        attempts.append(None)
+
+        if len(attempts) == 1:
+            raise ValueError('failed')
+
+        return 'value'
+
+    attr = AttrMap({'flaky': Lazy(flaky)})
+
+    assert_raises(ValueError, lambda: attr['flaky'])
+    assert_true(attr._mapping['flaky'].__class__ is Lazy)
+    assert_equals(attr.flaky, 'value')
+    assert_equals(len(attempts), 2)
+
+
+def test_threads():
+    """
+    Threads reading a Lazy at once share one call.
+    """
+    from threading import Event, Thread
+
+    from attrdict import AttrMap, Lazy
+
+    started, release = Event(), Event()
+    calls = []
+
+    def slow():
+        """
+        Wait to be released.
+        """
+        calls.append(None)
+        started.set()
+        release.wait()
+
+        return 'value'
+
+    attr = AttrMap({'slow': Lazy(slow)})
+    results = []
+
+    threads = [
+        Thread(target=lambda: results.append(attr.slow)) for _ in range(8)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    started.wait()
+    release.set()
+
+    for thread in threads:
+        thread.join()
+
+    assert_equals(results, ['value'] * 8)
+    assert_equals(len(calls), 1)
+
+
+def test_replaced():
+    """
+    AttrMap and AttrDefault replace a Lazy with its value.
+    """
+    from attrdict import (
+        AttrDefault, AttrMap, Lazy, SingleFlightAttrDefault,
+        ThreadSafeAttrMap,
+    )
+
+    for cls in (AttrMap, AttrDefault, SingleFlightAttrDefault):
+        function, calls = counter({'host': 'localhost'})
+        attr = cls()
+        attr['db'] = Lazy(function)
+
+        assert_true(attr._mapping['db'].__class__ is Lazy)
+        assert_equals(attr['db'], {'host': 'localhost'})
+        assert_equals(attr._mapping['db'], {'host': 'localhost'})
+        assert_equals(attr.db.host, 'localhost')
+        assert_true(isinstance(attr.db, cls))
+        assert_equals(len(calls), 1)
+
+    # bounded instances too
+    function, calls = counter('value')
+    attr = AttrDefault(list, {'lazy': Lazy(function)}, maxsize=2)
+
+    assert_equals(attr.lazy, 'value')
+    assert_equals(attr._mapping['lazy'], 'value')
+    assert_equals(attr.get_many(['lazy']), {'lazy': 'value'})
+
+    attr = AttrDefault(list, {'lazy': Lazy(function)})
+    assert_equals(attr.get_many(['lazy', 'missing']),
+                  {'lazy': 'value', 'missing': []})
+    assert_equals(attr._mapping['lazy'], 'value')
+
+    # a value stored while resolving is kept
+    attr = AttrMap()
+
+    def store():
+        """
+        Replace the Lazy while it is being resolved.
+        """
+        attr['key'] = 'stored'
+        return 'resolved'
+
+    attr['key'] = Lazy(store)
+    assert_equals(attr.key, 'resolved')
+    assert_equals(attr.key, 'stored')
+
+    # ThreadSafeAttrMap never changes its dict in place
+    function, calls = counter('value')
+    attr = ThreadSafeAttrMap({'lazy': Lazy(function)})
+    mapping = attr._mapping
+
+    assert_equals(attr.lazy, 'value')
+    assert_equals(attr['lazy'], 'value')
+    assert_true(attr._mapping is mapping)
+    assert_equals(len(calls), 1)
+
+
+def test_reads():
+    """
+    get, values, items and == resolve a Lazy, like item access.
+    """
+    from attrdict import (
+        AttrDefault, AttrMap, Lazy, SingleFlightAttrDefault,
+        ThreadSafeAttrMap,
+    )
+
+    builders = (
+        AttrMap, ThreadSafeAttrMap,
+        lambda items: AttrDefault(list, items),
+        lambda items: AttrDefault(list, items, maxsize=10),
+        lambda items: SingleFlightAttrDefault(list, items),
+    )
+
+    for build in builders:
+        function, calls = counter(1)
+        attr = build({'x': Lazy(function), 'y': 2})
+
+        assert_equals(attr.get('x'), 1)
+        assert_equals(sorted(attr.values()), [1, 2])
+        assert_equals(sorted(attr.items()), [('x', 1), ('y', 2)])
+        assert_true(('x', 1) in attr.items())
+        assert_equals(attr, {'x': 1, 'y': 2})
+        assert_equals(len(calls), 1)
+
+        # a Lazy passed as the default is returned as-is
+        default = Lazy(function)
+        assert_true(attr.get('missing', default) is default)
+
+        assert_equals(build({'x': Lazy(lambda: 1)}), {'x': 1})
+        assert_equals(build({'x': 1}), build({'x': Lazy(lambda: 1)}))
+        assert_true(build({'x': Lazy(lambda: 1)}) != {'x': 2})
+        assert_true(('missing', []) not in build({}).items())
+
+
+def test_attributes():
+    """
+    Other Attrs resolve a Lazy when it is accessed as an attribute.
+    """
+    from attrdict import AttrDefaultDict, AttrDict, Lazy
+
+    for attr in (AttrDict(), AttrDefaultDict(list)):
+        function, calls = counter({'foo': 'bar'})
+        attr['lazy'] = Lazy(function)
+        attr['list'] = [Lazy(lambda: {'foo': 'baz'})]
+
+        assert_true(attr['lazy'].__class__ is Lazy)
+        assert_equals(attr.lazy.foo, 'bar')
+        assert_equals(attr('lazy').foo, 'bar')
+        assert_equals(attr.list[0].foo, 'baz')
+        assert_equals(len(calls), 1)
+
+
+def test_merge():
+    """
+    Merging carries a Lazy through without resolving it.
+    """
+    from attrdict import AttrDict, AttrMap, Lazy
+    from attrdict.merge import merge, merge_all
+
+    function, calls = counter({'host': 'localhost'})
+    lazy = Lazy(function)
+    left = AttrMap({'db': lazy, 'nested': AttrMap({'lazy': lazy})})
+    right = {'other': 'value', 'nested': {'key': 'value'}}
+
+    for merged in (merge(left, right), merge(right, left),
+                   merge(left, right, share=True), merge_all(right, left),
+                   merge_all(left, right)):
+        assert_true(merged['db'] is lazy)
+        assert_true(merged['nested']['lazy'] is lazy)
+
+    for merged in (left + right, right + left, AttrDict(right) + left):
+        assert_true(merged._mapping['db'] is lazy
+                    if isinstance(merged, AttrMap) else merged['db'] is lazy)
+
+    attr = AttrMap({'db': 'old'})
+    attr += left
+    assert_true(attr._mapping['db'] is lazy)
+
+    assert_equals(len(calls), 0)
+    assert_equals(attr.db.host, 'localhost')
+    assert_equals(len(calls), 1)
+
+
+def test_pickling():
+    """
+    A Lazy is pickled with its function, or its value once resolved.
+    """
+    import pickle
+
+    from attrdict import AttrMap, Lazy
+
+    lazy = Lazy(int, '5')
+    loaded = pickle.loads(pickle.dumps(lazy))
+
+    assert_true(loaded.__class__ is Lazy)
+    assert_equals(loaded.resolve(), 5)
+
+    attr = AttrMap({'lazy': lazy})
+    assert_equals(attr.lazy, 5)
+
+    loaded = pickle.loads(pickle.dumps(lazy))
+    assert_equals(loaded._function, None)
+    assert_equals(loaded.resolve(), 5)
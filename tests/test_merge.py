@@ -1,7 +1,7 @@
 """
 Test the merge function
 """
-from nose.tools import assert_equals
+from nose.tools import assert_equals, assert_true
 
 
 def test_merge():
@@ -33,3 +33,185 @@ def test_merge():
             'sub': {'alpha': 'bravo', 1: 2, 3: 4}
         }
     )
+
+
+def test_merge_shared():
+    """
+    merge function with structural sharing.
+    """
+    from attrdict.merge import merge
+
+    untouched = {'deep': {'value': 1}}
+    empty = {}
+    left = {
+        'untouched': untouched,
+        'mismatch': False,
+        'sub': {'alpha': 'beta', 'inner': {'a': 1}, 'kept': {'b': 2}},
+        'empty': {'c': 3},
+    }
+    right = {
+        'lorem': 'ipsum',
+        'mismatch': True,
+        'sub': {'alpha': 'bravo', 'inner': {'a': 2}},
+        'empty': empty,
+        'new': {'d': 4},
+    }
+
+    merged = merge(left, right, share=True)
+
+    assert_equals(merged, merge(left, right))
+    assert_equals(merge({}, {}, share=True), {})
+    assert_equals(merge(left, {}, share=True), left)
+    assert_equals(merge({}, right, share=True), right)
+
+    # the result is always a new mapping
+    assert_true(merged is not left)
+    assert_true(merge(left, {}, share=True) is not left)
+
+    # subtrees only one side contributes to are shared
+    assert_true(merged['untouched'] is untouched)
+    assert_true(merged['new'] is right['new'])
+    assert_true(merged['empty'] is left['empty'])
+    assert_true(merged['sub']['kept'] is left['sub']['kept'])
+
+    # the path to a conflict is copied
+    assert_true(merged['sub'] is not left['sub'])
+    assert_true(merged['sub']['inner'] is not left['sub']['inner'])
+    assert_equals(left['sub'], {'alpha': 'beta', 'inner': {'a': 1},
+                                'kept': {'b': 2}})
+
+    # the same, whichever side is larger
+    for size in (0, 100):
+        padding = dict(('pad{0}'.format(index), index)
+                       for index in range(size))
+        small = {'sub': {'inner': {'a': 1}}, 'empty': {'e': 1}, 'mine': {}}
+        large = dict(padding, sub={'inner': {'b': 2}}, empty={}, theirs={})
+
+        for first, second in ((small, large), (large, small)):
+            merged = merge(first, second, share=True)
+            assert_equals(merged, merge(first, second))
+            assert_true(merged['empty'] is small['empty'])
+            assert_true(merged['sub'] is not first['sub'])
+            assert_true(merged['mine'] is small['mine'])
+            assert_true(merged['theirs'] is large['theirs'])
+
+
+def test_add_shared():
+    """
+    Attr addition with structural sharing.
+    """
+    from attrdict.mapping import AttrMap
+
+    class SharingAttrMap(AttrMap):
+        """
+        An AttrMap that shares subtrees when added.
+        """
+        _share_subtrees = True
+
+    untouched = {'value': 1}
+    left = SharingAttrMap({'untouched': untouched, 'sub': {'a': 1}})
+
+    added = left + {'sub': {'b': 2}}
+    assert_true(isinstance(added, SharingAttrMap))
+    assert_equals(added, {'untouched': {'value': 1}, 'sub': {'a': 1, 'b': 2}})
+    assert_true(added['untouched'] is untouched)
+
+    added = {'sub': {'b': 2}} + left
+    assert_equals(added, {'untouched': {'value': 1}, 'sub': {'a': 1, 'b': 2}})
+    assert_true(added['untouched'] is untouched)
+
+
+def test_merge_all():
+    """
+    merge_all function.
+    """
+    from attrdict.merge import merge, merge_all
+
+    layers = [
+        {'a': 1, 'sub': {'x': 1, 'deep': {'p': 1}}, 'gone': {'q': 1}},
+        {'b': 2, 'sub': {'y': 2, 'deep': {'r': 2}}, 'gone': 'scalar'},
+        {'a': 3, 'sub': {'x': 3}, 'gone': {'s': 3}},
+        {'c': {'z': 4}},
+    ]
+
+    assert_equals(merge_all(), {})
+    assert_equals(merge_all(layers[0]), layers[0])
+
+    expected = {
+        'a': 3,
+        'b': 2,
+        'c': {'z': 4},
+        'sub': {'x': 3, 'y': 2, 'deep': {'p': 1, 'r': 2}},
+        'gone': {'s': 3},
+    }
+
+    assert_equals(merge_all(*layers), expected)
+
+    folded = {}
+    for layer in layers:
+        folded = merge(folded, layer)
+
+    assert_equals(merge_all(*layers), folded)
+    assert_true(merge_all(*layers)['c'] is layers[3]['c'])
+
+
+def test_attr_merge_all():
+    """
+    Attr.merge_all classmethod.
+    """
+    from attrdict.default import AttrDefault
+    from attrdict.mapping import AttrMap
+
+    merged = AttrMap.merge_all(
+        {'a': {'b': 1}}, AttrMap({'a': {'c': 2}}, sequence_type=list),
+        {'d': [{'e': 3}]}
+    )
+
+    assert_true(isinstance(merged, AttrMap))
+    assert_equals(merged, {'a': {'b': 1, 'c': 2}, 'd': [{'e': 3}]})
+    assert_true(isinstance(merged.d, list))
+
+    merged = AttrDefault.merge_all({'a': 1}, AttrDefault(int, {'b': 2}))
+    assert_equals(merged, {'a': 1, 'b': 2})
+    assert_equals(merged.missing, 0)
+
+    # without an instance, the default configuration is used
+    merged = AttrMap.merge_all({'a': {'b': 1}}, {'a': {'c': [2]}}, {'d': 4})
+    assert_true(isinstance(merged, AttrMap))
+    assert_equals(merged, {'a': {'b': 1, 'c': [2]}, 'd': 4})
+    assert_equals(merged.a.c, (2,))
+    assert_equals(AttrMap.merge_all(), {})
+
+
+def test_merge_deep():
+    """
+    merging mappings nested deeper than the recursion limit.
+    """
+    from sys import getrecursionlimit
+
+    from attrdict.merge import merge, merge_all
+
+    depth = getrecursionlimit() * 2
+
+    def nested(leaf):
+        """
+        Build a mapping nested depth levels deep.
+        """
+        mapping = {'leaf': leaf}
+
+        for _ in range(depth):
+            mapping = {'child': mapping}
+
+        return mapping
+
+    for merged, leaf in ((merge(nested(1), nested(2)), 2),
+                         (merge(nested(1), nested(2), share=True), 2),
+                         (merge_all(nested(1), nested(2), nested(3)), 3)):
+        levels = 0
+
+        while 'child' in merged:
+            merged = merged['child']
+            levels += 1
+
+        assert_equals(levels, depth)
+        assert_equals(merged, {'leaf': leaf})
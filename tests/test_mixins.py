@@ -1,7 +1,7 @@
 """
 Tests for the AttrDefault class.
 """
-from nose.tools import assert_equals, assert_raises
+from nose.tools import assert_equals, assert_false, assert_raises, assert_true
 
 
 def test_invalid_attributes():
@@ -67,3 +67,321 @@ def test_constructor():
         pass
 
     assert_raises(NotImplementedError, lambda: AttrImpl._constructor({}, ()))
+
+
+def test_cache_children():
+    """
+    Nested wrappers are reused when _cache_children is set.
+    """
+    from attrdict.dictionary import AttrDict
+    from attrdict.mapping import AttrMap
+
+    class CachedAttrMap(AttrMap):
+        """
+        An AttrMap that caches nested wrappers.
+        """
+        _cache_children = True
+
+    class CachedAttrDict(AttrDict):
+        """
+        An AttrDict that caches nested wrappers.
+        """
+        _cache_children = True
+
+    # disabled by default
+    mapping = AttrMap({'sub': {'alpha': 'bravo'}})
+    assert_true(mapping.sub is not mapping.sub)
+
+    # copies are never cached, so changes made in place are seen
+    mapping = CachedAttrDict({'sub': {'alpha': 'bravo'}, 'list': [1, 2]})
+    assert_true(mapping.sub is not mapping.sub)
+    mapping['sub']['alpha'] = 'charlie'
+    assert_equals(mapping.sub.alpha, 'charlie')
+
+    for cls in (CachedAttrMap, CachedAttrDict):
+        mapping = cls({'list': [1, 2]})
+        assert_equals(mapping.list, (1, 2))
+        mapping['list'].append(3)
+        assert_equals(mapping.list, (1, 2, 3))
+
+    mapping = CachedAttrMap({'sub': {'alpha': 'bravo'}, 'list': [{'a': 'b'}]})
+
+    sub = mapping.sub
+    assert_true(isinstance(sub, CachedAttrMap))
+    assert_true(mapping.sub is sub)
+    assert_true(mapping('sub') is sub)
+    assert_true(mapping.sub.alpha is sub.alpha)
+
+    mapping['sub']['added'] = 'in place'
+    assert_equals(mapping.sub.added, 'in place')
+
+    # assignment drops the cached wrapper
+    mapping.sub = {'alpha': 'charlie'}
+    assert_true(mapping.sub is not sub)
+    assert_equals(mapping.sub.alpha, 'charlie')
+
+    sub = mapping.sub
+    mapping['sub'] = {'alpha': 'delta'}
+    assert_equals(mapping.sub.alpha, 'delta')
+
+    del mapping.sub
+    assert_false('sub' in mapping._children)
+    assert_raises(AttributeError, lambda: mapping.sub)
+
+    # values replaced without going through __setitem__
+    mapping.update({'sub': {'alpha': 'echo'}})
+    assert_equals(mapping.sub.alpha, 'echo')
+
+
+def test_valid_name():
+    """
+    _valid_name remembers keys, and forgets them when classes change.
+    """
+    from attrdict.mapping import AttrMap
+
+    class Base(AttrMap):
+        """
+        An AttrMap to monkeypatch.
+        """
+        pass
+
+    class Child(Base):
+        """
+        A subclass of Base.
+        """
+        pass
+
+    assert_true(Child._valid_name('foo'))
+    assert_false(Child._valid_name('get'))
+    assert_false(Child._valid_name('_foo'))
+    assert_false(Child._valid_name('1foo'))
+    assert_false(Child._valid_name(1))
+    assert_false(Child._valid_name([]))
+    assert_true('foo' in Child._valid_names)
+    assert_false('foo' in Base._valid_names)
+
+    mapping = Child({'foo': 'bar'})
+    assert_equals(mapping.foo, 'bar')
+
+    # patching a base class invalidates subclasses
+    Base.foo = 'patched'
+    assert_false(Child._valid_name('foo'))
+    assert_equals(mapping.foo, 'patched')
+
+    del Base.foo
+    assert_true(Child._valid_name('foo'))
+    assert_equals(mapping.foo, 'bar')
+
+    # subclasses check their own attributes
+    class Grandchild(Child):
+        """
+        A subclass that shadows a key.
+        """
+        def foo(self):
+            """
+            A method named foo.
+            """
+
+    assert_false(Grandchild._valid_name('foo'))
+    assert_true(Child._valid_name('foo'))
+
+
+def test_missing_attribute():
+    """
+    Missing attributes raise an AttributeError with a readable message.
+    """
+    import pickle
+
+    from attrdict.dictionary import AttrDict
+    from attrdict.mapping import AttrMap
+
+    for mapping in (AttrMap({'foo': 'bar'}), AttrDict({'foo': 'bar'})):
+        name = mapping.__class__.__name__
+
+        assert_true(hasattr(mapping, 'foo'))
+        assert_false(hasattr(mapping, 'missing'))
+        assert_false(hasattr(mapping, '_missing'))
+        assert_equals(getattr(mapping, 'missing', 'default'), 'default')
+        assert_equals(mapping('foo'), 'bar')
+
+        for access in (lambda: mapping.missing, lambda: mapping('missing')):
+            try:
+                access()
+            except AttributeError as error:
+                message = "'{0}' instance has no attribute 'missing'".format(
+                    name
+                )
+
+                assert_equals(str(error), message)
+                assert_equals(str(pickle.loads(pickle.dumps(error))), message)
+            else:
+                raise AssertionError("AttributeError not raised")
+
+
+def test_deep_update():
+    """
+    Merging into a MutableAttr in place.
+    """
+    from attrdict.dictionary import AttrDict
+    from attrdict.layered import LayeredAttr
+    from attrdict.mapping import AttrMap
+
+    for cls in (AttrMap, AttrDict):
+        sub = {'alpha': 'beta', 'inner': {'a': 1}}
+        immutable = LayeredAttr([{'x': 1}])
+        mapping = cls({'foo': 'bar', 'sub': sub, 'immutable': immutable})
+        alias = mapping
+
+        mapping += {
+            'lorem': 'ipsum',
+            'sub': {'inner': {'b': 2}, 'gamma': 'delta'},
+            'foo': {'now': 'a mapping'},
+            'immutable': {'y': 2},
+        }
+
+        assert_true(mapping is alias)
+        assert_equals(
+            mapping,
+            {
+                'foo': {'now': 'a mapping'},
+                'lorem': 'ipsum',
+                'sub': {'alpha': 'beta', 'gamma': 'delta',
+                        'inner': {'a': 1, 'b': 2}},
+                'immutable': {'x': 1, 'y': 2},
+            }
+        )
+        assert_true(isinstance(mapping['immutable'], dict))
+
+        # nested mappings are updated, not replaced
+        assert_true(mapping['sub'] is sub)
+        assert_equals(sub['inner'], {'a': 1, 'b': 2})
+
+        mapping.deep_update({'sub': 'replaced'})
+        assert_equals(mapping['sub'], 'replaced')
+
+        # mappings from other are copied, not changed by later updates
+        override = {'new': {'b': 1}}
+        mapping += override
+        mapping += {'new': {'c': 2}}
+        mapping.deep_update({'sub': override})
+        mapping += {'sub': {'new': {'d': 3}}}
+        assert_equals(mapping['new'], {'b': 1, 'c': 2})
+        assert_equals(override, {'new': {'b': 1}})
+
+    def add():
+        """
+        Add a non-mapping in place.
+        """
+        mapping = AttrMap()
+        mapping += 1
+
+    assert_raises(TypeError, add)
+
+
+def test_from_nested():
+    """
+    Convert a nested tree all at once.
+    """
+    from attrdict.default import AttrDefault
+    from attrdict.dictionary import AttrDict
+    from attrdict.layered import LayeredAttr
+    from attrdict.mapping import AttrMap
+
+    shared = {'shared': True}
+    raw = {
+        'sub': {'alpha': 'bravo', 'shared': shared},
+        'list': [{'a': 'b'}, shared, 'c', [shared]],
+        'again': shared,
+        'string': 'value',
+    }
+
+    for cls in (AttrMap, AttrDict):
+        converted = cls.from_nested(raw)
+
+        assert_true(isinstance(converted, cls))
+        assert_equals(converted['sub'], raw['sub'])
+        assert_equals(converted['list'], ({'a': 'b'}, shared, 'c', (shared,)))
+        assert_equals(converted['string'], 'value')
+        assert_true(isinstance(converted['sub'], cls))
+        assert_true(isinstance(converted['list'], tuple))
+        assert_true(isinstance(converted['list'][0], cls))
+        assert_true(isinstance(converted['list'][3], tuple))
+
+        # shared references remain shared
+        assert_true(converted['again'] is converted['sub']['shared'])
+        assert_true(converted['again'] is converted['list'][1])
+        assert_true(converted['again'] is converted['list'][3][0])
+
+        # attribute access doesn't rewrap converted values
+        assert_true(converted.sub is converted['sub'])
+        assert_true(converted.list[0] is converted['list'][0])
+
+        # the original is untouched
+        assert_true(type(raw['sub']) is dict)
+        assert_true(type(raw['list']) is list)
+
+    # configuration
+    converted = AttrMap.from_nested(raw, list)
+    assert_true(isinstance(converted['list'], list))
+
+    converted = AttrMap.from_nested(raw, None)
+    assert_true(converted['list'][0] is raw['list'][0])
+    assert_true(isinstance(converted['sub'], AttrMap))
+
+    converted = AttrDefault.from_nested(raw, (tuple, int, False))
+    assert_equals(converted.sub.missing, 0)
+
+    # cycles
+    cyclic = {'name': 'root'}
+    cyclic['self'] = cyclic
+    cyclic['list'] = [cyclic]
+
+    converted = AttrMap.from_nested(cyclic)
+    assert_true(converted.self is converted)
+    assert_true(converted.list[0] is converted)
+
+    looped = []
+    looped.append(looped)
+    assert_raises(ValueError, lambda: AttrMap.from_nested({'a': looped}))
+
+    assert_raises(TypeError, lambda: AttrMap.from_nested([]))
+
+    # Mappings that build their values on access
+    keys = 'abcdefgh'
+    layered = LayeredAttr([
+        dict((key, {'v': key, 'list': [{'n': key}]}) for key in keys),
+        dict((key, {'w': key}) for key in keys),
+    ])
+    converted = AttrDict.from_nested(layered)
+
+    for key in keys:
+        assert_true(isinstance(converted[key], AttrDict))
+        assert_equals(converted[key], {'v': key, 'w': key,
+                                       'list': ({'n': key},)})
+        assert_true(isinstance(converted[key]['list'][0], AttrDict))
+
+
+def test_slots():
+    """
+    Attr classes keep their own state in slots, not in a __dict__.
+    """
+    import pickle
+    import weakref
+
+    from attrdict.default import AttrDefault
+    from attrdict.dictionary import AttrDict
+    from attrdict.mapping import AttrMap
+
+    for mapping in (AttrMap({'foo': 'bar'}), AttrDict({'foo': 'bar'}),
+                    AttrDefault(list, {'foo': 'bar'})):
+        assert_equals(vars(mapping), {})
+        assert_true(weakref.ref(mapping)() is mapping)
+
+        loaded = pickle.loads(pickle.dumps(mapping))
+        assert_equals(loaded, mapping)
+        assert_equals(loaded._configuration(), mapping._configuration())
+        assert_equals(vars(loaded), {})
+
+        # anything else still has somewhere to go
+        mapping._setattr('_extra', 'value')
+        assert_equals(vars(mapping), {'_extra': 'value'})
@@ -0,0 +1,149 @@
+"""
+Tests for path access.
+"""
+from nose.tools import assert_equals, assert_false, assert_raises, assert_true
+
+
+def test_parse_path():
+    """
+    Paths are split into tuples of keys, and remembered.
+    """
+    from attrdict.path import _PATHS, parse_path
+
+    assert_equals(parse_path('a'), ('a',))
+    assert_equals(parse_path('a.b.c'), ('a', 'b', 'c'))
+    assert_equals(parse_path('a[0][-1].b'), ('a', 0, -1, 'b'))
+    assert_equals(parse_path('[2].a'), (2, 'a'))
+    assert_equals(parse_path('a\\.b.c\\[0\\]'), ('a.b', 'c[0]'))
+    assert_equals(parse_path('a\\\\b'), ('a\\b',))
+    assert_equals(parse_path("a['b.c'][\"d]\"].e"), ('a', 'b.c', 'd]', 'e'))
+    assert_equals(parse_path("['it\\'s']"), ("it's",))
+    assert_equals(parse_path("['']"), ('',))
+    assert_equals(parse_path('bad-key.1'), ('bad-key', '1'))
+
+    # tuples of keys are returned as-is
+    assert_equals(parse_path(('a', 0)), ('a', 0))
+    assert_equals(parse_path(['a', 0]), ('a', 0))
+
+    assert_true(parse_path('a.b.c') is _PATHS['a.b.c'])
+
+    for invalid in ('', '.', 'a.', '.a', 'a..b', 'a[', 'a[]', 'a[x]',
+                    'a[ 1]', 'a[0]b', 'a]', "a['b]", "a['b'", 'a\\'):
+        assert_raises(ValueError, parse_path, invalid)
+
+
+def test_get_path():
+    """
+    Nested values are read without building Attrs.
+    """
+    from attrdict import (
+        AttrDefault, AttrDict, AttrMap, FrozenAttr, LayeredAttr, Lazy,
+        PersistentAttr, ThreadSafeAttrMap,
+    )
+
+    data = {
+        'db': {'hosts': [{'name': 'primary'}], 'bad-key': 'value'},
+        'lazy': Lazy(lambda: {'foo': 'bar'}),
+        0: 'zero',
+    }
+
+    for attr in (AttrMap(data), AttrDict(data), AttrDefault(list, data),
+                 ThreadSafeAttrMap(data), PersistentAttr(data),
+                 LayeredAttr([{}, data])):
+        assert_equals(attr.get_path('db.hosts[0].name'), 'primary')
+        assert_equals(attr.get_path('db.hosts[-1].name'), 'primary')
+        assert_equals(attr.get_path('db.bad-key'), 'value')
+        assert_equals(attr.get_path(('db', 'bad-key')), 'value')
+        assert_equals(attr.get_path('lazy.foo'), 'bar')
+        assert_equals(attr.get_path('[0]'), 'zero')
+
+        assert_true(attr.has_path('db.hosts[0]'))
+        assert_false(attr.has_path('db.hosts[1]'))
+        assert_false(attr.has_path('db.hosts.name'))
+        assert_false(attr.has_path('db.bad-key[0]'))  # strings aren't
+        assert_false(attr.has_path('missing.key'))
+
+        assert_equals(attr.get_path('db.missing', None), None)
+        assert_raises(KeyError, attr.get_path, 'db.missing')
+        assert_raises(ValueError, attr.get_path, 'db.')
+
+        # only the leaf is built, and only on request
+        assert_equals(attr.get_path('db.hosts[0]'), {'name': 'primary'})
+        assert_equals(attr.get_path('db.hosts[0]', wrap=True).name,
+                      'primary')
+        assert_equals(attr.get_path('db.hosts', wrap=True)[0].name,
+                      'primary')
+
+    assert_true(isinstance(AttrMap(data).get_path('db'), dict))
+    assert_true(isinstance(AttrMap(data).get_path('db', wrap=True),
+                           AttrMap))
+
+    frozen = FrozenAttr({'a': {'b': 'c'}})
+    assert_equals(frozen.get_path('a.b'), 'c')
+
+    # default_factory isn't called
+    attr = AttrDefault(list)
+    assert_false(attr.has_path('missing'))
+    assert_equals(attr, {})
+
+
+def test_set_path():
+    """
+    Nested values can be set and deleted by path.
+    """
+    from attrdict import (
+        AttrDefault, AttrDefaultDict, AttrDict, AttrMap, PersistentAttr,
+        ThreadSafeAttrMap,
+    )
+
+    for attr in (AttrMap(), AttrDict(), AttrDefault(list),
+                 AttrDefaultDict(list), ThreadSafeAttrMap(),
+                 PersistentAttr()):
+        attr['db'] = {'hosts': [{'name': 'primary'}], 'bad-key': 'value'}
+
+        attr.set_path('db.port', 5432)
+        attr.set_path('db.hosts[0].name', 'secondary')
+        attr.set_path('db.new-key', 'new')
+        attr.set_path('top', 'level')
+        attr.set_path('a.b.c', 'created', create=True)
+
+        assert_equals(attr.db.port, 5432)
+        assert_equals(attr.get_path('db.hosts[0].name'), 'secondary')
+        assert_equals(attr.get_path('db.new-key'), 'new')
+        assert_equals(attr.top, 'level')
+        assert_equals(attr.a.b.c, 'created')
+
+        assert_raises(KeyError, attr.set_path, 'x.y', 'value')
+        assert_raises(KeyError, attr.set_path, 'db.hosts[3].name', 'value')
+        assert_raises(KeyError, attr.set_path, 'db.hosts[3]', 'value')
+        assert_raises(ValueError, attr.set_path, (), 'value')
+        assert_false('x' in attr)
+
+        attr.del_path('db.bad-key')
+        attr.del_path('db.hosts[0]')
+        attr.del_path('top')
+
+        assert_false(attr.has_path('db.bad-key'))
+        assert_equals(attr.get_path('db.hosts'), [])
+        assert_false('top' in attr)
+
+        assert_raises(KeyError, attr.del_path, 'db.bad-key')
+        assert_raises(KeyError, attr.del_path, 'db.hosts[0]')
+        assert_raises(KeyError, attr.del_path, 'missing.key')
+
+    # changes to ThreadSafeAttrMaps and PersistentAttrs are written
+    # back, rather than made in place
+    attr = ThreadSafeAttrMap({'db': {'host': 'localhost'}})
+    mapping = attr._mapping
+    attr.set_path('db.host', 'remote')
+
+    assert_equals(mapping, {'db': {'host': 'localhost'}})
+    assert_equals(attr, {'db': {'host': 'remote'}})
+
+    attr = PersistentAttr({'db': {'host': 'localhost'}})
+    snapshot = attr.snapshot()
+    attr.set_path('db.host', 'remote')
+    attr.del_path('db.host')
+
+    assert_equals(snapshot, {'db': {'host': 'localhost'}})
+    assert_equals(attr, {'db': {}})
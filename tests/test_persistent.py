@@ -0,0 +1,242 @@
+"""
+Tests for the PersistentAttr and PersistentMap classes.
+"""
+from nose.tools import (assert_equals, assert_false, assert_not_equals,
+                        assert_raises, assert_true)
+
+
+class Key(object):
+    """
+    A key with a chosen hash, for forcing collisions.
+    """
+    def __init__(self, name, hashed):
+        self.name = name
+        self.hashed = hashed
+
+    def __hash__(self):
+        """
+        The chosen hash.
+        """
+        return self.hashed
+
+    def __eq__(self, other):
+        """
+        Compare names.
+        """
+        return isinstance(other, Key) and other.name == self.name
+
+    def __ne__(self, other):
+        """
+        Compare names.
+        """
+        return not self == other
+
+
+def test_persistent_map():
+    """
+    PersistentMap behaves like an immutable dict.
+    """
+    import pickle
+    import random
+
+    from attrdict.persistent import PersistentMap
+
+    random.seed(0)
+
+    hashes = [0, 1, 32, 1 << 40, -1, 2 ** 64 - 1]
+    keys = [Key(index, random.choice(hashes)) for index in range(30)]
+    keys.extend(range(100))
+
+    expected = {}
+    mapping = PersistentMap()
+    history = []
+
+    for _ in range(2000):
+        key = random.choice(keys)
+
+        history.append((mapping, dict(expected)))
+
+        if random.random() < 0.6:
+            value = random.random()
+            mapping = mapping.set(key, value)
+            expected[key] = value
+        elif key in expected:
+            mapping = mapping.delete(key)
+            del expected[key]
+        else:
+            assert_raises(KeyError, mapping.delete, key)
+
+        assert_equals(len(mapping), len(expected))
+        assert_equals(mapping, expected)
+
+    # earlier versions are unchanged
+    for old, old_expected in history:
+        assert_equals(dict(old.items()), old_expected)
+
+    for key in keys:
+        assert_equals(mapping.get(key, 'missing'),
+                      expected.get(key, 'missing'))
+        assert_equals(key in mapping, key in expected)
+
+    # setting a key to its current value changes nothing
+    key = next(iter(mapping))
+    assert_true(mapping.set(key, mapping[key]) is mapping)
+    assert_equals(PersistentMap([(1, 2)]), {1: 2})
+    assert_not_equals(PersistentMap({1: 2}), {1: 3})
+    assert_not_equals(PersistentMap({1: 2}), {1: 2, 3: 4})
+    assert_false(PersistentMap() == [])
+    assert_equals(repr(PersistentMap({1: 2})), "PersistentMap({1: 2})")
+
+    numbers = PersistentMap(dict((index, index) for index in range(100)))
+    assert_equals(pickle.loads(pickle.dumps(numbers)), numbers)
+
+
+def test_snapshot():
+    """
+    Snapshots aren't affected by later changes, and vice versa.
+    """
+    from attrdict.persistent import PersistentAttr, PersistentMap
+
+    live = PersistentAttr({
+        'name': 'live',
+        'db': {'host': 'localhost', 'options': {'timeout': 1}},
+    })
+    snapshot = live.snapshot()
+
+    assert_true(isinstance(snapshot, PersistentAttr))
+    assert_equals(snapshot, live)
+    assert_true(isinstance(live['db'], PersistentMap))
+
+    live.name = 'changed'
+    live.db.host = 'db.example.com'
+    live.db.options.timeout = 2
+    live.db.options.retries = 3
+
+    assert_equals(
+        live,
+        {
+            'name': 'changed',
+            'db': {
+                'host': 'db.example.com',
+                'options': {'timeout': 2, 'retries': 3},
+            },
+        }
+    )
+    assert_equals(
+        snapshot,
+        {
+            'name': 'live',
+            'db': {'host': 'localhost', 'options': {'timeout': 1}},
+        }
+    )
+
+    snapshot.db.host = 'snapshot'
+    del snapshot.name
+    assert_equals(live.db.host, 'db.example.com')
+    assert_equals(live.name, 'changed')
+
+    # assigned mappings are converted, so they can't change underneath
+    options = {'timeout': 5}
+    live.db.options = options
+    options['timeout'] = 6
+    assert_equals(live.db.options.timeout, 5)
+
+    # copies are snapshots too
+    import copy
+
+    for copied in (copy.copy(live), copy.deepcopy(live)):
+        copied.db.host = 'copy'
+        assert_equals(live.db.host, 'db.example.com')
+
+
+def test_child_views():
+    """
+    Nested PersistentAttrs write back to their parents until the
+    parent's value is replaced.
+    """
+    from attrdict.persistent import PersistentAttr
+
+    live = PersistentAttr({'db': {'host': 'localhost'}})
+    db = live.db
+
+    db.host = 'first'
+    assert_equals(live.db.host, 'first')
+
+    db['port'] = 5432
+    assert_equals(live.db.port, 5432)
+
+    del db.port
+    assert_false('port' in live.db)
+
+    live.db = {'host': 'replaced'}
+    db.host = 'detached'
+    assert_equals(live.db.host, 'replaced')
+    assert_equals(db.host, 'detached')
+
+    # snapshots of a child are independent
+    child = live.db.snapshot()
+    child.host = 'child'
+    assert_equals(live.db.host, 'replaced')
+
+    # in-place merging
+    live += {'db': {'user': 'admin'}, 'name': 'live'}
+    assert_equals(live, {'db': {'host': 'replaced', 'user': 'admin'},
+                         'name': 'live'})
+
+    merged = live + {'db': {'host': 'merged'}}
+    assert_true(isinstance(merged, PersistentAttr))
+    assert_equals(merged.db.host, 'merged')
+    assert_equals(live.db.host, 'replaced')
+
+    nested = PersistentAttr.from_nested({'a': {'b': [1]}})
+    assert_equals(nested.a.b, (1,))
+
+    cycle = {}
+    cycle['cycle'] = cycle
+    assert_raises(ValueError, PersistentAttr, cycle)
+
+
+def test_deep_update():
+    """
+    Merging into a PersistentAttr in place only changes the paths to
+    the keys being merged, and leaves snapshots alone.
+    """
+    from attrdict.layered import LayeredAttr
+    from attrdict.persistent import PersistentAttr, PersistentMap
+
+    attr = PersistentAttr({
+        'root': {'x': 0, 'sub': {'a': 1}, 'other': {'b': 2}},
+        'flat': 'value',
+    })
+    snapshot = attr.snapshot()
+    other = attr.root.other
+
+    attr += {
+        'root': {'z': 1, 'sub': {'c': 3}, 'x': {'now': 'a mapping'}},
+        'flat': {'d': 4},
+        'new': {'e': 5},
+    }
+
+    assert_equals(attr, {
+        'root': {'x': {'now': 'a mapping'}, 'z': 1,
+                 'sub': {'a': 1, 'c': 3}, 'other': {'b': 2}},
+        'flat': {'d': 4},
+        'new': {'e': 5},
+    })
+    assert_true(attr['root']['other'] is other._map)  # untouched subtree
+    assert_true(isinstance(attr['new'], PersistentMap))
+    assert_equals(snapshot, {
+        'root': {'x': 0, 'sub': {'a': 1}, 'other': {'b': 2}},
+        'flat': 'value',
+    })
+
+    attr.root.deep_update({'sub': {'f': 6}})  # written back
+    assert_equals(attr.root.sub, {'a': 1, 'c': 3, 'f': 6})
+
+    # Mappings that build their values on access are copied
+    layer = {'key': {'v': 1}}
+    attr = PersistentAttr(LayeredAttr([layer, {'key': {'w': 2}}]))
+    snapshot = attr.snapshot()
+    layer['key']['v'] = 'changed'
+    assert_equals(snapshot, {'key': {'v': 1, 'w': 2}})
+    assert_true(isinstance(snapshot['key'], PersistentMap))
@@ -0,0 +1,111 @@
+"""
+Tests for projecting paths out of many mappings.
+"""
+from nose.tools import assert_equals, assert_raises, assert_true
+
+
+def events(count):
+    """
+    Build some records to project.
+    """
+    return [
+        {
+            'user': {'id': index, 'name': 'user{0}'.format(index)},
+            'req': {'path': '/{0}'.format(index), 'tags': ['a', 'b']},
+            'bad-key': index % 2 or None,
+        }
+        for index in range(count)
+    ]
+
+
+def test_project():
+    """
+    A Projector returns the values at each path in a record.
+    """
+    from attrdict import AttrDefault, AttrDict, AttrMap, Lazy, project
+    from attrdict.projection import Projector
+
+    projector = project(
+        ['user.id', 'user.name', 'req.path', 'req.tags[-1]', 'bad-key',
+         'user', 'missing.key', 'req.tags[5]', 'req.path[0]'],
+        default='-',
+    )
+
+    assert_true(isinstance(projector, Projector))
+    assert_equals(projector.paths[0], 'user.id')
+
+    # shared prefixes are looked up once
+    assert_equals(len(projector._steps), 12)  # not 19
+
+    record = events(2)[1]
+    expected = (1, 'user1', '/1', 'b', 1, record['user'], '-', '-', '-')
+
+    for attr in (record, AttrDict(record), AttrMap(record),
+                 AttrDefault(list, record)):
+        assert_equals(projector(attr), expected)
+
+    assert_equals(project(['a.b'])({'a': {}}), (None,))
+    assert_equals(project(['a.b'])({'a': 'string'}), (None,))
+    assert_equals(project([])({'a': 'b'}), ())
+    assert_equals(project(['a.b'])({'a': Lazy(dict, b='c')}), ('c',))
+    assert_equals(project([('a', 0)])({'a': [1]}), (1,))
+
+    # no Attrs are built, and no values are added
+    attr = AttrDefault(list, {'user': {'id': 0}})
+    assert_true(projector(attr)[5] is attr._mapping['user'])
+    assert_equals(attr, {'user': {'id': 0}})
+
+    assert_raises(ValueError, project, ['a.'])
+    assert_equals(repr(project(['a.b', 'c'])), "Projector(['a.b', 'c'])")
+
+
+def test_rows_and_columns():
+    """
+    Many records are projected into rows or columns.
+    """
+    from attrdict import AttrDict, project
+
+    records = [AttrDict(record) for record in events(5)]
+    projector = project(['user.id', 'req.path'])
+
+    rows = projector.rows(iter(records))
+    assert_equals(next(rows), (0, '/0'))
+    assert_equals(list(rows), [(index, '/{0}'.format(index))
+                               for index in range(1, 5)])
+
+    assert_equals(projector.columns(records),
+                  [list(range(5)), ['/{0}'.format(index)
+                                    for index in range(5)]])
+    assert_equals(projector.columns([]), [[], []])
+
+
+def test_executors():
+    """
+    Records can be projected on a pool of workers.
+    """
+    import pickle
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    from attrdict import AttrDict, project
+
+    projector = project(['user.id', 'req.path', 'missing'])
+    loaded = pickle.loads(pickle.dumps(projector))
+
+    assert_equals(loaded.paths, projector.paths)
+    assert_equals(loaded._steps, projector._steps)
+
+    records = [AttrDict(record) for record in events(250)]
+    expected = list(projector.rows(records))
+
+    for executor in (ThreadPoolExecutor(2), ProcessPoolExecutor(2)):
+        with executor:
+            assert_equals(
+                list(projector.rows(records, executor, chunksize=7)),
+                expected
+            )
+            assert_equals(
+                projector.columns(iter(records), executor, chunksize=100),
+                [list(column) for column in zip(*expected)]
+            )
+            assert_equals(list(projector.rows([], executor)), [])
+            assert_raises(ValueError, projector.rows, records, executor, 0)
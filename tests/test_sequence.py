@@ -0,0 +1,60 @@
+"""
+Tests for the LazySequence class.
+"""
+from nose.tools import assert_equals, assert_raises, assert_true
+
+
+def test_lazy_sequence():
+    """
+    LazySequence as a sequence_type.
+    """
+    from attrdict.mapping import AttrMap
+    from attrdict.sequence import LazySequence
+
+    built = []
+
+    class CountingAttrMap(AttrMap):
+        """
+        An AttrMap that records which values it builds.
+        """
+        def _build(self, obj):
+            built.append(obj)
+            return super(CountingAttrMap, self)._build(obj)
+
+    raw = [{'value': index} for index in range(10)]
+    mapping = CountingAttrMap({'list': raw}, sequence_type=LazySequence)
+
+    sequence = mapping.list
+    assert_true(isinstance(sequence, LazySequence))
+    assert_equals(built, [raw])  # nothing converted yet
+
+    assert_equals(len(sequence), 10)
+    third, last = sequence[3], sequence[-1]
+    assert_equals(built, [raw, raw[3], raw[-1]])
+
+    assert_true(isinstance(third, CountingAttrMap))
+    assert_equals(third.value, 3)
+    assert_equals(last.value, 9)
+    assert_raises(IndexError, lambda: sequence[10])
+
+    # slices are views
+    sliced = sequence[1:8:2]
+    assert_true(isinstance(sliced, LazySequence))
+    assert_equals([element.value for element in sliced], [1, 3, 5, 7])
+    assert_equals(sliced[-1].value, 7)
+    assert_equals([element.value for element in sliced[::-1]], [7, 5, 3, 1])
+    assert_equals(len(sequence[20:]), 0)
+    assert_raises(IndexError, lambda: sliced[4])
+
+    # comparison
+    assert_equals(sequence, raw)
+    assert_equals(sequence, tuple(raw))
+    assert_true(sequence != raw[1:])
+    assert_equals(
+        repr(sequence[:2]), "LazySequence([{'value': 0}, {'value': 1}])"
+    )
+
+    # nested sequences stay lazy
+    mapping = AttrMap({'nested': [[{'a': 'b'}]]}, sequence_type=LazySequence)
+    assert_true(isinstance(mapping.nested[0], LazySequence))
+    assert_equals(mapping.nested[0][0].a, 'b')
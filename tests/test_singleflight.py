@@ -0,0 +1,174 @@
+"""
+Tests for the SingleFlightAttrDefault class.
+"""
+from nose.tools import assert_equals, assert_false, assert_raises, assert_true
+
+
+def run_misses(attr, key, count, release):
+    """
+    Look up a missing key from count threads at once, setting release
+    once all but one of them are waiting on the first. Returns the
+    values (or exceptions) the threads got.
+    """
+    import time
+    from threading import Thread
+
+    results = []
+
+    def lookup():
+        """
+        Look up the key.
+        """
+        try:
+            results.append(attr[key])
+        except Exception as error:
+            results.append(error)
+
+    threads = [Thread(target=lookup) for _ in range(count)]
+
+    for thread in threads:
+        thread.start()
+
+    while attr.flight_stats()['coalesced'] < count - 1:
+        time.sleep(0.001)
+
+    release.set()
+
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+def test_single_flight():
+    """
+    Concurrent misses for a key call default_factory once.
+    """
+    from threading import Event
+
+    from attrdict.singleflight import SingleFlightAttrDefault
+
+    release = Event()
+    calls = []
+
+    def load(key):
+        """
+        A slow factory.
+        """
+        calls.append(key)
+        release.wait()
+        return {'tenant': key}
+
+    attr = SingleFlightAttrDefault(load, pass_key=True)
+    results = run_misses(attr, 'acme', 8, release)
+
+    assert_equals(calls, ['acme'])
+    assert_equals(results, [{'tenant': 'acme'}] * 8)
+    assert_true(all(result is results[0] for result in results))
+    assert_equals(attr, {'acme': {'tenant': 'acme'}})
+    assert_equals(
+        attr.flight_stats(), {'calls': 1, 'coalesced': 7, 'errors': 0}
+    )
+
+    # hits don't call the factory
+    assert_equals(attr.acme.tenant, 'acme')
+    assert_equals(calls, ['acme'])
+    assert_equals(attr._flights, {})
+
+    # nested AttrDefaults are single-flight too
+    attr = SingleFlightAttrDefault(list, {'sub': {}})
+    assert_true(isinstance(attr.sub, SingleFlightAttrDefault))
+    assert_true(attr.sub is attr.sub)
+    assert_equals(attr.sub['missing'], [])
+    assert_equals(attr.sub.flight_stats()['calls'], 1)
+
+    # hits only take the lock to wrap a nested Mapping the first time
+    class CountingLock(object):
+        """
+        A lock that counts how often it is taken.
+        """
+        def __init__(self):
+            self.count = 0
+
+        def __enter__(self):
+            self.count += 1
+
+        def __exit__(self, *exc_info):
+            pass
+
+    attr = SingleFlightAttrDefault(list, {'name': 'value', 'sub': {}})
+    lock = CountingLock()
+    attr._setattr('_flight_lock', lock)
+
+    for _ in range(3):
+        assert_equals(attr.name, 'value')
+        assert_true(attr.sub is attr.sub)
+
+    assert_equals(lock.count, 1)
+
+
+def test_errors():
+    """
+    Every waiter gets the exception, and the key stays missing.
+    """
+    from threading import Event
+
+    from attrdict.singleflight import SingleFlightAttrDefault
+
+    release = Event()
+    calls = []
+
+    def load():
+        """
+        A slow factory that fails the first time.
+        """
+        calls.append(None)
+        release.wait()
+
+        if len(calls) == 1:
+            raise ValueError('unavailable')
+
+        return 'loaded'
+
+    attr = SingleFlightAttrDefault(load)
+    results = run_misses(attr, 'key', 4, release)
+
+    assert_equals(len(calls), 1)
+    assert_true(all(isinstance(result, ValueError) for result in results))
+    assert_false('key' in attr)
+    assert_equals(attr._flights, {})
+    assert_equals(
+        attr.flight_stats(), {'calls': 1, 'coalesced': 3, 'errors': 1}
+    )
+
+    assert_equals(attr.key, 'loaded')
+    assert_equals(len(calls), 2)
+
+    # a factory that needs its own key fails instead of deadlocking
+    attr = SingleFlightAttrDefault(lambda key: attr[key], pass_key=True)
+    assert_raises(RuntimeError, lambda: attr['loop'])
+    assert_false('loop' in attr)
+
+
+def test_pickling():
+    """
+    Pickled and copied instances get their own flight state.
+    """
+    import copy
+    import pickle
+
+    from attrdict.singleflight import SingleFlightAttrDefault
+
+    attr = SingleFlightAttrDefault(list, {'foo': [1]})
+    attr.bar
+
+    for copied in (pickle.loads(pickle.dumps(attr)), copy.copy(attr)):
+        assert_equals(copied, attr)
+        assert_true(copied._flight_lock is not attr._flight_lock)
+        assert_equals(copied.flight_stats()['calls'], 0)
+        assert_equals(copied['baz'], [])
+
+    assert_equals(
+        repr(SingleFlightAttrDefault(None, {'foo': 'bar'})),
+        "SingleFlightAttrDefault(None, False, {'foo': 'bar'})"
+    )
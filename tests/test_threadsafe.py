@@ -0,0 +1,195 @@
+"""
+Tests for the ThreadSafeAttrMap class.
+"""
+from nose.tools import assert_equals, assert_false, assert_raises, assert_true
+
+
+def test_copy_on_write():
+    """
+    Changes swap in a new dict, rather than changing the old one.
+    """
+    import copy
+    import pickle
+
+    from attrdict.layered import LayeredAttr
+    from attrdict.threadsafe import ThreadSafeAttrMap
+
+    options = {'timeout': 1}
+    attr = ThreadSafeAttrMap({'name': 'live', 'db': {'options': options}})
+
+    # stored mappings are copied
+    options['timeout'] = 2
+    assert_equals(attr.db.options.timeout, 1)
+
+    # including Mappings that build their values on access
+    layer = dict((key, {'v': key}) for key in 'abcdefgh')
+    layered = ThreadSafeAttrMap(
+        LayeredAttr([layer, dict((key, {'w': key}) for key in 'abcdefgh')])
+    )
+    layer['a']['v'] = 'changed'
+
+    for key in 'abcdefgh':
+        assert_equals(layered[key], {'v': key, 'w': key})
+        assert_true(isinstance(layered[key], dict))
+
+    before = attr._mapping
+    attr.name = 'changed'
+    assert_true(attr._mapping is not before)
+    assert_equals(before['name'], 'live')
+    assert_equals(attr.name, 'changed')
+
+    # iterating over a snapshot isn't disturbed by writes
+    for key in attr:
+        attr[key + '_copy'] = True
+
+    assert_equals(len(attr), 4)
+
+    # compound operations
+    assert_equals(attr.setdefault('retries', 3), 3)
+    assert_equals(attr.setdefault('retries', 4), 3)
+    assert_equals(attr.pop('retries'), 3)
+    assert_equals(attr.pop('retries', None), None)
+    assert_raises(KeyError, attr.pop, 'retries')
+    assert_raises(KeyError, attr.__delitem__, 'retries')
+
+    attr.update({'a': 1}, b={'c': 2})
+    assert_equals(attr.b.c, 2)
+    attr.update([('self', 'value')])
+    assert_equals(attr['self'], 'value')
+    assert_raises(TypeError, attr.update, {}, {})
+
+    key, value = attr.popitem()
+    assert_false(key in attr)
+
+    attr.clear()
+    assert_equals(attr, {})
+    assert_raises(KeyError, attr.popitem)
+
+    # copies don't see each other's changes
+    attr = ThreadSafeAttrMap({'db': {'host': 'localhost'}})
+
+    for copied in (copy.copy(attr), copy.deepcopy(attr),
+                   pickle.loads(pickle.dumps(attr))):
+        copied.db.host = 'copy'
+        assert_equals(attr.db.host, 'localhost')
+        assert_true(copied._lock is not attr._lock)
+
+    assert_equals(
+        repr(ThreadSafeAttrMap({'foo': 'bar'})),
+        "ThreadSafeAttrMap({'foo': 'bar'})"
+    )
+
+    cycle = {}
+    cycle['cycle'] = cycle
+    assert_raises(ValueError, ThreadSafeAttrMap, cycle)
+
+    # from_nested keeps every nested value
+    nested = ThreadSafeAttrMap.from_nested(
+        {'a': {'b': {'c': 1}}, 'l': [{'x': 1}]}
+    )
+    assert_equals(nested, {'a': {'b': {'c': 1}}, 'l': [{'x': 1}]})
+    assert_equals(nested.a.b.c, 1)
+    assert_equals(nested.l[0].x, 1)
+    nested.a.b.c = 2
+    assert_equals(nested['a'], {'b': {'c': 2}})
+    assert_raises(TypeError, ThreadSafeAttrMap.from_nested, [])
+
+
+def test_child_views():
+    """
+    Nested ThreadSafeAttrMaps write back to their parents' current value
+    until the parent no longer holds a Mapping.
+    """
+    from attrdict.threadsafe import ThreadSafeAttrMap
+
+    attr = ThreadSafeAttrMap({'db': {'host': 'localhost', 'options': {}}})
+    db = attr.db
+
+    assert_true(db._lock is attr._lock)
+
+    db.host = 'first'
+    assert_equals(attr.db.host, 'first')
+
+    db.options.timeout = 5
+    assert_equals(attr.db.options.timeout, 5)
+
+    del db.host
+    assert_false('host' in attr.db)
+
+    # views built before a change write to the current value
+    attr.db = {'host': 'replaced', 'port': 5432}
+    db.host = 'current'
+    assert_equals(attr.db, {'host': 'current', 'port': 5432})
+    assert_equals(db.port, 5432)
+
+    attr.db = 'replaced'
+    db.host = 'detached'
+    assert_equals(attr.db, 'replaced')
+    assert_equals(db.host, 'detached')
+
+    # deep_update only copies the overlapping path
+    attr = ThreadSafeAttrMap({'db': {'host': 'localhost'}, 'log': {}})
+    log = attr['log']
+    attr += {'db': {'port': 5432}, 'name': 'live'}
+
+    assert_equals(
+        attr,
+        {'db': {'host': 'localhost', 'port': 5432}, 'log': {}, 'name': 'live'}
+    )
+    assert_true(attr['log'] is log)
+
+    merged = attr + {'db': {'host': 'merged'}}
+    assert_true(isinstance(merged, ThreadSafeAttrMap))
+    assert_equals(merged.db.host, 'merged')
+    assert_equals(attr.db.host, 'localhost')
+
+
+def test_threads():
+    """
+    Concurrent writes aren't lost, and readers always see a consistent
+    mapping.
+    """
+    from threading import Thread
+
+    from attrdict.threadsafe import ThreadSafeAttrMap
+
+    attr = ThreadSafeAttrMap({'counts': {}})
+    errors = []
+
+    def write(name):
+        """
+        Add keys (through a view of a nested mapping, which other
+        threads change) and claim a shared key.
+        """
+        counts = attr.counts
+
+        try:
+            for index in range(200):
+                counts['{0}-{1}'.format(name, index)] = index
+                attr.setdefault('winner', name)
+        except Exception as error:  # pragma: no cover
+            errors.append(error)
+
+    def read():
+        """
+        Iterate while the writers run.
+        """
+        try:
+            for _ in range(200):
+                for key in attr.counts:
+                    attr.counts[key]
+        except Exception as error:  # pragma: no cover
+            errors.append(error)
+
+    threads = [Thread(target=write, args=(name,)) for name in range(4)]
+    threads.extend(Thread(target=read) for _ in range(4))
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert_equals(errors, [])
+    assert_equals(len(attr.counts), 800)
+    assert_true(attr.winner in range(4))